@@ -0,0 +1,91 @@
+"""
+CPU time of JSON handling of one Keyword.get page (10000 keywords): previous
+implementation (requests json= encoding, Response.json() decoding) against codecs
+of direct_api.json_codec which are installed.
+
+    python benchmarks/json_codec.py
+"""
+
+import json
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import requests  # noqa: E402
+
+from direct_api.json_codec import CODECS, get_codec  # noqa: E402
+
+
+def _page(size: int) -> dict:
+    return {
+        'result': {
+            'Keywords': [
+                {
+                    'Id': 100000 + i,
+                    'Keyword': f'купить слона {i} -недорого',
+                    'AdGroupId': 5000 + i // 200,
+                    'CampaignId': 700 + i // 2000,
+                    'State': 'ON',
+                    'Status': 'ACCEPTED',
+                    'Bid': 12300000,
+                    'ContextBid': 3000000,
+                    'StatusClarification': '',
+                    'Productivity': {'Value': 7.5, 'References': [1, 2]},
+                }
+                for i in range(size)
+            ],
+            'LimitedBy': size,
+        }
+    }
+
+
+def _response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response._content = body
+    response.status_code = 200
+    response.headers['Content-Type'] = 'application/json; charset=utf-8'
+    response.encoding = 'utf-8'
+    return response
+
+
+def run(size: int = 10000, number: int = 10) -> dict:
+    """
+    :param size: int, keywords in page
+    :param number: int, number of calls measured by timeit
+    :return: dict {benchmark name: seconds per page}
+    """
+    page = _page(size)
+    body = json.dumps(page).encode('utf-8')
+    request = {'method': 'add', 'params': {'Keywords': page['result']['Keywords']}}
+
+    def per_call(func) -> float:
+        return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+    results = {
+        # requests: complexjson.dumps(json, allow_nan=False).encode('utf-8')
+        'encode before (requests json=)': per_call(
+            lambda: json.dumps(request, allow_nan=False).encode('utf-8')
+        ),
+        'decode before (Response.json())': per_call(lambda: _response(body).json()),
+    }
+    for name in CODECS:
+        try:
+            codec = get_codec(name)
+        except ImportError:
+            continue
+        results[f'encode {name}'] = per_call(lambda: codec.dumps(request))
+        results[f'decode {name}'] = per_call(lambda: codec.loads(body))
+    return results
+
+
+def main() -> None:
+    for name, seconds in run().items():
+        print(f'{name:<40} {seconds * 1e3:10.2f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Peak RSS of client process while downloading large report and paging large get
+result from local emulator. Every workload runs in fresh interpreter, so peaks
+don't hide each other (Linux and macOS).
+
+    python benchmarks/memory.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from direct_api.emulator import DirectEmulator  # noqa: E402
+
+REPORT_FIELDS = ['Date', 'CampaignId', 'CampaignName', 'Impressions', 'Clicks', 'Cost']
+REPORT_ARGS = (
+    f"{{}}, {REPORT_FIELDS!r}, 'benchmark', 'CAMPAIGN_PERFORMANCE_REPORT', 'TODAY'"
+)
+# workload name -> statement, client is DirectAPI of emulator
+WORKLOADS = {
+    'report (str)': f"client.Report.get({REPORT_ARGS}).count('\\n')",
+    'report (stream)': f'sum(1 for _ in client.Report.get({REPORT_ARGS}, stream=True))',
+    'keywords get_all': "len(client.Keyword.get_all(['Id', 'Keyword'], campaign_ids=ids))",
+    'keywords iter_get': (
+        "sum(1 for _ in client.Keyword.iter_get(['Id', 'Keyword'], campaign_ids=ids))"
+    ),
+    'keywords iter_get (stream)': (
+        "sum(1 for _ in client.Keyword.iter_get(['Id', 'Keyword'], campaign_ids=ids, "
+        "stream=True))"
+    ),
+}
+CHILD = '''
+import json, resource, sys, time
+from direct_api.client import DirectAPI
+
+
+def rss():
+    # ru_maxrss is inherited from parent on Linux, peak of this process is VmHWM
+    try:
+        with open('/proc/self/status') as status:
+            fields = dict(line.split(':', 1) for line in status)
+        return int(fields['VmRSS'].split()[0]) * 1024, int(fields['VmHWM'].split()[0]) * 1024
+    except OSError:
+        # macOS, ru_maxrss is in bytes
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak, peak
+
+
+client = DirectAPI('token', 'login', api_url=sys.argv[1])
+ids = json.loads(sys.argv[2])
+before = rss()[0]
+start = time.perf_counter()
+count = {statement}
+seconds = time.perf_counter() - start
+peak = rss()[1]
+print(json.dumps({{'objects': count, 'seconds': seconds, 'baseline_rss': before, 'peak_rss': peak}}))
+'''
+
+
+def _run_workload(url: str, ids: list, statement: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    output = subprocess.check_output(
+        [sys.executable, '-c', CHILD.format(statement=statement), url, json.dumps(ids)],
+        env=env,
+        cwd=ROOT,
+    )
+    return json.loads(output)
+
+
+def run(report_rows: int = 200000, keywords: int = 100000) -> dict:
+    """
+    :param report_rows: int, rows of downloaded report
+    :param keywords: int, number of keywords paged by get (10 campaigns)
+    :return: dict {benchmark name: {'objects', 'seconds', 'baseline_rss', 'peak_rss'}},
+        rss in bytes
+    """
+    ad_groups = 10
+    with DirectEmulator(
+        campaigns=10,
+        ad_groups_per_campaign=ad_groups,
+        ads_per_ad_group=0,
+        keywords_per_ad_group=max(1, keywords // (10 * ad_groups)),
+        report_polls=0,
+        report_rows=report_rows,
+    ) as emulator:
+        ids = list(emulator._objects['campaigns'])
+        return {
+            name: _run_workload(emulator.url, ids, statement)
+            for name, statement in WORKLOADS.items()
+        }
+
+
+def main() -> None:
+    for name, result in run().items():
+        print(
+            f'{name:<28} {result["objects"]:>8} objects {result["seconds"]:8.2f} s'
+            f' peak rss {result["peak_rss"] / 2 ** 20:8.1f} MB'
+            f' (+{(result["peak_rss"] - result["baseline_rss"]) / 2 ** 20:.1f} MB)'
+        )
+
+
+if __name__ == '__main__':
+    main()
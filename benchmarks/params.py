@@ -0,0 +1,85 @@
+"""
+Cost of building request params of get methods: previous implementation
+(generate_params over locals() with convert on every call) against build_params.
+
+    python benchmarks/params.py
+"""
+
+import os
+import sys
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from direct_api.client import DirectAPI  # noqa: E402
+from direct_api.utils import build_params, convert  # noqa: E402
+
+
+def _generate_params_before(fields: list, function_kwargs: dict) -> dict:
+    return {
+        convert(field): function_kwargs[field]
+        for field in fields
+        if function_kwargs.get(field)
+    }
+
+
+def keyword_bid_criteria_before(
+    campaign_ids=None, ad_group_ids=None, keyword_ids=None, serving_statuses=None
+) -> dict:
+    return _generate_params_before(
+        ['campaign_ids', 'ad_group_ids', 'keyword_ids', 'serving_statuses'], locals()
+    )
+
+
+def keyword_bid_criteria_after(
+    campaign_ids=None, ad_group_ids=None, keyword_ids=None, serving_statuses=None
+) -> dict:
+    return build_params(
+        campaign_ids=campaign_ids,
+        ad_group_ids=ad_group_ids,
+        keyword_ids=keyword_ids,
+        serving_statuses=serving_statuses,
+    )
+
+
+def run(number: int = 100000) -> dict:
+    """
+    :param number: int, number of calls measured by timeit
+    :return: dict {benchmark name: seconds per call}
+    """
+    client = DirectAPI('token', 'login')
+    # payload is built, request is not sent
+    client.KeywordBid._get = lambda params: params
+    ids = list(range(100))
+
+    def per_call(func) -> float:
+        return min(timeit.repeat(func, number=number, repeat=5)) / number
+
+    return {
+        'criteria before (locals + convert)': per_call(
+            lambda: keyword_bid_criteria_before(
+                campaign_ids=ids, serving_statuses=['ELIGIBLE']
+            )
+        ),
+        'criteria after (build_params)': per_call(
+            lambda: keyword_bid_criteria_after(
+                campaign_ids=ids, serving_statuses=['ELIGIBLE']
+            )
+        ),
+        'KeywordBid.get payload': per_call(
+            lambda: client.KeywordBid.get(
+                ['KeywordId'], campaign_ids=ids, search_field_names=['Bid']
+            )
+        ),
+    }
+
+
+def main() -> None:
+    for name, seconds in run().items():
+        print(f'{name:<40} {seconds * 1e9:10.1f} ns')
+
+
+if __name__ == '__main__':
+    main()
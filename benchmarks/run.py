@@ -0,0 +1,96 @@
+"""
+Run benchmark suites and write results as JSON, so runs can be compared:
+
+    python benchmarks/run.py --output before.json
+    python benchmarks/run.py --output after.json --compare before.json
+    python benchmarks/run.py --suite throughput --suite memory
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from importlib import import_module
+
+BENCHMARKS = os.path.dirname(os.path.abspath(__file__))
+if BENCHMARKS not in sys.path:
+    sys.path.insert(0, BENCHMARKS)
+
+# suite name -> module with run() -> dict
+SUITES = ('startup', 'params', 'json_codec', 'throughput', 'memory')
+
+
+def _commit() -> str:
+    try:
+        return (
+            subprocess.check_output(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                cwd=BENCHMARKS,
+                stderr=subprocess.DEVNULL,
+            )
+            .decode()
+            .strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ''
+
+
+def run(suites: tuple = SUITES) -> dict:
+    """
+    :param suites: tuple, names of suites
+    :return: dict with environment of run and results {suite: {benchmark: value}}
+    """
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': _commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': {suite: import_module(suite).run() for suite in suites},
+    }
+
+
+def _flatten(value, prefix: str = '') -> dict:
+    if isinstance(value, dict):
+        flat = {}
+        for key, item in value.items():
+            flat.update(_flatten(item, f'{prefix}/{key}' if prefix else key))
+        return flat
+    return {prefix: value} if isinstance(value, (int, float)) else {}
+
+
+def compare(baseline: dict, current: dict) -> dict:
+    """
+    :param baseline: dict, result of run()
+    :param current: dict, result of run()
+    :return: dict {benchmark path: current / baseline} of benchmarks present in both runs
+    """
+    before = _flatten(baseline['results'])
+    after = _flatten(current['results'])
+    return {key: after[key] / before[key] for key in after if before.get(key)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmarks of direct_api')
+    parser.add_argument('--suite', action='append', choices=SUITES)
+    parser.add_argument('--output', help='JSON file of results (default - stdout)')
+    parser.add_argument('--compare', help='JSON file of previous run')
+    args = parser.parse_args()
+    result = run(tuple(args.suite or SUITES))
+    text = json.dumps(result, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for key, ratio in compare(baseline, result).items():
+            print(f'{key:<60} {ratio:8.2f}x', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Startup cost of direct_api: import time (fresh interpreter for every run),
+client construction and first access to entity.
+
+    python benchmarks/startup.py
+"""
+
+import os
+import subprocess
+import sys
+import timeit
+from statistics import median
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+IMPORT_STATEMENTS = {
+    'import direct_api': 'import direct_api',
+    'from direct_api import DirectAPI': 'from direct_api import DirectAPI',
+    'from direct_api import DirectAPI; DirectAPI()': (
+        "from direct_api import DirectAPI; DirectAPI('token', 'login')"
+    ),
+}
+
+
+def _import_time(statement: str, repeat: int) -> float:
+    code = (
+        'import time; start = time.perf_counter(); '
+        f'{statement}; print(time.perf_counter() - start)'
+    )
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    timings = [
+        float(subprocess.check_output([sys.executable, '-c', code], env=env, cwd=ROOT))
+        for _ in range(repeat)
+    ]
+    return median(timings)
+
+
+def _per_call(stmt: str, setup: str, number: int) -> float:
+    return min(timeit.repeat(stmt, setup, number=number, repeat=5)) / number
+
+
+def run(repeat: int = 5, number: int = 2000) -> dict:
+    """
+    :param repeat: int, number of interpreters started for every import statement
+    :param number: int, number of calls measured by timeit
+    :return: dict {benchmark name: seconds}
+    """
+    results = {
+        name: _import_time(stmt, repeat) for name, stmt in IMPORT_STATEMENTS.items()
+    }
+    setup = 'from direct_api import DirectAPI'
+    results['DirectAPI()'] = _per_call("DirectAPI('token', 'login')", setup, number)
+    results['DirectAPI().Campaign'] = _per_call(
+        "DirectAPI('token', 'login').Campaign", setup, number
+    )
+    results['client.Campaign (cached)'] = _per_call(
+        'client.Campaign',
+        setup + "; client = DirectAPI('token', 'login'); client.Campaign",
+        number * 100,
+    )
+    results['client.with_options()'] = _per_call(
+        "client.with_options(login='other')",
+        setup + "; client = DirectAPI('token', 'login')",
+        number,
+    )
+    return results
+
+
+def main() -> None:
+    for name, seconds in run().items():
+        print(f'{name:<48} {seconds * 1e6:12.2f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Throughput and latency of DirectAPI against local emulator: requests per second
+and p50 / p99 latency of get, add and set calls by number of concurrent threads.
+
+    python benchmarks/throughput.py
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from direct_api.client import DirectAPI  # noqa: E402
+from direct_api.emulator import DirectEmulator  # noqa: E402
+
+CONCURRENCY = (1, 4, 16)
+
+
+def _calls(client: DirectAPI) -> dict:
+    return {
+        'get': lambda i: client.Campaign.get(field_names=['Id', 'Name', 'State']),
+        'add': lambda i: client.Keyword.add(
+            [{'Keyword': f'benchmark {i}', 'AdGroupId': 2}]
+        ),
+        'set': lambda i: client.KeywordBid.set(
+            [{'KeywordId': 3, 'SearchBid': (i % 100 + 1) * 100000}]
+        ),
+    }
+
+
+def _percentile(timings: list, percent: float) -> float:
+    # timings are sorted, nearest-rank method
+    index = max(0, int(round(percent / 100 * len(timings))) - 1)
+    return timings[index]
+
+
+def _measure(call, requests: int, concurrency: int) -> dict:
+    def timed(i: int) -> float:
+        start = perf_counter()
+        call(i)
+        return perf_counter() - start
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        # connections are opened before measurement
+        list(executor.map(timed, range(concurrency)))
+        start = perf_counter()
+        timings = sorted(executor.map(timed, range(requests)))
+        elapsed = perf_counter() - start
+    return {
+        'rps': requests / elapsed,
+        'p50': _percentile(timings, 50),
+        'p99': _percentile(timings, 99),
+    }
+
+
+def run(
+    requests: int = 500, concurrency: tuple = CONCURRENCY, latency: float = 0.0
+) -> dict:
+    """
+    :param requests: int, number of calls measured for every method and concurrency
+    :param concurrency: tuple, numbers of threads
+    :param latency: float, seconds emulator delays every request
+    :return: dict {benchmark name: {'rps': float, 'p50': seconds, 'p99': seconds}}
+    """
+    results = {}
+    with DirectEmulator(campaigns=10, latency=latency) as emulator:
+        for threads in concurrency:
+            client = DirectAPI(
+                'token', 'login', api_url=emulator.url, pool_maxsize=threads
+            )
+            for name, call in _calls(client).items():
+                results[f'{name} x{threads}'] = _measure(call, requests, threads)
+            client._session.close()
+    return results
+
+
+def main() -> None:
+    for name, result in run().items():
+        print(
+            f'{name:<20} {result["rps"]:10.1f} rps'
+            f' p50 {result["p50"] * 1e3:8.2f} ms p99 {result["p99"] * 1e3:8.2f} ms'
+        )
+
+
+if __name__ == '__main__':
+    main()
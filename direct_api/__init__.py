@@ -1,5 +1,63 @@
-from .client import DirectAPI
-from .exceptions import YdAPIError, YdAuthError, ParameterError
+import sys
+from typing import TYPE_CHECKING
+
+from .exceptions import YdAPIError, YdAuthError, YdPartialError, ParameterError
 
 __version__ = '0.0.1'
 __author__ = 'bzdvdn'
+
+# public names by module, modules are imported on first access to their names,
+# so `import direct_api` doesn't import requests, aiohttp, sqlite3 ...
+_LAZY_IMPORTS = {
+    'DirectAPI': '.client',
+    'FanOutResult': '.client',
+    'AsyncDirectAPI': '.async_client',
+    'ReportQueue': '.report_queue',
+    'ReportResult': '.report_queue',
+    'RetryPolicy': '.retry',
+    'DictionaryCache': '.dictionaries',
+    'AccountSync': '.sync',
+    'SyncResult': '.sync',
+    'EntityMirror': '.mirror',
+    'BidCache': '.bids',
+    'BidSync': '.bids',
+    'ResponseCache': '.cache',
+    'MemoryBackend': '.cache',
+    'SqliteBackend': '.cache',
+    'WriteBatcher': '.batching',
+    'DirectEmulator': '.emulator',
+    'MetricsRegistry': '.metrics',
+    'RequestEvent': '.metrics',
+}
+
+__all__ = ('YdAPIError', 'YdAuthError', 'YdPartialError', 'ParameterError') + tuple(_LAZY_IMPORTS)
+
+# type checkers see eagerly imported names
+if sys.version_info >= (3, 7) and not TYPE_CHECKING:
+    from importlib import import_module
+
+    def __getattr__(name: str):
+        module = _LAZY_IMPORTS.get(name)
+        if module is None:
+            raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+        value = getattr(import_module(module, __name__), name)
+        globals()[name] = value
+        return value
+
+    def __dir__() -> list:
+        return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
+else:  # pragma: no cover
+    # module __getattr__ is not supported, names are imported eagerly
+    from .client import DirectAPI, FanOutResult
+    from .async_client import AsyncDirectAPI
+    from .report_queue import ReportQueue, ReportResult
+    from .retry import RetryPolicy
+    from .dictionaries import DictionaryCache
+    from .sync import AccountSync, SyncResult
+    from .mirror import EntityMirror
+    from .bids import BidCache, BidSync
+    from .cache import ResponseCache, MemoryBackend, SqliteBackend
+    from .batching import WriteBatcher
+    from .emulator import DirectEmulator
+    from .metrics import MetricsRegistry, RequestEvent
@@ -0,0 +1,382 @@
+import asyncio
+from time import perf_counter
+from typing import Any, AsyncIterator, Callable, Optional, Tuple, Union
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None  # type: ignore
+
+from .cache import READ_METHODS, ResponseCache
+from .client import BaseDirectAPI, FanOutResult
+from .exceptions import YdAPIError, YdAuthError
+from .json_codec import JsonCodec
+from .metrics import RequestEvent
+from .reports import aparse_report_lines, has_title
+from .retry import RetryPolicy
+from .single_flight import AsyncSingleFlight, request_key
+from .units import count_objects
+from .utils import merge_results
+
+
+class AsyncDirectAPI(BaseDirectAPI):
+    """
+    asyncio version of DirectAPI, all entity methods return awaitables:
+
+        async with AsyncDirectAPI('<access_token>', '<clid>') as client:
+            result = await client.Campaign.get(field_names=['Id', 'Name'])
+    """
+
+    def __init__(
+        self,
+        access_token: str,
+        clid: str,
+        refresh_token: str = '',
+        lang: str = 'ru',
+        throttle: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        compression: bool = True,
+        pool_size: int = 100,
+        per_host_limit: int = 0,
+        keep_alive: bool = True,
+        keepalive_timeout: float = 15,
+        response_cache: Optional[ResponseCache] = None,
+        single_flight: bool = False,
+        api_url: Optional[str] = None,
+        hooks: Optional[list] = None,
+        json_codec: Union[str, JsonCodec, None] = None,
+    ) -> None:
+        """
+        :param access_token: str
+        :param clid: str
+        :param refresh_token: str
+        :param lang: str (ru, en, tr, uk)
+        :param throttle: bool, pace requests so points of login last until the end of the day
+        :param retry_policy: optional RetryPolicy, failed requests are not retried by default
+        :param compression: bool, request gzip compressed responses (JSON services and reports)
+        :param pool_size: int, max number of simultaneous connections (0 - unlimited)
+        :param per_host_limit: int, max number of simultaneous connections to one host (0 - unlimited)
+        :param keep_alive: bool, reuse connections between requests
+        :param keepalive_timeout: float, seconds idle connection is kept
+        :param response_cache: optional ResponseCache, get responses are not cached by default
+        :param single_flight: bool, identical read requests sent by tasks at the same time
+            share one request and its response
+        :param api_url: optional str, base URL of JSON services (sandbox, local emulator)
+        :param hooks: optional list of callables, called with RequestEvent of every HTTP request
+        :param json_codec: 'auto' (the fastest installed: orjson, ujson, json), 'json', 'orjson',
+            'ujson' or JsonCodec instance, encodes requests and decodes responses
+        """
+        if aiohttp is None:
+            raise ImportError(
+                'aiohttp is required for AsyncDirectAPI, '
+                'install it with `pip install yandex-direct-api[async]`'
+            )
+        super().__init__(
+            access_token,
+            clid,
+            refresh_token,
+            lang,
+            throttle,
+            retry_policy,
+            compression,
+            response_cache,
+            api_url,
+            hooks,
+            json_codec,
+        )
+        self._pool_size = pool_size
+        self._per_host_limit = per_host_limit
+        self._keep_alive = keep_alive
+        self._keepalive_timeout = keepalive_timeout
+        self._session: Optional['aiohttp.ClientSession'] = None
+        self._single_flight = AsyncSingleFlight() if single_flight else None
+        # client copies for other logins share session of root client
+        self._root = self
+
+    async def __aenter__(self) -> 'AsyncDirectAPI':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        # session must be created inside running event loop
+        root = self._root
+        if root._session is None or root._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._pool_size,
+                limit_per_host=self._per_host_limit,
+                force_close=not self._keep_alive,
+                keepalive_timeout=self._keepalive_timeout if self._keep_alive else None,
+            )
+            root._session = aiohttp.ClientSession(connector=connector)
+        return root._session
+
+    async def fan_out(
+        self, logins: list, call: Callable, *args, **kwargs
+    ) -> AsyncIterator[FanOutResult]:
+        """
+        Execute call for every login concurrently, Client-Login is set per request,
+        so the client is not modified
+            async for item in client.fan_out(logins, client.Campaign.get, field_names=['Id']):
+                print(item.login, item.result, item.error)
+        :param logins: list
+        :param call: entity method (client.Campaign.get) or coroutine function with client as first argument
+        :param args: call args
+        :param kwargs: call kwargs
+        :return: async generator of FanOutResult(login, result, error) in order of completion
+        """
+
+        async def execute(login: str) -> FanOutResult:
+            try:
+                result = await self._bind_call(login, call)(*args, **kwargs)
+            except Exception as e:
+                return FanOutResult(login, None, e)
+            return FanOutResult(login, result, None)
+
+        for future in asyncio.as_completed([execute(login) for login in logins]):
+            yield await future
+
+    async def close(self) -> None:
+        root = self._root
+        if root._session is not None:
+            await root._session.close()
+            root._session = None
+
+    async def _retrying(self, method: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Await func, failed attempts are retried by retry policy
+        :param method: str, API method
+        :param func: coroutine function
+        :return: result of func
+        """
+        attempt = 0
+        while True:
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, method, attempt)
+                if delay is None:
+                    raise
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _send_report_request(
+        self, params: dict, headers: Optional[dict] = None
+    ) -> 'aiohttp.ClientResponse':
+        """
+        :param params: dict
+        :param headers: optional dict, additional headers of request
+        :return: response object with status 200, 201 or 202, must be released by caller
+        """
+        url = f'{self.API_URL}reports/'
+        headers = dict(self._headers, **headers) if headers else self._headers
+        event = self._new_event('report', 'reports', 'get', headers)
+        try:
+            start = perf_counter()
+            data = self._codec.dumps(params)
+            if event is not None:
+                event.serialize_time = perf_counter() - start
+                event.request_bytes = len(data)
+                start = perf_counter()
+            response = await self._get_session().post(
+                url,
+                data=data,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(sock_connect=10, sock_read=10),
+            )
+            if event is not None:
+                # body of report is read by caller
+                self._record_response(event, response, start)
+            if response.status not in (200, 201, 202):
+                error = self._codec.loads(await response.read())['error']
+                response.release()
+                raise YdAPIError(error, response)
+            return response
+        except Exception as e:
+            if event is not None:
+                event.error = e
+            raise
+        finally:
+            if event is not None:
+                self._emit(event)
+
+    async def _poll_report(
+        self, params: dict, headers: Optional[dict] = None
+    ) -> Tuple[Optional[str], int]:
+        """
+        Send report request once
+        :param params: dict
+        :param headers: optional dict, additional headers of request
+        :return: tuple (report or None if report is in offline queue, retryIn)
+        """
+        response = await self._retrying(
+            'get', self._send_report_request, params, headers
+        )
+        try:
+            if response.status == 200:
+                return await response.text('utf-8'), 0
+            return None, int(response.headers.get('retryIn', 10))
+        finally:
+            response.release()
+
+    async def _post_report(
+        self, params: dict, headers: Optional[dict] = None
+    ) -> 'aiohttp.ClientResponse':
+        """
+        Post report request and wait while report is in offline queue
+        :param params: dict
+        :param headers: optional dict, additional headers of request (processingMode, ...)
+        :return: response object with status 200, must be released by caller
+        """
+        while True:
+            response = await self._retrying(
+                'get', self._send_report_request, params, headers
+            )
+            if response.status == 200:
+                return response
+            # report is in offline queue
+            retry_in = int(response.headers.get('retryIn', 10))
+            response.release()
+            await asyncio.sleep(retry_in)
+
+    async def _get_reports(self, params: dict, headers: Optional[dict] = None) -> str:
+        response = await self._post_report(params, headers)
+        try:
+            return await response.text('utf-8')
+        finally:
+            response.release()
+
+    async def _iter_reports(
+        self, params: dict, headers: Optional[dict] = None
+    ) -> AsyncIterator[str]:
+        """
+        :param params: dict
+        :param headers: optional dict, additional headers of request
+        :return: async generator of report lines, body is read by chunks
+        """
+        response = await self._post_report(params, headers)
+        try:
+            async for line in response.content:
+                yield line.decode('utf-8').rstrip('\r\n')
+        finally:
+            response.release()
+
+    def _iter_report_rows(
+        self,
+        params: dict,
+        field_names: list,
+        as_dict: bool = True,
+        headers: Optional[dict] = None,
+    ) -> AsyncIterator[Union[dict, tuple]]:
+        return aparse_report_lines(
+            self._iter_reports(params, headers),
+            field_names,
+            as_dict,
+            has_title(dict(self._headers, **headers) if headers else self._headers),
+        )
+
+    async def _request(self, service: str, method: str, params: dict) -> dict:
+        if self._single_flight is not None and method in READ_METHODS:
+            return await self._single_flight.do(
+                request_key(self._headers, service, method, params),
+                self._retrying,
+                method,
+                self._send_api_request,
+                service,
+                method,
+                params,
+            )
+        try:
+            return await self._retrying(
+                method, self._send_api_request, service, method, params
+            )
+        finally:
+            self._invalidate_cache(service, method)
+
+    async def _cached_request(self, service: str, method: str, params: dict) -> dict:
+        cache = self._response_cache
+        if cache is None:
+            return await self._request(service, method, params)
+        login = self._headers['Client-Login']
+        response = cache.get(login, service, method, params)
+        if response is None:
+            generation = cache.generation(login, service)
+            response = await self._request(service, method, params)
+            cache.set(login, service, method, params, response, generation)
+        return response
+
+    async def _request_many(self, service: str, method: str, params_list: list) -> dict:
+        responses = await asyncio.gather(
+            *(self._request(service, method, params) for params in params_list),
+            return_exceptions=True,
+        )
+        for response in responses:
+            # cancellation is not error of chunk
+            if isinstance(response, BaseException) and not isinstance(response, Exception):
+                raise response
+        return merge_results(
+            list(responses), [count_objects(p) for p in params_list]
+        )
+
+    async def _send_api_request(
+        self, service: str, method: str, params: dict, timeout: int = 30
+    ) -> dict:
+        """
+        :param service: str
+        :param method: str
+        :param params: dict
+        :param timeout: int, default=30
+        :return: dict (decoded response), error of request is raised as YdAPIError
+        """
+        delay = self._throttle_delay(service, method, params)
+        if delay:
+            await asyncio.sleep(delay)
+        url = f'{self.API_URL}{service}'
+        event = self._new_event('api', service, method)
+        try:
+            start = perf_counter()
+            data = self._codec.dumps({'method': method, 'params': params})
+            if event is not None:
+                event.serialize_time = perf_counter() - start
+                event.request_bytes = len(data)
+                start = perf_counter()
+            async with self._get_session().post(
+                url,
+                data=data,
+                headers=self._headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as response:
+                self._track_units(response.headers, service)
+                response.raise_for_status()
+                body = await response.read()
+                if event is not None:
+                    self._record_response(event, response, start)
+                    event.response_bytes = len(body)
+                    start = perf_counter()
+                result = self._codec.loads(body)
+                if event is not None:
+                    event.decode_time = perf_counter() - start
+                if response.status > 204:
+                    if response.status == 401:
+                        raise YdAuthError(result['error'])
+                    raise YdAPIError(result['error'], response)
+                if 'error' in result:
+                    raise YdAPIError(result['error'], response)
+                return result
+        except Exception as e:
+            if event is not None:
+                event.error = e
+            raise
+        finally:
+            if event is not None:
+                self._emit(event)
+
+    @staticmethod
+    def _record_response(
+        event: RequestEvent, response: 'aiohttp.ClientResponse', start: float
+    ) -> None:
+        event.network_time = perf_counter() - start
+        event.status = response.status
+        event.request_id = response.headers.get('RequestId')
+        event.units = response.headers.get('Units')
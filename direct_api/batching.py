@@ -0,0 +1,149 @@
+import inspect
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from .entities import BaseEntity
+from .exceptions import YdException
+from .limits import get_object_limit
+
+if TYPE_CHECKING:
+    from .client import DirectAPI
+
+__all__ = ('WriteBatcher',)
+
+
+class _Batch(object):
+    __slots__ = ('call', 'objects', 'futures', 'timer')
+
+    def __init__(self, call: Callable) -> None:
+        self.call = call
+        self.objects: list = []
+        # (future, start, end) - slice of objects sent by caller
+        self.futures: List[Tuple[Future, int, int]] = []
+        self.timer: Optional[threading.Timer] = None
+
+
+def _slice_response(response: dict, start: int, end: int) -> dict:
+    # lists of result (AddResults, SetResults, ...) are in order of request objects
+    return {
+        'result': {
+            k: v[start:end] if isinstance(v, list) else v
+            for k, v in response.get('result', {}).items()
+        }
+    }
+
+
+class WriteBatcher(object):
+    """
+    Joins small write calls (Keyword.suspend([id]), KeywordBid.set([bid]), ...) of
+    many callers into one request by login, service and method. Batch is sent after
+    window seconds or when it reaches max_size objects, every caller gets future
+    with its own part of result:
+
+        with WriteBatcher(client, window=0.05) as batcher:
+            future = batcher.submit(client.Keyword.suspend, [keyword_id])
+            future.result()  # {'result': {'SuspendResults': [...]}}
+    """
+
+    def __init__(
+        self, client: 'DirectAPI', window: float = 0.05, max_size: Optional[int] = None
+    ) -> None:
+        """
+        :param client: DirectAPI
+        :param window: float, seconds calls are collected into batch
+        :param max_size: optional int, objects in batch (default - object limit of method or 1000)
+        """
+        if inspect.iscoroutinefunction(client._request):
+            raise YdException('WriteBatcher is not supported by async client')
+        self._client = client
+        self._window = window
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._batches: Dict[tuple, _Batch] = {}
+        self._closed = False
+
+    def __enter__(self) -> 'WriteBatcher':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _batch_size(self, entity: BaseEntity, method: str) -> int:
+        if self._max_size:
+            return self._max_size
+        # method name of API is not known by entity method, e.g. set_auto -> setAuto
+        api_method = ''.join(
+            w.capitalize() if i else w for i, w in enumerate(method.split('_'))
+        )
+        return get_object_limit(entity.service.lower(), api_method) or 1000
+
+    def submit(
+        self, call: Callable, objects: list, login: Optional[str] = None
+    ) -> Future:
+        """
+        :param call: write method of entity with one list argument (client.Keyword.suspend)
+        :param objects: list (objects or ids)
+        :param login: optional str (Client-Login of entity client by default)
+        :return: concurrent.futures.Future of response part of objects
+        """
+        entity = getattr(call, '__self__', None)
+        if not isinstance(entity, BaseEntity):
+            raise YdException('call must be a method of entity')
+        login = login or entity._client.clid
+        key = (login, type(entity).__name__, call.__name__)
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise YdException('WriteBatcher is closed')
+            batch = self._batches.get(key)
+            if batch is None:
+                batch = self._batches[key] = _Batch(
+                    self._client._bind_call(login, call)
+                )
+                batch.timer = threading.Timer(self._window, self._flush, (key, batch))
+                batch.timer.daemon = True
+                batch.timer.start()
+            start = len(batch.objects)
+            batch.objects.extend(objects)
+            batch.futures.append((future, start, len(batch.objects)))
+            full = len(batch.objects) >= self._batch_size(entity, call.__name__)
+        if full:
+            self._flush(key)
+        return future
+
+    def _flush(self, key: tuple, batch: Optional[_Batch] = None) -> None:
+        with self._lock:
+            # timer of batch already sent by size must not send the next batch of key
+            if batch is not None and self._batches.get(key) is not batch:
+                return
+            batch = self._batches.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        try:
+            response = batch.call(batch.objects)
+        except Exception as e:
+            for future, _, _ in batch.futures:
+                future.set_exception(e)
+            return
+        for future, start, end in batch.futures:
+            future.set_result(_slice_response(response, start, end))
+
+    def flush(self) -> None:
+        """
+        Send all collected batches
+        """
+        with self._lock:
+            keys = list(self._batches)
+        for key in keys:
+            self._flush(key)
+
+    def close(self) -> None:
+        """
+        Send collected batches, new calls are not accepted
+        """
+        with self._lock:
+            self._closed = True
+        self.flush()
@@ -0,0 +1,278 @@
+import threading
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+from .exceptions import YdException
+
+if TYPE_CHECKING:
+    from .client import DirectAPI
+
+__all__ = ('BidCache', 'BidSync')
+
+# bid is not known (not requested or not set)
+NO_BID = -1
+
+
+def _is_sorted(ids: array) -> bool:
+    return all(ids[i] <= ids[i + 1] for i in range(len(ids) - 1))
+
+
+def _is_unique(sorted_ids: array) -> bool:
+    return all(sorted_ids[i] != sorted_ids[i + 1] for i in range(len(sorted_ids) - 1))
+
+
+def _merge_duplicates(
+    ids: array, search: array, network: array
+) -> Tuple[array, array, array]:
+    """
+    Merge bids of the same keyword in sorted arrays, NO_BID keeps earlier value
+    """
+    new_ids, new_search, new_network = array('q'), array('q'), array('q')
+    for keyword_id, search_bid, network_bid in zip(ids, search, network):
+        if new_ids and new_ids[-1] == keyword_id:
+            if search_bid != NO_BID:
+                new_search[-1] = search_bid
+            if network_bid != NO_BID:
+                new_network[-1] = network_bid
+            continue
+        new_ids.append(keyword_id)
+        new_search.append(search_bid)
+        new_network.append(network_bid)
+    return new_ids, new_search, new_network
+
+
+class BidCache(object):
+    """
+    Last applied bids by KeywordId in sorted int64 arrays (24 bytes per keyword),
+    bids are in micro units of currency as in API
+    """
+
+    def __init__(self) -> None:
+        self._ids = array('q')
+        self._search = array('q')
+        self._network = array('q')
+        # bids of keywords missing in sorted arrays in order of set(),
+        # merged into sorted arrays by compact()
+        self._pending_ids = array('q')
+        self._pending_search = array('q')
+        self._pending_network = array('q')
+
+    def __len__(self) -> int:
+        self.compact()
+        return len(self._ids)
+
+    def _index(self, keyword_id: int) -> int:
+        i = bisect_left(self._ids, keyword_id)
+        if i < len(self._ids) and self._ids[i] == keyword_id:
+            return i
+        return -1
+
+    def get(self, keyword_id: int) -> Optional[Tuple[int, int]]:
+        """
+        :param keyword_id: int
+        :return: tuple (search bid, network bid) or None, unknown bid is NO_BID
+        """
+        self.compact()
+        i = self._index(keyword_id)
+        if i >= 0:
+            return self._search[i], self._network[i]
+        return None
+
+    def set(self, keyword_id: int, search_bid: int, network_bid: int) -> None:
+        """
+        :param keyword_id: int
+        :param search_bid: int (NO_BID keeps cached value)
+        :param network_bid: int (NO_BID keeps cached value)
+        """
+        i = self._index(keyword_id)
+        if i >= 0:
+            if search_bid != NO_BID:
+                self._search[i] = search_bid
+            if network_bid != NO_BID:
+                self._network[i] = network_bid
+            return
+        self._pending_ids.append(keyword_id)
+        self._pending_search.append(search_bid)
+        self._pending_network.append(network_bid)
+
+    def compact(self) -> None:
+        """
+        Merge bids of new keywords into sorted arrays: pending bids are sorted once
+        and merged with sorted arrays in one pass
+        """
+        pending_ids = self._pending_ids
+        if not pending_ids:
+            return
+        pending_search = self._pending_search
+        pending_network = self._pending_network
+        self._pending_ids = array('q')
+        self._pending_search = array('q')
+        self._pending_network = array('q')
+        if not _is_sorted(pending_ids):
+            # stable, later bids of the same keyword stay after earlier ones
+            order = sorted(range(len(pending_ids)), key=pending_ids.__getitem__)
+            pending_ids = array('q', (pending_ids[i] for i in order))
+            pending_search = array('q', (pending_search[i] for i in order))
+            pending_network = array('q', (pending_network[i] for i in order))
+            del order
+        if not _is_unique(pending_ids):
+            pending_ids, pending_search, pending_network = _merge_duplicates(
+                pending_ids, pending_search, pending_network
+            )
+        if not self._ids:
+            self._ids, self._search, self._network = (
+                pending_ids, pending_search, pending_network
+            )
+            return
+
+        ids, search, network = self._ids, self._search, self._network
+        new_ids, new_search, new_network = array('q'), array('q'), array('q')
+        start = 0
+        for j, keyword_id in enumerate(pending_ids):
+            # pending keywords are missing in sorted arrays
+            end = bisect_left(ids, keyword_id, start)
+            new_ids.extend(ids[start:end])
+            new_search.extend(search[start:end])
+            new_network.extend(network[start:end])
+            new_ids.append(keyword_id)
+            new_search.append(pending_search[j])
+            new_network.append(pending_network[j])
+            start = end
+        new_ids.extend(ids[start:])
+        new_search.extend(search[start:])
+        new_network.extend(network[start:])
+        self._ids, self._search, self._network = new_ids, new_search, new_network
+
+    def clear(self) -> None:
+        self._ids = array('q')
+        self._search = array('q')
+        self._network = array('q')
+        self._pending_ids = array('q')
+        self._pending_search = array('q')
+        self._pending_network = array('q')
+
+
+def _bid(value: Optional[int]) -> int:
+    return NO_BID if value is None else int(value)
+
+
+class BidSync(object):
+    """
+    Sends only bids which differ from last applied ones (by more than epsilon):
+
+        bid_sync = BidSync(client, epsilon=100000)
+        bid_sync.refresh(campaign_ids=campaign_ids)  # KeywordBid.get is the source of truth
+        result = bid_sync.apply([{'KeywordId': 1, 'SearchBid': 15000000, 'NetworkBid': 3000000}, ...])
+    """
+
+    def __init__(
+        self, client: 'DirectAPI', epsilon: int = 0, entity: str = 'KeywordBid'
+    ) -> None:
+        """
+        :param client: DirectAPI
+        :param epsilon: int, bids differing by not more than epsilon (micro units) are not sent
+        :param entity: str, KeywordBid (SearchBid, NetworkBid) or Bid (Bid, ContextBid)
+        """
+        if entity not in ('KeywordBid', 'Bid'):
+            raise YdException('entity must be KeywordBid or Bid')
+        self._client = client
+        self._entity = entity
+        self.epsilon = epsilon
+        self.cache = BidCache()
+        self._lock = threading.Lock()
+
+    @property
+    def _fields(self) -> Tuple[str, str]:
+        if self._entity == 'KeywordBid':
+            return 'SearchBid', 'NetworkBid'
+        return 'Bid', 'ContextBid'
+
+    def refresh(
+        self,
+        campaign_ids: Optional[list] = None,
+        ad_group_ids: Optional[list] = None,
+        keyword_ids: Optional[list] = None,
+    ) -> int:
+        """
+        Load current bids of keywords by KeywordBid.get
+        :param campaign_ids: optional list
+        :param ad_group_ids: optional list
+        :param keyword_ids: optional list
+        :return: int, number of loaded bids
+        """
+        count = 0
+        items = self._client.KeywordBid.iter_get(
+            field_names=['KeywordId'],
+            campaign_ids=campaign_ids,
+            ad_group_ids=ad_group_ids,
+            keyword_ids=keyword_ids,
+            search_field_names=['Bid'],
+            network_field_names=['Bid'],
+        )
+        with self._lock:
+            for item in items:
+                self.cache.set(
+                    item['KeywordId'],
+                    _bid((item.get('Search') or {}).get('Bid')),
+                    _bid((item.get('Network') or {}).get('Bid')),
+                )
+                count += 1
+            self.cache.compact()
+        return count
+
+    def _changed(self, cached: int, new: int) -> bool:
+        return new != NO_BID and (cached == NO_BID or abs(new - cached) > self.epsilon)
+
+    def diff(self, bids: Iterable[dict]) -> List[dict]:
+        """
+        :param bids: iterable of KeywordBid.set objects (Bid.set objects for entity=Bid)
+        :return: list of bids which differ from cache, unchanged fields are removed
+        """
+        search_field, network_field = self._fields
+        changed = []
+        with self._lock:
+            for bid in bids:
+                search = _bid(bid.get(search_field))
+                network = _bid(bid.get(network_field))
+                keyword_id = bid.get('KeywordId')
+                # bids of ad groups and campaigns (Bid.set) are not cached
+                cached = None if keyword_id is None else self.cache.get(keyword_id)
+                if cached is None:
+                    changed.append(bid)
+                    continue
+                search_changed = self._changed(cached[0], search)
+                network_changed = self._changed(cached[1], network)
+                if not search_changed and not network_changed:
+                    continue
+                bid = dict(bid)
+                if not search_changed:
+                    bid.pop(search_field, None)
+                if not network_changed:
+                    bid.pop(network_field, None)
+                changed.append(bid)
+        return changed
+
+    def apply(self, bids: Iterable[dict]) -> dict:
+        """
+        Send changed bids (split by method limit), cache is updated by bids set without errors
+        :param bids: iterable of KeywordBid.set objects (Bid.set objects for entity=Bid)
+        :return: dict, merged set response ({'result': {'SetResults': []}} if nothing changed)
+        """
+        changed = self.diff(bids)
+        if not changed:
+            return {'result': {'SetResults': []}}
+        response = getattr(self._client, self._entity).set(changed)
+        results = response.get('result', {}).get('SetResults', [])
+        search_field, network_field = self._fields
+        with self._lock:
+            # SetResults are in order of request objects
+            for bid, result in zip(changed, results):
+                if result.get('Errors') or bid.get('KeywordId') is None:
+                    continue
+                self.cache.set(
+                    bid['KeywordId'],
+                    _bid(bid.get(search_field)),
+                    _bid(bid.get(network_field)),
+                )
+        return response
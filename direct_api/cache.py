@@ -0,0 +1,217 @@
+import json
+import threading
+from collections import OrderedDict
+from time import time
+from typing import Dict, Optional
+
+__all__ = ('ResponseCache', 'MemoryBackend', 'SqliteBackend', 'READ_METHODS')
+
+# methods which don't modify objects, other methods invalidate cache of service
+READ_METHODS = frozenset(
+    {'get', 'check', 'checkCampaigns', 'checkDictionaries', 'hasSearchVolume'}
+)
+
+
+class MemoryBackend(object):
+    """
+    In-process LRU storage of cache entries
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        """
+        :param max_size: int, max number of entries
+        """
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        # (namespace, key) -> (expires, value)
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None:
+                return None
+            if entry[0] <= time():
+                del self._entries[(namespace, key)]
+                return None
+            self._entries.move_to_end((namespace, key))
+            return entry[1]
+
+    def set(self, namespace: str, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[(namespace, key)] = (time() + ttl, value)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                return
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[entry_key]
+
+
+class SqliteBackend(object):
+    """
+    On-disk LRU storage of cache entries, can be shared by processes
+    """
+
+    def __init__(self, path: str, max_size: int = 100000) -> None:
+        """
+        :param path: str, sqlite database file
+        :param max_size: int, max number of entries
+        """
+        # sqlite3 is not imported by the package unless this backend is used
+        import sqlite3
+
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'namespace TEXT NOT NULL, key TEXT NOT NULL, expires REAL NOT NULL, '
+                'used REAL NOT NULL, value TEXT NOT NULL, PRIMARY KEY (namespace, key))'
+            )
+            self._connection.execute(
+                'CREATE INDEX IF NOT EXISTS responses_used ON responses (used)'
+            )
+
+    def get(self, namespace: str, key: str) -> Optional[str]:
+        now = time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                'SELECT expires, value FROM responses WHERE namespace = ? AND key = ?',
+                (namespace, key),
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] <= now:
+                self._connection.execute(
+                    'DELETE FROM responses WHERE namespace = ? AND key = ?',
+                    (namespace, key),
+                )
+                return None
+            self._connection.execute(
+                'UPDATE responses SET used = ? WHERE namespace = ? AND key = ?',
+                (now, namespace, key),
+            )
+            return row[1]
+
+    def set(self, namespace: str, key: str, value: str, ttl: float) -> None:
+        now = time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)',
+                (namespace, key, now + ttl, now, value),
+            )
+            self._connection.execute(
+                'DELETE FROM responses WHERE rowid IN (SELECT rowid FROM responses '
+                'ORDER BY used DESC LIMIT -1 OFFSET ?)',
+                (self._max_size,),
+            )
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        with self._lock, self._connection:
+            if namespace is None:
+                self._connection.execute('DELETE FROM responses')
+            else:
+                self._connection.execute(
+                    'DELETE FROM responses WHERE namespace = ?', (namespace,)
+                )
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+class ResponseCache(object):
+    """
+    Read-through cache of get responses keyed by login, service and params,
+    write methods of service invalidate its entries of login:
+
+        client = DirectAPI('<access_token>', '<clid>', response_cache=ResponseCache(ttl=300))
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        ttl: float = 300,
+        ttls: Optional[Dict[str, float]] = None,
+    ) -> None:
+        """
+        :param backend: MemoryBackend (by default), SqliteBackend or object with the same methods
+        :param ttl: float, seconds responses are kept
+        :param ttls: optional dict {service: ttl}, ttl=0 disables cache of service
+        """
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.ttl = ttl
+        self.ttls = {k.lower(): v for k, v in (ttls or {}).items()}
+        # invalidations by namespace, response of get sent before invalidation is not stored
+        self._generations: Dict[str, int] = {}
+
+    @staticmethod
+    def _namespace(login: str, service: str) -> str:
+        return f'{login}:{service}'
+
+    @staticmethod
+    def _key(method: str, params: dict) -> str:
+        # params are canonicalized, so order of keys doesn't matter
+        return f'{method}:{json.dumps(params, sort_keys=True, separators=(",", ":"))}'
+
+    def get_ttl(self, service: str) -> float:
+        return self.ttls.get(service, self.ttl)
+
+    def get(
+        self, login: str, service: str, method: str, params: dict
+    ) -> Optional[dict]:
+        """
+        :return: cached response (new object for every call) or None
+        """
+        if not self.get_ttl(service):
+            return None
+        value = self.backend.get(
+            self._namespace(login, service), self._key(method, params)
+        )
+        return None if value is None else json.loads(value)
+
+    def generation(self, login: str, service: str) -> int:
+        return self._generations.get(self._namespace(login, service), 0)
+
+    def set(
+        self,
+        login: str,
+        service: str,
+        method: str,
+        params: dict,
+        response: dict,
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        :param generation: optional int, result of generation() before request,
+            response is not stored if service is invalidated since then
+        """
+        if generation is not None and generation != self.generation(login, service):
+            return
+        ttl = self.get_ttl(service)
+        if ttl:
+            self.backend.set(
+                self._namespace(login, service),
+                self._key(method, params),
+                json.dumps(response, ensure_ascii=False),
+                ttl,
+            )
+
+    def invalidate(self, login: str, service: str) -> None:
+        """
+        Remove responses of service for login
+        :param login: str
+        :param service: str
+        """
+        namespace = self._namespace(login, service)
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+        self.backend.clear(namespace)
+
+    def clear(self) -> None:
+        self.backend.clear()
@@ -1,8 +1,34 @@
+from contextlib import contextmanager
+import copy
+import logging
 import requests
-from time import sleep
+from requests.adapters import HTTPAdapter
+from collections import namedtuple
+from time import perf_counter, sleep
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    TYPE_CHECKING,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+    overload,
+)
 
+from .cache import READ_METHODS
 from .exceptions import YdAPIError, YdAuthError
+from .units import UnitsThrottler, UnitsTracker, count_objects, estimate_cost
+from .utils import merge_results
 from .entities import (
+    BaseEntity,
     Ad,
     AdImage,
     AdExtension,
@@ -28,60 +54,171 @@ from .entities import (
     Client,
 )
 
+# modules of optional features are imported when the feature is used
+if TYPE_CHECKING:
+    from .cache import ResponseCache
+    from .dictionaries import DictionaryCache
+    from .json_codec import JsonCodec
+    from .metrics import RequestEvent
+    from .retry import RetryPolicy
+    from .streaming import StreamedPage
+
+logger = logging.getLogger(__name__)
+
+FanOutResult = namedtuple('FanOutResult', ('login', 'result', 'error'))
+# views of client have class of client (DirectAPI or AsyncDirectAPI)
+_Client = TypeVar('_Client', bound='BaseDirectAPI')
+_Entity = TypeVar('_Entity', bound=BaseEntity)
+
+
+# objects of concurrent calls are passed from worker threads by lists up to this size
+_BATCH_SIZE = 500
+
+
+class _LazyEntity(Generic[_Entity]):
+    """
+    Entity of client is created on first access and stored in client __dict__,
+    so next accesses don't call the descriptor
+    """
+
+    def __init__(self, entity_class: Type[_Entity]) -> None:
+        self._entity_class = entity_class
+        self._name = entity_class.__name__
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self._name = name
+
+    @overload
+    def __get__(
+        self, client: None, owner: Optional[type] = None
+    ) -> '_LazyEntity[_Entity]': ...
+
+    @overload
+    def __get__(
+        self, client: 'BaseDirectAPI', owner: Optional[type] = None
+    ) -> _Entity: ...
+
+    def __get__(
+        self, client: Optional['BaseDirectAPI'], owner: Optional[type] = None
+    ) -> Union['_LazyEntity[_Entity]', _Entity]:
+        if client is None:
+            return self
+        # entities are annotated for sync client and shared with async one
+        entity = client.__dict__[self._name] = self._entity_class(
+            cast('DirectAPI', client)
+        )
+        return entity
+
+
+class BaseDirectAPI(object):
+    """
+    Common part of DirectAPI and AsyncDirectAPI: headers, settings and entities.
+    Transport methods (_request, _get_reports, _iter_report_rows) are implemented by subclasses.
+    """
 
-class DirectAPI(object):
     API_URL = 'https://api.direct.yandex.com/json/v5/'
 
+    # entities are created on first access
+    Ad = _LazyEntity(Ad)
+    AdImage = _LazyEntity(AdImage)
+    AdExtension = _LazyEntity(AdExtension)
+    AdGroup = _LazyEntity(AdGroup)
+    Bid = _LazyEntity(Bid)
+    AudienceTarget = _LazyEntity(AudienceTarget)
+    AgencyClient = _LazyEntity(AgencyClient)
+    BidsModifier = _LazyEntity(BidsModifier)
+    Campaign = _LazyEntity(Campaign)
+    Change = _LazyEntity(Change)
+    Dictionary = _LazyEntity(Dictionary)
+    DynamicTextAdTarget = _LazyEntity(DynamicTextAdTarget)
+    KeywordBid = _LazyEntity(KeywordBid)
+    Keyword = _LazyEntity(Keyword)
+    Lead = _LazyEntity(Lead)
+    NegativeKeywordSharedSet = _LazyEntity(NegativeKeywordSharedSet)
+    Sitelink = _LazyEntity(Sitelink)
+    KeywordsResearch = _LazyEntity(KeywordsResearch)
+    RetargetingList = _LazyEntity(RetargetingList)
+    VCard = _LazyEntity(VCard)
+    TurboPage = _LazyEntity(TurboPage)
+    Report = _LazyEntity(Report)
+    Client = _LazyEntity(Client)
+
     def __init__(
-        self, access_token: str, clid: str, refresh_token: str = '', lang: str = 'ru'
+        self,
+        access_token: str,
+        clid: str,
+        refresh_token: str = '',
+        lang: str = 'ru',
+        throttle: bool = False,
+        retry_policy: Optional['RetryPolicy'] = None,
+        compression: bool = True,
+        response_cache: Optional['ResponseCache'] = None,
+        api_url: Optional[str] = None,
+        hooks: Optional[list] = None,
+        json_codec: Union[str, 'JsonCodec', None] = None,
     ) -> None:
         """
         :param access_token: str
         :param clid: str
         :param refresh_token: str
         :param lang: str (ru, en, tr, uk)
+        :param throttle: bool, pace requests so points of login last until the end of the day
+        :param retry_policy: optional RetryPolicy, failed requests are not retried by default
+        :param compression: bool, request gzip compressed responses (JSON services and reports)
+        :param response_cache: optional ResponseCache, get responses are not cached by default
+        :param api_url: optional str, base URL of JSON services (sandbox, local emulator)
+        :param hooks: optional list of callables, called with RequestEvent of every HTTP request
+        :param json_codec: 'auto' (the fastest installed: orjson, ujson, json), 'json', 'orjson',
+            'ujson' or JsonCodec instance, encodes requests and decodes responses
         """
+        if api_url is not None:
+            self.API_URL = api_url if api_url.endswith('/') else f'{api_url}/'
         self._access_token = access_token
         self._clid = clid
         self._refresh_token = refresh_token
-        self._session = requests.Session()
         self._lang = lang.lower()
-        self._session.headers['Accept'] = 'application/json'
-        self._session.headers['Authorization'] = f'Bearer {self._access_token}'
-        self._session.headers.update(
-            {"Accept-Language": self._lang, "Client-Login": self._clid}
-        )
-        # add entities
-        self.Ad = Ad(self)
-        self.AdImage = AdImage(self)
-        self.AdExtension = AdExtension(self)
-        self.AdGroup = AdGroup(self)
-        self.Bid = Bid(self)
-        self.AudienceTarget = AudienceTarget(self)
-        self.AgencyClient = AgencyClient(self)
-        self.BidsModifier = BidsModifier(self)
-        self.Campaign = Campaign(self)
-        self.Change = Change(self)
-        self.Dictionary = Dictionary(self)
-        self.DynamicTextAdTarget = DynamicTextAdTarget(self)
-        self.KeywordBid = KeywordBid(self)
-        self.Keyword = Keyword(self)
-        self.Lead = Lead(self)
-        self.NegativeKeywordSharedSet = NegativeKeywordSharedSet(self)
-        self.Sitelink = Sitelink(self)
-        self.KeywordsResearch = KeywordsResearch(self)
-        self.RetargetingList = RetargetingList(self)
-        self.VCard = VCard(self)
-        self.TurboPage = TurboPage(self)
-        self.Report = Report(self)
-        self.Client = Client(self)
+        self._headers = {
+            'Accept': 'application/json',
+            'Authorization': f'Bearer {self._access_token}',
+            'Accept-Language': self._lang,
+            'Client-Login': self._clid,
+            'Accept-Encoding': 'gzip, deflate' if compression else 'identity',
+            'Content-Type': 'application/json; charset=utf-8',
+        }
+        self.units = UnitsTracker()
+        self._throttler = UnitsThrottler(self.units) if throttle else None
+        self._retry_policy = retry_policy
+        self._dictionary_cache: Optional['DictionaryCache'] = None
+        self._response_cache = response_cache
+        # list is shared with client views, hooks added later are called by them too
+        self._hooks: list = list(hooks or ())
+        # the fastest installed codec is imported by the first request, not by construction
+        self._json_codec: Optional['JsonCodec'] = None
+        if json_codec not in (None, 'auto'):
+            from .json_codec import get_codec
+
+            self._json_codec = get_codec(json_codec)
+
+    @property
+    def _codec(self) -> 'JsonCodec':
+        if self._json_codec is None:
+            from .json_codec import get_codec
+
+            self._json_codec = get_codec()
+        return self._json_codec
+
+    def _init_entities(self) -> None:
+        # entities of copied client are bound to original one, they are created again on access
+        for name in [k for k, v in vars(self).items() if isinstance(v, BaseEntity)]:
+            del self.__dict__[name]
 
     def set_clid(self, clid: str) -> None:
         self._clid = clid
         self._set_session_headers({"Client-Login": clid})
 
     def _set_session_headers(self, headers: dict) -> None:
-        self._session.headers.update(**headers)
+        # headers are replaced, not updated, so requests in flight keep consistent headers
+        self._headers = dict(self._headers, **headers)
 
     def set_lang(self, lang: str) -> None:
         """
@@ -107,41 +244,609 @@ class DirectAPI(object):
     def access_token(self) -> str:
         return self._access_token
 
-    def _get_reports(self, params: dict) -> str:
-        url = f'{self.API_URL}reports/'
+    def with_options(
+        self: _Client,
+        login: Optional[str] = None,
+        lang: Optional[str] = None,
+        access_token: Optional[str] = None,
+    ) -> _Client:
+        """
+        Client view with own headers, the original client is not modified,
+        so views of one client can be used by many threads at the same time
+        :param login: optional str, Client-Login of view
+        :param lang: optional str, Accept-Language of view
+        :param access_token: optional str, token of view
+        :return: copy of client, connection pool, units and caches are shared with original client
+        """
+        client = copy.copy(self)
+        headers = {}
+        if login is not None:
+            client._clid = headers['Client-Login'] = login
+        if lang is not None:
+            client._lang = lang.lower()
+            headers['Accept-Language'] = client._lang
+        if access_token is not None:
+            client._access_token = access_token
+            headers['Authorization'] = f'Bearer {access_token}'
+        client._headers = dict(self._headers, **headers)
+        client._init_entities()
+        return client
+
+    @contextmanager
+    def as_login(self, login: str) -> Iterator['BaseDirectAPI']:
+        """
+        Scoped client view for login
+            with client.as_login('<login>') as login_client:
+                login_client.Campaign.get(field_names=['Id'])
+        :param login: str
+        :return: context manager of client view
+        """
+        yield self.with_options(login=login)
+
+    def _for_login(self: _Client, login: str) -> _Client:
+        """
+        :param login: str
+        :return: copy of client with own Client-Login header,
+            connection pool and units are shared with original client
+        """
+        return self.with_options(login=login)
+
+    def _bind_call(self, login: str, call: Callable) -> Callable:
+        """
+        :param login: str
+        :param call: entity method (client.Campaign.get) or callable with client as first argument
+        :return: callable executed with Client-Login of login
+        """
+        client = self._for_login(login)
+        entity = getattr(call, '__self__', None)
+        if isinstance(entity, BaseEntity):
+            return getattr(getattr(client, type(entity).__name__), call.__name__)
+        return lambda *args, **kwargs: call(client, *args, **kwargs)
+
+    def add_hook(self, hook: Callable[['RequestEvent'], Any]) -> None:
+        """
+        :param hook: callable, called with RequestEvent after every HTTP request
+            (MetricsRegistry or custom function), exceptions of hook are logged
+            and do not affect the request
+        """
+        self._hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[['RequestEvent'], Any]) -> None:
+        self._hooks.remove(hook)
+
+    def _new_event(
+        self, kind: str, service: str, method: str, headers: Optional[dict] = None
+    ) -> Optional['RequestEvent']:
+        """
+        :return: RequestEvent filled by request or None if there are no hooks
+        """
+        if not self._hooks:
+            return None
+        from .metrics import RequestEvent
+
+        login = (headers or self._headers).get('Client-Login', self._clid)
+        return RequestEvent(kind, service, method, login)
+
+    def _emit(self, event: 'RequestEvent') -> None:
+        # called in finally of request, must not replace its result or error
+        for hook in tuple(self._hooks):
+            try:
+                hook(event)
+            except Exception:
+                logger.exception('Request hook %r failed', hook)
+
+    def _throttle_delay(self, service: str, method: str, params: dict) -> float:
+        """
+        :return: float, seconds to wait before request (0 if throttling is off)
+        """
+        if self._throttler is None:
+            return 0.0
+        cost = estimate_cost(service, method, count_objects(params))
+        return self._throttler.reserve(self._headers['Client-Login'], cost)
+
+    def _retry_delay(
+        self, error: Exception, method: str, attempt: int
+    ) -> Optional[float]:
+        """
+        :param error: exception of failed attempt
+        :param method: str
+        :param attempt: int, number of failed attempt starting from 0
+        :return: float, seconds to wait before next attempt or None if error must be raised
+        """
+        policy = self._retry_policy
+        if policy is None or not policy.should_retry(error, method, attempt):
+            return None
+        return policy.get_backoff(error, attempt)
+
+    def _track_units(self, headers, service: str) -> None:
+        self.units.update(headers, service, self._headers['Client-Login'])
+
+    # transport methods return results for DirectAPI and awaitables for AsyncDirectAPI
+
+    def _request(
+        self, service: str, method: str, params: dict
+    ) -> Union[dict, Awaitable[dict]]:
+        """
+        :param service: str
+        :param method: str
+        :param params: dict
+        :return: dict (decoded response)
+        """
+        raise NotImplementedError
+
+    def _cached_request(
+        self, service: str, method: str, params: dict
+    ) -> Union[dict, Awaitable[dict]]:
+        """
+        Same as _request, but response is taken from (and stored to) response cache
+        :return: dict (decoded response)
+        """
+        raise NotImplementedError
+
+    def _invalidate_cache(self, service: str, method: str) -> None:
+        if self._response_cache is not None and method not in READ_METHODS:
+            self._response_cache.invalidate(self._headers['Client-Login'], service)
+
+    def _request_many(
+        self, service: str, method: str, params_list: list
+    ) -> Union[dict, Awaitable[dict]]:
+        """
+        Send requests of one method (chunks of objects) and merge their results
+        :param service: str
+        :param method: str
+        :param params_list: list of params
+        :return: dict
+        :raises YdPartialError: some chunks failed, it keeps merged results of the others
+            and errors by index of chunk in params_list
+        """
+        raise NotImplementedError
+
+    def _get_reports(
+        self, params: dict, headers: Optional[dict] = None
+    ) -> Union[str, Awaitable[str]]:
+        raise NotImplementedError
+
+    def _poll_report(
+        self, params: dict, headers: Optional[dict] = None
+    ) -> Union[Tuple[Optional[str], int], Awaitable[Tuple[Optional[str], int]]]:
+        raise NotImplementedError
+
+    def _iter_report_rows(
+        self,
+        params: dict,
+        field_names: list,
+        as_dict: bool = True,
+        headers: Optional[dict] = None,
+    ) -> Union[Iterator[Union[dict, tuple]], AsyncIterator[Union[dict, tuple]]]:
+        raise NotImplementedError
+
+
+class DirectAPI(BaseDirectAPI):
+    def __init__(
+        self,
+        access_token: str,
+        clid: str,
+        refresh_token: str = '',
+        lang: str = 'ru',
+        throttle: bool = False,
+        retry_policy: Optional['RetryPolicy'] = None,
+        compression: bool = True,
+        max_workers: int = 1,
+        pool_connections: int = 10,
+        pool_maxsize: Optional[int] = None,
+        pool_block: bool = False,
+        keep_alive: bool = True,
+        response_cache: Optional['ResponseCache'] = None,
+        single_flight: bool = False,
+        api_url: Optional[str] = None,
+        hooks: Optional[list] = None,
+        json_codec: Union[str, 'JsonCodec', None] = None,
+    ) -> None:
+        """
+        :param access_token: str
+        :param clid: str
+        :param refresh_token: str
+        :param lang: str (ru, en, tr, uk)
+        :param throttle: bool, pace requests so points of login last until the end of the day
+        :param retry_policy: optional RetryPolicy, failed requests are not retried by default
+        :param compression: bool, request gzip compressed responses (JSON services and reports)
+        :param max_workers: int, number of threads for requests sent concurrently (chunks)
+        :param pool_connections: int, number of hosts connection pools are kept for
+        :param pool_maxsize: optional int, connections kept per host (default - max(10, max_workers))
+        :param pool_block: bool, wait for free connection instead of opening extra one
+        :param keep_alive: bool, reuse connections between requests
+        :param response_cache: optional ResponseCache, get responses are not cached by default
+        :param single_flight: bool, identical read requests sent by threads at the same time
+            share one request and its response
+        :param api_url: optional str, base URL of JSON services (sandbox, local emulator)
+        :param hooks: optional list of callables, called with RequestEvent of every HTTP request
+        :param json_codec: 'auto' (the fastest installed: orjson, ujson, json), 'json', 'orjson',
+            'ujson' or JsonCodec instance, encodes requests and decodes responses
+        """
+        super().__init__(
+            access_token,
+            clid,
+            refresh_token,
+            lang,
+            throttle,
+            retry_policy,
+            compression,
+            response_cache,
+            api_url,
+            hooks,
+            json_codec,
+        )
+        self._max_workers = max_workers
+        self._single_flight = None
+        if single_flight:
+            from . import single_flight as flight
+
+            self._single_flight = flight.SingleFlight()
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize or max(10, max_workers),
+            pool_block=pool_block,
+        )
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        if not keep_alive:
+            self._headers['Connection'] = 'close'
+
+    def fan_out(
+        self,
+        logins: list,
+        call: Callable,
+        *args,
+        max_workers: Optional[int] = None,
+        **kwargs,
+    ) -> Iterator[FanOutResult]:
+        """
+        Execute call for every login concurrently, Client-Login is set per request,
+        so the client is not modified
+            for item in client.fan_out(logins, client.Campaign.get, field_names=['Id']):
+                print(item.login, item.result, item.error)
+        :param logins: list
+        :param call: entity method (client.Campaign.get) or callable with client as first argument
+        :param args: call args
+        :param max_workers: int, number of threads (default - max_workers of client or 10)
+        :param kwargs: call kwargs
+        :return: generator of FanOutResult(login, result, error) in order of completion
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        def execute(login: str) -> Any:
+            return self._bind_call(login, call)(*args, **kwargs)
+
+        workers = max_workers or max(self._max_workers, 10)
+        with ThreadPoolExecutor(min(workers, len(logins) or 1)) as executor:
+            futures = {executor.submit(execute, login): login for login in logins}
+            for future in as_completed(futures):
+                error = future.exception()
+                yield FanOutResult(
+                    futures[future], None if error else future.result(), error
+                )
+
+    def _retrying(self, method: str, func: Callable, *args, **kwargs) -> Any:
+        """
+        Call func, failed attempts are retried by retry policy
+        :param method: str, API method
+        :param func: callable
+        :return: result of func
+        """
+        attempt = 0
         while True:
-            response = self._session.post(url, json=params, timeout=10)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                delay = self._retry_delay(e, method, attempt)
+                if delay is None:
+                    raise
+            attempt += 1
+            sleep(delay)
+
+    def _send_report_request(
+        self, params: dict, headers: Optional[dict] = None, stream: bool = False
+    ) -> requests.Response:
+        """
+        :param params: dict
+        :param headers: optional dict, additional headers of request
+        :param stream: bool, do not load response body
+        :return: response object with status 200, 201 or 202
+        """
+        url = f'{self.API_URL}reports/'
+        headers = dict(self._headers, **headers) if headers else self._headers
+        event = self._new_event('report', 'reports', 'get', headers)
+        try:
+            start = perf_counter()
+            data = self._codec.dumps(params)
+            if event is not None:
+                event.serialize_time = perf_counter() - start
+                event.request_bytes = len(data)
+                start = perf_counter()
+            response = self._session.post(
+                url, data=data, headers=headers, timeout=10, stream=stream
+            )
+            if event is not None:
+                self._record_response(event, response, start, stream)
             response.encoding = 'utf-8'
+            if response.status_code not in (200, 201, 202):
+                error = self._codec.loads(response.content)['error']
+                raise YdAPIError(error, response)
+            return response
+        except Exception as e:
+            if event is not None:
+                event.error = e
+            raise
+        finally:
+            if event is not None:
+                self._emit(event)
+
+    def _poll_report(
+        self, params: dict, headers: Optional[dict] = None
+    ) -> Tuple[Optional[str], int]:
+        """
+        Send report request once
+        :param params: dict
+        :param headers: optional dict, additional headers of request
+        :return: tuple (report or None if report is in offline queue, retryIn)
+        """
+        response = self._retrying('get', self._send_report_request, params, headers)
+        if response.status_code == 200:
+            return response.content.decode('utf-8'), 0
+        return None, int(response.headers.get("retryIn", 10))
+
+    def _post_report(
+        self, params: dict, stream: bool = False, headers: Optional[dict] = None
+    ) -> requests.Response:
+        """
+        Post report request and wait while report is in offline queue
+        :param params: dict
+        :param stream: bool, do not load response body
+        :param headers: optional dict, additional headers of request (processingMode, ...)
+        :return: response object with status 200
+        """
+        while True:
+            response = self._retrying(
+                'get', self._send_report_request, params, headers, stream=stream
+            )
             if response.status_code == 200:
-                return response.content.decode('utf-8')
-            elif response.status_code == 201:
-                # print("Report apply to offline que")
-                retryIn = int(response.headers.get("retryIn", 10))
-                sleep(retryIn)
-            elif response.status_code == 202:
-                retryIn = int(response.headers.get("retryIn", 10))
-                sleep(retryIn)
-            else:
-                error = response.json()['error']
-                raise YdAPIError(error)
+                return response
+            # report is in offline queue
+            retryIn = int(response.headers.get("retryIn", 10))
+            response.close()
+            sleep(retryIn)
+
+    def _get_reports(self, params: dict, headers: Optional[dict] = None) -> str:
+        return self._post_report(params, headers=headers).content.decode('utf-8')
+
+    def _iter_reports(
+        self, params: dict, headers: Optional[dict] = None
+    ) -> Iterator[str]:
+        """
+        :param params: dict
+        :param headers: optional dict, additional headers of request
+        :return: generator of report lines, body is read by chunks
+        """
+        from .streaming import CHUNK_SIZE
+
+        response = self._post_report(params, stream=True, headers=headers)
+        try:
+            # reports are utf-8, encoding of response may be unknown
+            for line in response.iter_lines(chunk_size=CHUNK_SIZE):
+                yield line.decode('utf-8')
+        finally:
+            response.close()
+
+    def _iter_report_rows(
+        self,
+        params: dict,
+        field_names: list,
+        as_dict: bool = True,
+        headers: Optional[dict] = None,
+    ) -> Iterator[Union[dict, tuple]]:
+        from .reports import has_title, parse_report_lines
+
+        return parse_report_lines(
+            self._iter_reports(params, headers),
+            field_names,
+            as_dict,
+            has_title(dict(self._headers, **headers) if headers else self._headers),
+        )
+
+    def _request(self, service: str, method: str, params: dict) -> dict:
+        if self._single_flight is not None and method in READ_METHODS:
+            from .single_flight import request_key
+
+            return self._single_flight.do(
+                request_key(self._headers, service, method, params),
+                self._retrying,
+                method,
+                self._send_api_request,
+                service,
+                method,
+                params,
+            )
+        try:
+            return self._retrying(
+                method, self._send_api_request, service, method, params
+            )
+        finally:
+            self._invalidate_cache(service, method)
+
+    def _cached_request(self, service: str, method: str, params: dict) -> dict:
+        cache = self._response_cache
+        if cache is None:
+            return self._request(service, method, params)
+        login = self._headers['Client-Login']
+        response = cache.get(login, service, method, params)
+        if response is None:
+            generation = cache.generation(login, service)
+            response = self._request(service, method, params)
+            cache.set(login, service, method, params, response, generation)
+        return response
+
+    def _request_many(self, service: str, method: str, params_list: list) -> dict:
+        def request(params: dict) -> Union[dict, Exception]:
+            # failed chunk does not discard results of the others
+            try:
+                return self._request(service, method, params)
+            except Exception as e:
+                return e
+
+        if self._max_workers <= 1:
+            responses = [request(p) for p in params_list]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(self._max_workers) as executor:
+                responses = list(executor.map(request, params_list))
+        return merge_results(responses, [count_objects(p) for p in params_list])
+
+    def _iter_many(self, calls: list) -> Iterator[Iterable]:
+        """
+        Run calls returning iterables, concurrently if max_workers > 1
+        :param calls: list of callables without arguments
+        :return: generator of call results (lazy and in order for one worker,
+            lists of objects of all calls in order of arrival otherwise)
+        """
+        if self._max_workers <= 1:
+            for call in calls:
+                yield call()
+            return
+        import threading
+        from concurrent.futures import ThreadPoolExecutor
+        from queue import Full, Queue
+
+        # bounded, worker threads wait while caller processes objects
+        batches: Queue = Queue(self._max_workers * 2)
+        stopped = threading.Event()
+        done = object()
+
+        def put(item: Any) -> bool:
+            while not stopped.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except Full:
+                    pass
+            return False
+
+        def produce(call: Callable[[], Iterable]) -> None:
+            if stopped.is_set():
+                return
+            try:
+                batch = []
+                for item in call():
+                    batch.append(item)
+                    # caller waiting for objects gets them without delay
+                    if len(batch) == _BATCH_SIZE or batches.empty():
+                        if not put(batch):
+                            return
+                        batch = []
+                if batch and not put(batch):
+                    return
+            except Exception as e:
+                put(e)
+            put(done)
+
+        with ThreadPoolExecutor(self._max_workers) as executor:
+            for call in calls:
+                executor.submit(produce, call)
+            running = len(calls)
+            try:
+                while running:
+                    batch = batches.get()
+                    if batch is done:
+                        running -= 1
+                    elif isinstance(batch, Exception):
+                        raise batch
+                    else:
+                        yield batch
+            finally:
+                # caller stopped iteration or call failed, workers exit on next object
+                stopped.set()
+
+    def _stream_request(self, service: str, method: str, params: dict) -> 'StreamedPage':
+        """
+        Same as _request, but objects of response are decoded while body is read
+        by caller; response cache and single-flight are not used
+        :return: StreamedPage
+        """
+        return self._retrying(
+            method, self._send_api_request, service, method, params, stream=True
+        )
 
     def _send_api_request(
-        self, service: str, method: str, params: dict, timeout: int = 30
-    ) -> requests.Response:
+        self,
+        service: str,
+        method: str,
+        params: dict,
+        timeout: int = 30,
+        stream: bool = False,
+    ) -> Union[dict, 'StreamedPage']:
         """
         :param service: str
         :param method: str
         :param params: dict
         :param timeout: int, default=30
-        :return: response object
+        :param stream: bool, return StreamedPage instead of decoded response
+        :return: dict (decoded response), error of request is raised as YdAPIError
         """
-        request_body = {'method': method, 'params': params}
+        delay = self._throttle_delay(service, method, params)
+        if delay:
+            sleep(delay)
         url = f'{self.API_URL}{service}'
-        response = self._session.post(url, json=request_body, timeout=timeout)
-        response.raise_for_status()
-        if response.status_code > 204:
-            error_data = response.json()
-            if response.status_code == 401:
-                raise YdAuthError(error_data['error'])
-            raise YdAPIError(error_data['error'])
-        return response
+        event = self._new_event('api', service, method)
+        try:
+            start = perf_counter()
+            data = self._codec.dumps({'method': method, 'params': params})
+            if event is not None:
+                event.serialize_time = perf_counter() - start
+                event.request_bytes = len(data)
+                start = perf_counter()
+            response = self._session.post(
+                url, data=data, headers=self._headers, timeout=timeout, stream=stream
+            )
+            if event is not None:
+                self._record_response(event, response, start, stream)
+                start = perf_counter()
+            self._track_units(response.headers, service)
+            response.raise_for_status()
+            if stream and response.status_code <= 204:
+                from .streaming import CHUNK_SIZE, StreamedPage
+
+                # error of response is raised by start(), so the request is retried
+                return StreamedPage(response.iter_content(CHUNK_SIZE), response).start()
+            # body is decoded once, from bytes
+            result = self._codec.loads(response.content)
+            if event is not None:
+                event.decode_time = perf_counter() - start
+            if response.status_code > 204:
+                if response.status_code == 401:
+                    raise YdAuthError(result['error'])
+                raise YdAPIError(result['error'], response)
+            if 'error' in result:
+                raise YdAPIError(result['error'], response)
+            return result
+        except Exception as e:
+            if event is not None:
+                event.error = e
+            raise
+        finally:
+            if event is not None:
+                self._emit(event)
+
+    @staticmethod
+    def _record_response(
+        event: 'RequestEvent',
+        response: requests.Response,
+        start: float,
+        stream: bool = False,
+    ) -> None:
+        event.network_time = perf_counter() - start
+        event.status = response.status_code
+        event.request_id = response.headers.get('RequestId')
+        event.units = response.headers.get('Units')
+        if not stream:
+            event.response_bytes = len(response.content)
@@ -0,0 +1,173 @@
+import json
+import os
+import threading
+from time import time
+from typing import TYPE_CHECKING, Dict, List, Optional, cast
+
+if TYPE_CHECKING:
+    from .client import DirectAPI
+
+__all__ = ('DictionaryCache',)
+
+# dictionaries invalidated by flags of Change.check_dictionaries response
+CHANGE_FLAGS: Dict[str, tuple] = {
+    'RegionsChanged': ('GeoRegions', 'GeoRegionNames'),
+    'TimeZonesChanged': ('TimeZones',),
+}
+
+
+class DictionaryCache(object):
+    """
+    In-memory (and optionally on-disk) cache of Dictionaries service.
+    GeoRegions and TimeZones are invalidated by Change.check_dictionaries,
+    other dictionaries have no change flags and are refetched after max_age.
+    """
+
+    def __init__(
+        self,
+        client: 'DirectAPI',
+        path: Optional[str] = None,
+        max_age: float = 86400,
+        check_interval: float = 3600,
+    ) -> None:
+        """
+        :param client: DirectAPI
+        :param path: optional str, json file the cache is stored in
+        :param max_age: float, seconds dictionaries without change flags are kept
+        :param check_interval: float, seconds between Change.check_dictionaries calls
+        """
+        self._client = client
+        self._path = path
+        self._max_age = max_age
+        self._check_interval = check_interval
+        self._lock = threading.RLock()
+        self._timestamp: Optional[str] = None
+        self._checked_at = 0.0
+        # name -> {'fetched_at': float, 'items': list}
+        self._dictionaries: Dict[str, dict] = {}
+        self._indexes: Dict[tuple, dict] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self._path or not os.path.exists(self._path):
+            return
+        with open(self._path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self._timestamp = data.get('timestamp')
+        self._dictionaries = data.get('dictionaries', {})
+
+    def _save(self) -> None:
+        if not self._path:
+            return
+        tmp_path = f'{self._path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(
+                {'timestamp': self._timestamp, 'dictionaries': self._dictionaries},
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_path, self._path)
+
+    def _drop(self, names: tuple) -> None:
+        for name in names:
+            self._dictionaries.pop(name, None)
+        self._indexes = {k: v for k, v in self._indexes.items() if k[0] not in names}
+
+    def _check_changes(self) -> None:
+        now = time()
+        if now - self._checked_at < self._check_interval:
+            return
+        result = self._client.Change.check_dictionaries(self._timestamp)['result']
+        if self._timestamp is not None:
+            for flag, names in CHANGE_FLAGS.items():
+                if result.get(flag) == 'YES':
+                    self._drop(names)
+        expired = tuple(
+            name
+            for name, value in self._dictionaries.items()
+            if not any(name in names for names in CHANGE_FLAGS.values())
+            and now - value['fetched_at'] > self._max_age
+        )
+        self._drop(expired)
+        self._timestamp = result.get('Timestamp', self._timestamp)
+        self._checked_at = now
+
+    def get(self, dictionary_names: list) -> dict:
+        """
+        Same as Dictionary.get, only missing or changed dictionaries are requested
+        :param dictionary_names: list
+        :return: dict
+        """
+        with self._lock:
+            self._check_changes()
+            missing = [n for n in dictionary_names if n not in self._dictionaries]
+            if missing:
+                # entity of client is not streaming copy, response is dict
+                response = cast(
+                    dict, self._client.Dictionary._get({'DictionaryNames': missing})
+                )
+                now = time()
+                for name, items in response['result'].items():
+                    self._dictionaries[name] = {'fetched_at': now, 'items': items}
+                    self._drop_indexes(name)
+                self._save()
+            return {
+                'result': {
+                    name: self._dictionaries[name]['items']
+                    for name in dictionary_names
+                    if name in self._dictionaries
+                }
+            }
+
+    def _drop_indexes(self, name: str) -> None:
+        self._indexes = {k: v for k, v in self._indexes.items() if k[0] != name}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._dictionaries = {}
+            self._indexes = {}
+            self._timestamp = None
+            self._checked_at = 0.0
+            self._save()
+
+    def index(self, dictionary_name: str, field: str, unique: bool = True) -> dict:
+        """
+        :param dictionary_name: str
+        :param field: str, field of dictionary item
+        :param unique: bool, index values are items (True) or lists of items (False)
+        :return: dict {field value: item or list of items}
+        """
+        items = self.get([dictionary_name])['result'].get(dictionary_name, [])
+        key = (dictionary_name, field, unique)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = {}
+                for item in items:
+                    if unique:
+                        index[item.get(field)] = item
+                    else:
+                        index.setdefault(item.get(field), []).append(item)
+                self._indexes[key] = index
+        return index
+
+    def region(self, region_id: int) -> Optional[dict]:
+        """
+        :param region_id: int
+        :return: GeoRegions item or None
+        """
+        return self.index('GeoRegions', 'GeoRegionId').get(region_id)
+
+    def region_children(self, region_id: int) -> List[dict]:
+        """
+        :param region_id: int
+        :return: list of GeoRegions items with ParentId equal to region_id
+        """
+        return self.index('GeoRegions', 'ParentId', unique=False).get(region_id, [])
+
+    def currency(self, code: str) -> Optional[dict]:
+        """
+        :param code: str (RUB, USD, ...)
+        :return: Currencies item or None
+        """
+        return self.index('Currencies', 'Currency').get(code)
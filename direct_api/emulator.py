@@ -0,0 +1,493 @@
+"""
+Local emulator of Yandex Direct API v5 (JSON services and reports) for load tests
+and offline benchmarks, stdlib only:
+
+    with DirectEmulator(campaigns=10, latency=0.01) as emulator:
+        client = DirectAPI('token', 'login', api_url=emulator.url)
+        client.Campaign.get_all(field_names=['Id', 'Name'])
+
+or from command line: python -m direct_api.emulator --port 8080
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from time import sleep
+from typing import Dict, Optional, Tuple
+
+from .units import count_objects, estimate_cost
+
+__all__ = ('DirectEmulator',)
+
+# service -> key of objects in params and result
+RESULT_KEYS: Dict[str, str] = {
+    'campaigns': 'Campaigns',
+    'adgroups': 'AdGroups',
+    'ads': 'Ads',
+    'keywords': 'Keywords',
+    'keywordbids': 'KeywordBids',
+}
+# SelectionCriteria key -> field of object
+CRITERIA_FIELDS: Dict[str, str] = {
+    'Ids': 'Id',
+    'CampaignIds': 'CampaignId',
+    'AdGroupIds': 'AdGroupId',
+    'KeywordIds': 'KeywordId',
+    'States': 'State',
+    'Statuses': 'Status',
+    'Types': 'Type',
+}
+STATE_METHODS: Dict[str, str] = {
+    'suspend': 'SUSPENDED',
+    'resume': 'ON',
+    'archive': 'ARCHIVED',
+    'unarchive': 'SUSPENDED',
+}
+REPORT_FIELDS: Dict[str, str] = {
+    'CampaignId': 'Id',
+    'CampaignName': 'Name',
+}
+MAX_LIMIT = 10000
+
+
+def _error(code: int, message: str, detail: str = '') -> dict:
+    return {
+        'error': {
+            'error_code': code,
+            'error_string': message,
+            'error_detail': detail,
+            'request_id': '0',
+        }
+    }
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address) -> None:
+        # client closed connection before response is read (stream is closed early)
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class DirectEmulator(object):
+    """
+    In-memory campaigns, ad groups, ads and keywords (with bids) served with Page / LimitedBy
+    paging and Units headers; reports are queued (201/202 with retryIn) before they are ready
+    """
+
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        campaigns: int = 10,
+        ad_groups_per_campaign: int = 10,
+        ads_per_ad_group: int = 2,
+        keywords_per_ad_group: int = 20,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_code: int = 1000,
+        report_polls: int = 2,
+        report_rows: Optional[int] = None,
+        retry_in: int = 1,
+        units_limit: int = 640000,
+        seed: int = 0,
+    ) -> None:
+        """
+        :param host: str
+        :param port: int, 0 - any free port
+        :param campaigns: int, number of generated campaigns
+        :param ad_groups_per_campaign: int
+        :param ads_per_ad_group: int
+        :param keywords_per_ad_group: int
+        :param latency: float, seconds every request is delayed
+        :param error_rate: float, share of requests answered with error_code (0..1)
+        :param error_code: int, code of injected errors (1000 - service is temporarily unavailable)
+        :param report_polls: int, number of requests of report answered with 201/202
+        :param report_rows: optional int, rows of report (default - one row by campaign)
+        :param retry_in: int, retryIn header of queued reports
+        :param units_limit: int, daily points of every login
+        :param seed: int, seed of generated data and injected errors
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.report_polls = report_polls
+        self.report_rows = report_rows
+        self.retry_in = retry_in
+        self.units_limit = units_limit
+        self.request_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._units: Dict[str, int] = {}
+        self._reports: Dict[Tuple[str, str], int] = {}
+        self._objects: Dict[str, Dict[int, dict]] = {k: {} for k in RESULT_KEYS}
+        self._next_id = 1
+        self._generate(
+            campaigns, ad_groups_per_campaign, ads_per_ad_group, keywords_per_ad_group
+        )
+        self._server = _Server((host, port), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> 'DirectEmulator':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """
+        API_URL of emulator for DirectAPI(api_url=...)
+        """
+        host, port = self._server.server_address[:2]
+        if isinstance(host, bytes):
+            host = host.decode()
+        return f'http://{host}:{port}/json/v5/'
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _new_id(self) -> int:
+        new_id = self._next_id
+        self._next_id += 1
+        return new_id
+
+    def _generate(
+        self, campaigns: int, ad_groups: int, ads: int, keywords: int
+    ) -> None:
+        for _ in range(campaigns):
+            campaign_id = self._new_id()
+            self._objects['campaigns'][campaign_id] = {
+                'Id': campaign_id,
+                'Name': f'Campaign {campaign_id}',
+                'Type': 'TEXT_CAMPAIGN',
+                'State': 'ON',
+                'Status': 'ACCEPTED',
+            }
+            for _ in range(ad_groups):
+                ad_group_id = self._new_id()
+                self._objects['adgroups'][ad_group_id] = {
+                    'Id': ad_group_id,
+                    'Name': f'Group {ad_group_id}',
+                    'CampaignId': campaign_id,
+                    'Type': 'TEXT_AD_GROUP',
+                    'Status': 'ACCEPTED',
+                }
+                for _ in range(ads):
+                    ad_id = self._new_id()
+                    self._objects['ads'][ad_id] = {
+                        'Id': ad_id,
+                        'AdGroupId': ad_group_id,
+                        'CampaignId': campaign_id,
+                        'Type': 'TEXT_AD',
+                        'State': 'ON',
+                        'Status': 'ACCEPTED',
+                    }
+                for _ in range(keywords):
+                    keyword_id = self._new_id()
+                    self._objects['keywords'][keyword_id] = {
+                        'Id': keyword_id,
+                        'Keyword': f'keyword {keyword_id}',
+                        'AdGroupId': ad_group_id,
+                        'CampaignId': campaign_id,
+                        'State': 'ON',
+                        'Status': 'ACCEPTED',
+                        'Bid': self._random.randint(1, 100) * 100000,
+                        'ContextBid': self._random.randint(1, 100) * 10000,
+                    }
+
+    def _spend_units(self, login: str, service: str, method: str, params: dict) -> str:
+        cost = estimate_cost(service, method, count_objects(params))
+        with self._lock:
+            rest = self._units.get(login, self.units_limit) - cost
+            self._units[login] = rest
+        return f'{cost}/{max(rest, 0)}/{self.units_limit}'
+
+    # JSON services
+
+    def handle(self, service: str, method: str, params: dict) -> dict:
+        """
+        :param service: str (lowercase)
+        :param method: str
+        :param params: dict
+        :return: dict (response body)
+        """
+        if service == 'changes':
+            return {'result': {'Timestamp': '2020-01-01T00:00:00Z'}}
+        if service == 'dictionaries':
+            return {'result': {n: [] for n in params.get('DictionaryNames', ())}}
+        if service not in RESULT_KEYS:
+            return _error(3500, 'Not supported', f'service {service} is not emulated')
+        with self._lock:
+            if method == 'get':
+                return self._get(service, params)
+            if method == 'add':
+                return self._add(service, params)
+            if method == 'update':
+                return self._update(service, params)
+            if method in ('set', 'setAuto'):
+                return self._set_bids(method, params)
+            return self._change_state(service, method, params)
+
+    def _get(self, service: str, params: dict) -> dict:
+        criteria = params.get('SelectionCriteria', {})
+        filters = [
+            (CRITERIA_FIELDS[k], set(v))
+            for k, v in criteria.items()
+            if k in CRITERIA_FIELDS
+        ]
+        objects = self._objects['keywords' if service == 'keywordbids' else service]
+        page = params.get('Page', {})
+        limit = min(page.get('Limit', MAX_LIMIT), MAX_LIMIT)
+        offset = page.get('Offset', 0)
+        matched = []
+        for item in objects.values():
+            if service == 'keywordbids':
+                item = self._keyword_bid(item)
+            if all(item.get(field) in values for field, values in filters):
+                matched.append(item)
+        field_names = params.get('FieldNames')
+        items = matched[offset : offset + limit]
+        if field_names:
+            items = [
+                self._project(service, item, field_names, params) for item in items
+            ]
+        result = {RESULT_KEYS[service]: items}
+        if offset + limit < len(matched):
+            result['LimitedBy'] = offset + limit
+        return {'result': result}
+
+    @staticmethod
+    def _keyword_bid(keyword: dict) -> dict:
+        return {
+            'KeywordId': keyword['Id'],
+            'AdGroupId': keyword['AdGroupId'],
+            'CampaignId': keyword['CampaignId'],
+            'ServingStatus': 'ELIGIBLE',
+            'Search': {'Bid': keyword['Bid']},
+            'Network': {'Bid': keyword['ContextBid']},
+        }
+
+    @staticmethod
+    def _project(service: str, item: dict, field_names: list, params: dict) -> dict:
+        projected = {k: item[k] for k in field_names if k in item}
+        if service == 'keywordbids':
+            for key, names_key in (
+                ('Search', 'SearchFieldNames'),
+                ('Network', 'NetworkFieldNames'),
+            ):
+                if names_key in params:
+                    projected[key] = {
+                        k: v for k, v in item[key].items() if k in params[names_key]
+                    }
+        return projected
+
+    def _add(self, service: str, params: dict) -> dict:
+        results = []
+        for item in params.get(RESULT_KEYS[service], ()):
+            new_id = self._new_id()
+            self._objects[service][new_id] = dict(
+                item, Id=new_id, State='OFF', Status='DRAFT'
+            )
+            results.append({'Id': new_id})
+        return {'result': {'AddResults': results}}
+
+    def _update(self, service: str, params: dict) -> dict:
+        results = []
+        for item in params.get(RESULT_KEYS[service], ()):
+            stored = self._objects[service].get(item.get('Id'))
+            if stored is None:
+                results.append({'Errors': [_error(8800, 'Object not found')['error']]})
+            else:
+                stored.update(item)
+                results.append({'Id': item['Id']})
+        return {'result': {'UpdateResults': results}}
+
+    def _set_bids(self, method: str, params: dict) -> dict:
+        results = []
+        key = 'KeywordBids' if 'KeywordBids' in params else 'Bids'
+        for bid in params.get(key, ()):
+            keyword = self._objects['keywords'].get(bid.get('KeywordId'))
+            if keyword is None:
+                results.append({'Errors': [_error(8800, 'Object not found')['error']]})
+                continue
+            for field, target in (
+                ('SearchBid', 'Bid'),
+                ('Bid', 'Bid'),
+                ('NetworkBid', 'ContextBid'),
+                ('ContextBid', 'ContextBid'),
+            ):
+                if field in bid:
+                    keyword[target] = bid[field]
+            results.append({'KeywordId': keyword['Id']})
+        return {'result': {f'{method[0].upper()}{method[1:]}Results': results}}
+
+    def _change_state(self, service: str, method: str, params: dict) -> dict:
+        results = []
+        objects = self._objects[service]
+        for object_id in params.get('SelectionCriteria', {}).get('Ids', ()):
+            if object_id not in objects:
+                results.append({'Errors': [_error(8800, 'Object not found')['error']]})
+                continue
+            if method == 'delete':
+                del objects[object_id]
+            elif method in STATE_METHODS:
+                objects[object_id]['State'] = STATE_METHODS[method]
+            results.append({'Id': object_id})
+        return {'result': {f'{method[0].upper()}{method[1:]}Results': results}}
+
+    # reports
+
+    def poll_report(self, login: str, params: dict, headers: dict) -> tuple:
+        """
+        :return: tuple (status, retryIn or None, body)
+        """
+        key = (login, params.get('ReportName', ''))
+        with self._lock:
+            polls = self._reports.get(key, 0)
+            if headers.get('processingMode') != 'online' and polls < self.report_polls:
+                self._reports[key] = polls + 1
+                return (201 if polls == 0 else 202), self.retry_in, ''
+            self._reports.pop(key, None)
+            campaigns = list(self._objects['campaigns'].values())
+        if self.report_rows is not None and campaigns:
+            # campaigns are repeated to get report of any size
+            campaigns = [campaigns[i % len(campaigns)] for i in range(self.report_rows)]
+        return 200, None, self._report_body(params, headers, campaigns)
+
+    @staticmethod
+    def _report_body(params: dict, headers: dict, campaigns: list) -> str:
+        field_names = params.get('FieldNames', [])
+        lines = []
+        if headers.get('skipReportHeader') != 'true':
+            lines.append(f'"{params.get("ReportName", "")}"')
+        if headers.get('skipColumnHeader') != 'true':
+            lines.append('\t'.join(field_names))
+        for campaign in campaigns:
+            row = []
+            for name in field_names:
+                if name in REPORT_FIELDS:
+                    row.append(str(campaign[REPORT_FIELDS[name]]))
+                elif name == 'Date':
+                    row.append('2020-01-01')
+                elif name in ('Impressions', 'Clicks'):
+                    row.append(str(campaign['Id'] * 10))
+                elif name == 'Cost':
+                    row.append(f'{campaign["Id"] * 1.5:.2f}')
+                else:
+                    row.append('--')
+            lines.append('\t'.join(row))
+        if headers.get('skipReportSummary') != 'true':
+            lines.append(f'Total rows: {len(campaigns)}')
+        return '\n'.join(lines) + '\n'
+
+    def _handler_class(self) -> type:
+        emulator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # headers and body are written separately, Nagle would delay response by ~40 ms
+            disable_nagle_algorithm = True
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+            def _send(
+                self, status: int, body: str, headers: Optional[dict] = None
+            ) -> None:
+                data = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('RequestId', self.request_id)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                with emulator._lock:
+                    emulator.request_count += 1
+                    self.request_id = str(emulator.request_count)
+                if emulator.latency:
+                    sleep(emulator.latency)
+                json_headers = {'Content-Type': 'application/json; charset=utf-8'}
+                login = self.headers.get('Client-Login', '')
+                service = self.path.rstrip('/').rsplit('/', 1)[-1].lower()
+                if not self.headers.get('Authorization'):
+                    self._send(
+                        401, json.dumps(_error(53, 'Authorization error')), json_headers
+                    )
+                    return
+                if (
+                    emulator.error_rate
+                    and emulator._random.random() < emulator.error_rate
+                ):
+                    error = _error(emulator.error_code, 'Injected error')
+                    # errors of JSON services are sent with status 200, of reports - with 5xx
+                    status = 500 if service == 'reports' else 200
+                    self._send(status, json.dumps(error), json_headers)
+                    return
+                if service == 'reports':
+                    self._report(login, body)
+                    return
+                method = body.get('method', '')
+                params = body.get('params', {})
+                headers = dict(
+                    json_headers,
+                    **{
+                        'Units': emulator._spend_units(login, service, method, params),
+                        'Units-Used-Login': login,
+                    },
+                )
+                response = emulator.handle(service, method, params)
+                self._send(200, json.dumps(response, ensure_ascii=False), headers)
+
+            def _report(self, login: str, body: dict) -> None:
+                status, retry_in, text = emulator.poll_report(
+                    login, body.get('params', {}), dict(self.headers)
+                )
+                headers = {'Content-Type': 'text/tab-separated-values; charset=utf-8'}
+                if retry_in is not None:
+                    headers['retryIn'] = str(retry_in)
+                self._send(status, text, headers)
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Local emulator of Yandex Direct API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--campaigns', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    args = parser.parse_args()
+    emulator = DirectEmulator(
+        args.host,
+        args.port,
+        campaigns=args.campaigns,
+        latency=args.latency,
+        error_rate=args.error_rate,
+    )
+    print(f'Direct API emulator: {emulator.url}')
+    try:
+        emulator._server.serve_forever()
+    except KeyboardInterrupt:
+        emulator._server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,27 @@
-from typing import Optional, TYPE_CHECKING
+from typing import (
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+    TYPE_CHECKING,
+)
 from abc import ABC
+import copy
 
-from .utils import generate_params, convert
-from .exceptions import ParameterError
+from .limits import get_object_limit, split, split_selection
+from .units import estimate_cost
+from .utils import build_params
+from .exceptions import ParameterError, YdAPIError, YdException
 
 if TYPE_CHECKING:
+    import asyncio
+
     from .client import DirectAPI
+    from .dictionaries import DictionaryCache
+    from .streaming import StreamedPage
 
 __all__ = (
     'Ad',
@@ -34,8 +50,23 @@ __all__ = (
 )
 
 
+def _is_async(client: 'DirectAPI') -> bool:
+    """
+    :return: bool, client is AsyncDirectAPI (its requests are coroutines)
+    """
+    # inspect (~5 ms) and asyncio (~40 ms) are imported where used,
+    # plain import of package needs neither of them
+    import inspect
+
+    return inspect.iscoroutinefunction(client._request)
+
+
 class BaseEntity(ABC):
     service: str = ''
+    get_method: str = 'get'
+    id_field: str = 'Id'
+    # _get returns StreamedPage, see _streaming
+    _stream: bool = False
 
     def __init__(self, client: 'DirectAPI') -> None:
         self._client = client
@@ -53,31 +84,229 @@ class BaseEntity(ABC):
         :param ids: list
         :return: dict
         """
-        params = {'SelectionCriteria': {'Ids': ids}}
-        return self._client._send_api_request(
-            self.service.lower(), method, params
-        ).json()
+        return self._request_objects(
+            method, ids, lambda chunk: {'SelectionCriteria': {'Ids': chunk}}
+        )
+
+    def _request(self, method: str, params: dict) -> dict:
+        """
+        :param method: str
+        :param params: dict
+        :return: dict (awaitable for AsyncDirectAPI)
+        """
+        return self._client._request(self.service.lower(), method, params)
+
+    def _request_objects(
+        self, method: str, objects: list, make_params: Callable[[list], dict]
+    ) -> dict:
+        """
+        Send objects split by method limit (see direct_api.limits.OBJECT_LIMITS),
+        results of chunks are merged in original order
+        :param method: str
+        :param objects: list (objects or ids)
+        :param make_params: callable, returns request params for chunk of objects
+        :return: dict
+        """
+        service = self.service.lower()
+        chunks = split(objects, get_object_limit(service, method))
+        if len(chunks) == 1:
+            return self._request(method, make_params(objects))
+        return self._client._request_many(
+            service, method, [make_params(chunk) for chunk in chunks]
+        )
+
+    def estimate_units(self, method: str, objects: Optional[list] = None) -> int:
+        """
+        Approximate points cost of request, see direct_api.units.UNIT_COSTS
+        :param method: str ('add', 'update', 'suspend', ...)
+        :param objects: optional list (objects or ids of request)
+        :return: int
+        """
+        service = self.service.lower()
+        count = len(objects or ())
+        requests_count = len(split(objects or [], get_object_limit(service, method)))
+        return estimate_cost(service, method, count, requests_count)
 
     def _add(self, objects: list) -> dict:
-        params = {self.service: objects}
-        return self._client._send_api_request(
-            self.service.lower(), 'add', params
-        ).json()
+        return self._request_objects(
+            'add', objects, lambda chunk: {self.service: chunk}
+        )
 
     def _update(self, objects: list) -> dict:
-        params = {self.service: objects}
-        return self._client._send_api_request(
-            self.service.lower(), 'update', params
-        ).json()
+        return self._request_objects(
+            'update', objects, lambda chunk: {self.service: chunk}
+        )
 
-    def _get(self, params: dict) -> dict:
-        return self._client._send_api_request(
-            self.service.lower(), 'get', params
-        ).json()
+    def _get(self, params: dict) -> Union[dict, 'StreamedPage']:
+        """
+        :param params: dict
+        :return: dict (decoded response) or StreamedPage for copy of entity made by _streaming
+        """
+        if self._stream:
+            return self._client._stream_request(self.service.lower(), 'get', params)
+        if self._client._response_cache is not None:
+            return self._client._cached_request(self.service.lower(), 'get', params)
+        return self._request('get', params)
 
     def _delete(self, ids: list) -> dict:
         return self._execute_method_by_ids('delete', ids)
 
+    @staticmethod
+    def _parse_page(response: dict) -> Tuple[list, Optional[int]]:
+        """
+        :param response: dict (decoded get response)
+        :return: tuple (page objects, LimitedBy or None for the last page)
+        """
+        if 'error' in response:
+            raise YdAPIError(response['error'])
+        result = response.get('result', {})
+        items = next((v for v in result.values() if isinstance(v, list)), [])
+        return items, result.get('LimitedBy')
+
+    def _streaming(self) -> 'BaseEntity':
+        """
+        :return: copy of entity, get methods of which return StreamedPage
+        """
+        if _is_async(self._client):
+            raise YdException('Streaming get is not supported by async client')
+        entity = copy.copy(self)
+        entity._stream = True
+        return entity
+
+    def _bind_get(
+        self, args: tuple, kwargs: dict, stream: bool = False
+    ) -> Tuple[Callable, int, list]:
+        """
+        :return: tuple (get method, start offset, arguments of sub-queries)
+        """
+        import inspect
+
+        method = getattr(self._streaming() if stream else self, self.get_method)
+        arguments = inspect.signature(method).bind(*args, **kwargs).arguments
+        offset = arguments.pop('offset', 0)
+        return method, offset, split_selection(self.service.lower(), arguments)
+
+    def _unique(self, items: Iterable[dict], seen: set) -> Iterator[dict]:
+        # objects of sub-queries are de-duplicated by id_field (if it is requested)
+        for item in items:
+            key = item.get(self.id_field)
+            if key is not None:
+                if key in seen:
+                    continue
+                seen.add(key)
+            yield item
+
+    def _iter_pages(
+        self, method: Callable, offset: int, arguments: dict
+    ) -> Iterator[dict]:
+        while True:
+            page = method(offset=offset, **arguments)
+            # pages of streaming copy are StreamedPage
+            if not isinstance(page, dict):
+                yield from page
+                limited_by = page.limited_by
+            else:
+                items, limited_by = self._parse_page(page)
+                yield from items
+            if limited_by is None:
+                return
+            offset = limited_by
+
+    def iter_get(self, *args, stream: bool = False, **kwargs) -> Iterator[dict]:
+        """
+        Iterate over all objects of get method, following LimitedBy page by page.
+        Accepts the same arguments as get method, offset is used as start offset.
+        Id lists longer than API allows (see direct_api.limits.SELECTION_LIMITS)
+        are split into sub-queries, which are run in parallel by max_workers threads
+        of client; their objects are yielded without duplicates.
+        :param stream: bool, decode objects while response body is read, so one object
+            of page is kept in memory instead of the whole page (sync client, response
+            cache is not used)
+        :return: generator of objects
+        """
+        if _is_async(self._client):
+            raise YdException(
+                'iter_get and get_all are not supported by async client, use aiter_get'
+            )
+        method, offset, queries = self._bind_get(args, kwargs, stream)
+        if len(queries) == 1:
+            yield from self._iter_pages(method, offset, queries[0])
+            return
+        pages = self._client._iter_many(
+            [
+                lambda query=query: self._iter_pages(method, offset, query)
+                for query in queries
+            ]
+        )
+        seen: set = set()
+        for items in pages:
+            yield from self._unique(items, seen)
+
+    def get_all(self, *args, stream: bool = False, **kwargs) -> list:
+        """
+        Same as iter_get, but returns list of all objects
+        :return: list
+        """
+        return list(self.iter_get(*args, stream=stream, **kwargs))
+
+    async def _aput_pages(
+        self, method: Callable, offset: int, arguments: dict, pages: 'asyncio.Queue'
+    ) -> None:
+        # objects of sub-query are put on queue page by page, then None or exception
+        try:
+            while True:
+                response = await method(offset=offset, **arguments)
+                items, limited_by = self._parse_page(response)
+                await pages.put(items)
+                if limited_by is None:
+                    break
+                offset = limited_by
+        except Exception as e:
+            await pages.put(e)
+        else:
+            await pages.put(None)
+
+    async def aiter_get(self, *args, **kwargs) -> AsyncIterator[dict]:
+        """
+        Async version of iter_get for AsyncDirectAPI, sub-queries of split
+        id lists are run concurrently
+        :return: async generator of objects
+        """
+        method, offset, queries = self._bind_get(args, kwargs)
+        if len(queries) == 1:
+            arguments = queries[0]
+            while True:
+                response = await method(offset=offset, **arguments)
+                items, limited_by = self._parse_page(response)
+                for item in items:
+                    yield item
+                if limited_by is None:
+                    return
+                offset = limited_by
+        import asyncio
+
+        # bounded, sub-queries wait while caller processes objects
+        pages: asyncio.Queue = asyncio.Queue(len(queries))
+        tasks = [
+            asyncio.ensure_future(self._aput_pages(method, offset, query, pages))
+            for query in queries
+        ]
+        running = len(tasks)
+        seen: set = set()
+        try:
+            while running:
+                page = await pages.get()
+                if page is None:
+                    running -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    for item in self._unique(page, seen):
+                        yield item
+        finally:
+            for task in tasks:
+                task.cancel()
+
 
 class AgencyClient(BaseEntity):
     service: str = 'AgencyClients'
@@ -115,9 +344,7 @@ class AgencyClient(BaseEntity):
             params['Notification'] = notification
         if settings is not None:
             params['Settings'] = settings
-        return self._client._send_api_request(
-            self.service.lower(), 'add', params
-        ).json()
+        return self._request('add', params)
 
     def get(
         self,
@@ -126,7 +353,7 @@ class AgencyClient(BaseEntity):
         archived: Optional[str] = None,
         limit: int = 500,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/agencyclients/get-docpage/
         :param field_names: list
@@ -137,7 +364,7 @@ class AgencyClient(BaseEntity):
         :return: dict
         """
         params = {
-            'SelectionCriteria': generate_params(['logins', 'archived'], locals()),
+            'SelectionCriteria': build_params(logins=logins, archived=archived),
             'FieldNames': field_names,
             'Page': {'Limit': limit, 'Offset': offset},
         }
@@ -182,7 +409,7 @@ class AdExtension(BaseEntity):
         callout_field_names: Optional[list] = None,
         limit: int = 500,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/adextensions/get-docpage/
         :param field_names: list
@@ -197,8 +424,12 @@ class AdExtension(BaseEntity):
         :return: dict
         """
         params = {
-            'SelectionCriteria': generate_params(
-                ['ids', 'types', 'states', 'statuses', 'modify_since'], locals()
+            'SelectionCriteria': build_params(
+                ids=ids,
+                types=types,
+                states=states,
+                statuses=statuses,
+                modify_since=modify_since,
             ),
             'FieldNames': field_names,
             'Page': {'Limit': limit, 'Offset': offset,},
@@ -242,7 +473,7 @@ class AdGroup(BaseEntity):
         mobile_app_ad_group_field_names: Optional[list] = None,
         dynamic_text_ad_group_field_names: Optional[list] = None,
         dynamic_text_feed_ad_group_field_names: Optional[list] = None,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/adgroups/get-docpage/
         :param field_names: list (list of fields)
@@ -264,17 +495,14 @@ class AdGroup(BaseEntity):
             raise ParameterError(['ids', 'campaign_ids'])
 
         params = {
-            'SelectionCriteria': generate_params(
-                [
-                    'campaign_ids',
-                    'ids',
-                    'types',
-                    'statuses',
-                    'serving_statuses',
-                    'app_icon_statuses',
-                    'negative_keyword_shared_set_ids',
-                ],
-                locals(),
+            'SelectionCriteria': build_params(
+                campaign_ids=campaign_ids,
+                ids=ids,
+                types=types,
+                statuses=statuses,
+                serving_statuses=serving_statuses,
+                app_icon_statuses=app_icon_statuses,
+                negative_keyword_shared_set_ids=negative_keyword_shared_set_ids,
             ),
             'FieldNames': field_names,
             'Page': {'Limit': limit, 'Offset': offset},
@@ -315,10 +543,11 @@ class AdImage(BaseEntity):
         :param hashes: list (list of image hashes)
         :return: dict
         """
-        params = {'SelectionCriteria': {'AdImageHashes': hashes}}
-        return self._client._send_api_request(
-            self.service.lower(), 'delete', params
-        ).json()
+        return self._request_objects(
+            'delete',
+            hashes,
+            lambda chunk: {'SelectionCriteria': {'AdImageHashes': chunk}},
+        )
 
     def get(
         self,
@@ -327,7 +556,7 @@ class AdImage(BaseEntity):
         associated: Optional[str] = None,
         limit: int = 500,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/adimages/get-docpage/
         :param field_names: list (list of field_names)
@@ -338,8 +567,9 @@ class AdImage(BaseEntity):
         :return: dict
         """
         params = {
-            'SelectionCriteria': generate_params(
-                ['ad_images_hashes', 'associated'], locals()
+            'SelectionCriteria': build_params(
+                ad_images_hashes=ad_images_hashes,
+                associated=associated,
             ),
             'FieldNames': field_names,
             'Page': {'Limit': limit, 'Offset': offset,},
@@ -403,7 +633,7 @@ class Ad(BaseEntity):
         cpm_video_ad_builder_ad_field_names: Optional[list] = None,
         limit: int = 10000,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/ads/get-docpage/
         :param field_names: list
@@ -437,46 +667,38 @@ class Ad(BaseEntity):
         """
         if not ids and not ad_group_ids and not campaign_ids:
             raise ParameterError(['ids', 'ad_group_ids', 'campaign_ids'])
-
-        local_variables = locals()
         params = {
-            'SelectionCriteria': generate_params(
-                fields=[
-                    'ids',
-                    'campaign_ids',
-                    'ad_group_ids',
-                    'states',
-                    'statuses',
-                    'types',
-                    'mobile',
-                    'v_card_ids',
-                    'sitelink_set_ids',
-                    'ad_image_hashes',
-                    'v_card_moderation_statuses',
-                    'sitelink_moderation_statuses',
-                    'ad_image_moderation_statuses',
-                    'ad_extension_ids',
-                ],
-                function_kwargs=local_variables,
+            'SelectionCriteria': build_params(
+                ids=ids,
+                campaign_ids=campaign_ids,
+                ad_group_ids=ad_group_ids,
+                states=states,
+                statuses=statuses,
+                types=types,
+                mobile=mobile,
+                v_card_ids=v_card_ids,
+                sitelink_set_ids=sitelink_set_ids,
+                ad_image_hashes=ad_image_hashes,
+                v_card_moderation_statuses=v_card_moderation_statuses,
+                sitelink_moderation_statuses=sitelink_moderation_statuses,
+                ad_image_moderation_statuses=ad_image_moderation_statuses,
+                ad_extension_ids=ad_extension_ids,
             ),
             'FieldNames': field_names,
             'Page': {'Limit': limit, 'Offset': offset},
         }
         params.update(
-            generate_params(
-                fields=[
-                    'text_ad_field_names',
-                    'text_ad_price_extension_field_names',
-                    'mobile_app_field_names',
-                    'dynamic_text_ad_field_names',
-                    'mobile_app_image_ad_field_names',
-                    'text_ad_builder_ad_field_names',
-                    'mobile_app_ad_builder_ad_field_names',
-                    'cpc_video_ad_builder_ad_field_names',
-                    'cpm_banner_ad_builder_ad_field_names',
-                    'cpm_video_ad_builder_ad_field_names',
-                ],
-                function_kwargs=local_variables,
+            build_params(
+                text_ad_field_names=text_ad_field_names,
+                text_ad_price_extension_field_names=text_ad_price_extension_field_names,
+                mobile_app_field_names=mobile_app_field_names,
+                dynamic_text_ad_field_names=dynamic_text_ad_field_names,
+                mobile_app_image_ad_field_names=mobile_app_image_ad_field_names,
+                text_ad_builder_ad_field_names=text_ad_builder_ad_field_names,
+                mobile_app_ad_builder_ad_field_names=mobile_app_ad_builder_ad_field_names,
+                cpc_video_ad_builder_ad_field_names=cpc_video_ad_builder_ad_field_names,
+                cpm_banner_ad_builder_ad_field_names=cpm_banner_ad_builder_ad_field_names,
+                cpm_video_ad_builder_ad_field_names=cpm_video_ad_builder_ad_field_names,
             )
         )
         return self._get(params)
@@ -524,6 +746,7 @@ class Ad(BaseEntity):
 
 class AudienceTarget(BaseEntity):
     service: str = 'AudienceTargets'
+    get_method: str = 'get_audience_targets'
 
     def add(self, targets: list) -> dict:
         """
@@ -552,7 +775,7 @@ class AudienceTarget(BaseEntity):
         states: Optional[list] = None,
         limit: int = 10000,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/audiencetargets/get-docpage/
         :param field_names: list
@@ -570,16 +793,13 @@ class AudienceTarget(BaseEntity):
             raise ParameterError(['ids', 'ad_group_ids', 'campaign_ids'])
 
         params = {
-            'SelectionCriteria': generate_params(
-                fields=[
-                    'ids',
-                    'ad_groups_ids',
-                    'campaign_ids',
-                    'retargeting_list_ids',
-                    'interest_ids',
-                    'states',
-                ],
-                function_kwargs=locals(),
+            'SelectionCriteria': build_params(
+                ids=ids,
+                ad_group_ids=ad_group_ids,
+                campaign_ids=campaign_ids,
+                retargeting_list_ids=retargeting_list_ids,
+                interest_ids=interest_ids,
+                states=states,
             ),
             'FieldNames': field_names,
             'Page': {'Limit': limit, 'Offset': offset},
@@ -600,10 +820,7 @@ class AudienceTarget(BaseEntity):
         :param bids: list (list of Bid objects)
         :return: dict
         """
-        params = {'Bids': bids}
-        return self._client._send_api_request(
-            self.service.lower(), 'setBids', params
-        ).json()
+        return self._request_objects('setBids', bids, lambda chunk: {'Bids': chunk})
 
     def suspend(self, ids: list) -> dict:
         """
@@ -616,6 +833,7 @@ class AudienceTarget(BaseEntity):
 
 class Bid(BaseEntity):
     service: str = 'Bids'
+    id_field: str = 'KeywordId'
 
     def get(
         self,
@@ -626,7 +844,7 @@ class Bid(BaseEntity):
         serving_statuses: Optional[list] = None,
         limit: int = 10000,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/bids/get-docpage/
         :param field_names: list
@@ -642,14 +860,11 @@ class Bid(BaseEntity):
             raise ParameterError(['keyword_ids', 'ad_group_ids', 'campaign_ids'])
 
         params = {
-            'SelectionCriteria': generate_params(
-                fields=[
-                    'keyword_ids',
-                    'ad_group_ids',
-                    'campaign_ids',
-                    'serving_statuses',
-                ],
-                function_kwargs=locals(),
+            'SelectionCriteria': build_params(
+                keyword_ids=keyword_ids,
+                ad_group_ids=ad_group_ids,
+                campaign_ids=campaign_ids,
+                serving_statuses=serving_statuses,
             ),
             'FieldNames': field_names,
             'Page': {'Limit': limit, 'Offset': offset},
@@ -662,8 +877,7 @@ class Bid(BaseEntity):
         :param bids: list (list of Bid objects)
         :return: dict
         """
-        params = {'Bids': bids}
-        return self._client._send_api_request('bids', 'set', params).json()
+        return self._request_objects('set', bids, lambda chunk: {'Bids': chunk})
 
     def set_auto(self, bids: list) -> dict:
         """
@@ -671,8 +885,7 @@ class Bid(BaseEntity):
         :param bids: list (list of BidSetAutoItem)
         :return: dict
         """
-        params = {'Bids': bids}
-        return self._client._send_api_request('bids', 'setAuto', params).json()
+        return self._request_objects('setAuto', bids, lambda chunk: {'Bids': chunk})
 
 
 class BidsModifier(BaseEntity):
@@ -710,7 +923,7 @@ class BidsModifier(BaseEntity):
         video_adjustment_field_names: Optional[list] = None,
         limit: int = 10000,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/bidmodifiers/get-docpage/
         :param field_names: list
@@ -731,27 +944,25 @@ class BidsModifier(BaseEntity):
         """
         if not ids and not campaign_ids and not ad_group_ids:
             raise ParameterError(['ids', 'campaign_ids', 'ad_group_ids'])
-
-        local_variables = locals()
         params = {
-            'SelectionCriteria': generate_params(
-                fields=['ids', 'campaign_ids', 'ad_group_ids', 'types', 'levels'],
-                function_kwargs=local_variables,
+            'SelectionCriteria': build_params(
+                ids=ids,
+                campaign_ids=campaign_ids,
+                ad_group_ids=ad_group_ids,
+                types=types,
+                levels=levels,
             ),
             'FieldNames': field_names,
             'Page': {'Limit': limit, 'Offset': offset},
         }
         params.update(
-            generate_params(
-                fields=[
-                    'mobile_adjustment_field_names',
-                    'desktop_adjustment_field_names',
-                    'demographics_adjustment_field_names',
-                    'retargeting_adjustment_field_names',
-                    'regional_adjustment_field_names',
-                    'video_adjustment_field_names',
-                ],
-                function_kwargs=local_variables,
+            build_params(
+                mobile_adjustment_field_names=mobile_adjustment_field_names,
+                desktop_adjustment_field_names=desktop_adjustment_field_names,
+                demographics_adjustment_field_names=demographics_adjustment_field_names,
+                retargeting_adjustment_field_names=retargeting_adjustment_field_names,
+                regional_adjustment_field_names=regional_adjustment_field_names,
+                video_adjustment_field_names=video_adjustment_field_names,
             )
         )
         return self._get(params)
@@ -762,10 +973,9 @@ class BidsModifier(BaseEntity):
         :param bid_modifiers: list
         :return: dict
         """
-        params = {'BidModifiers': bid_modifiers}
-        return self._client._send_api_request(
-            self.service.lower(), 'set', params
-        ).json()
+        return self._request_objects(
+            'set', bid_modifiers, lambda chunk: {'BidModifiers': chunk}
+        )
 
     def toggle(self, bid_modifier_toggle_items: list) -> dict:
         """
@@ -773,10 +983,11 @@ class BidsModifier(BaseEntity):
         :param bid_modifier_toggle_items: list
         :return: dict
         """
-        params = {'BidModifierToggleItems': bid_modifier_toggle_items}
-        return self._client._send_api_request(
-            self.service.lower(), 'toggle', params
-        ).json()
+        return self._request_objects(
+            'toggle',
+            bid_modifier_toggle_items,
+            lambda chunk: {'BidModifierToggleItems': chunk},
+        )
 
 
 class Campaign(BaseEntity):
@@ -820,7 +1031,7 @@ class Campaign(BaseEntity):
         cpm_banner_campaign_field_names: Optional[list] = None,
         limit: int = 1000,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/campaigns/get-docpage/
         :param field_names: list
@@ -837,24 +1048,23 @@ class Campaign(BaseEntity):
         :param offset: int
         :return: dict
         """
-        local_variables = locals()
         params = {
-            'SelectionCriteria': generate_params(
-                fields=['ids', 'types', 'states', 'statuses', 'statuses_payments'],
-                function_kwargs=local_variables,
+            'SelectionCriteria': build_params(
+                ids=ids,
+                types=types,
+                states=states,
+                statuses=statuses,
+                statuses_payments=statuses_payments,
             ),
             'FieldNames': field_names,
             'Page': {'Limit': limit, 'Offset': offset},
         }
         params.update(
-            generate_params(
-                fields=[
-                    'text_campaign_field_names',
-                    'mobile_app_campaign_field_names',
-                    'dynamic_text_campaign_field_names',
-                    'cpm_banner_campaign_field_names',
-                ],
-                function_kwargs=local_variables,
+            build_params(
+                text_campaign_field_names=text_campaign_field_names,
+                mobile_app_campaign_field_names=mobile_app_campaign_field_names,
+                dynamic_text_campaign_field_names=dynamic_text_campaign_field_names,
+                cpm_banner_campaign_field_names=cpm_banner_campaign_field_names,
             )
         )
         return self._get(params)
@@ -895,36 +1105,33 @@ class Campaign(BaseEntity):
 class Change(BaseEntity):
     service: str = 'changes'
 
-    def _check(self, method: str, params: dict) -> dict:
+    def _check(self, method: str, **params) -> dict:
         """
         :param method: str
-        :param params: dic
+        :param params: snake_case params of method
         :return: dict
         """
-        params = {convert(k): v for k, v in params if k != 'self'}
-        return self._client._send_api_request(
-            self.service.lower(), method, params
-        ).json()
+        return self._request(method, build_params(**params))
 
-    def check_dictionaries(self, timestamp: int) -> dict:
+    def check_dictionaries(self, timestamp: Optional[str] = None) -> dict:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/changes/checkDictionaries-docpage/
-        :param timestamp: str
+        :param timestamp: optional str (only current Timestamp is returned without it)
         :return: dict
         """
-        return self._check('checkDictionaries', locals())
+        return self._check('checkDictionaries', timestamp=timestamp)
 
-    def check_campaigns(self, timestamp: int) -> dict:
+    def check_campaigns(self, timestamp: str) -> dict:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/changes/checkDictionaries-docpage/
         :param timestamp: str
         :return: dict
         """
-        return self._check('checkCampaigns', locals())
+        return self._check('checkCampaigns', timestamp=timestamp)
 
     def check(
         self,
-        timestamp: int,
+        timestamp: str,
         field_names: list,
         campaign_ids: Optional[list] = None,
         ad_group_ids: Optional[list] = None,
@@ -944,7 +1151,14 @@ class Change(BaseEntity):
                 'campaign_ids, ag_group_ids, ad_ids must be implement one of them'
             )
 
-        return self._check('check', locals())
+        return self._check(
+            'check',
+            timestamp=timestamp,
+            field_names=field_names,
+            campaign_ids=campaign_ids,
+            ad_group_ids=ad_group_ids,
+            ad_ids=ad_ids,
+        )
 
 
 class Creative(BaseEntity):
@@ -960,7 +1174,7 @@ class Creative(BaseEntity):
         cpm_video_creative_field_names: Optional[list] = None,
         limit: int = 10000,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/creatives/get-docpage/
         :param field_names: list
@@ -974,18 +1188,15 @@ class Creative(BaseEntity):
         :return: dict
         """
         params = {
-            'SelectionCriteria': generate_params(['ids', 'types'], locals()),
+            'SelectionCriteria': build_params(ids=ids, types=types),
             'FieldNames': field_names,
             'Page': {'Limit': limit, 'Offset': offset},
         }
         params.update(
-            generate_params(
-                fields=[
-                    'video_extension_creative_field_names',
-                    'cpc_video_creative_field_names',
-                    'cpm_video_creative_field_names',
-                ],
-                function_kwargs=locals(),
+            build_params(
+                video_extension_creative_field_names=video_extension_creative_field_names,
+                cpc_video_creative_field_names=cpc_video_creative_field_names,
+                cpm_video_creative_field_names=cpm_video_creative_field_names,
             ),
         )
         return self._get(params)
@@ -994,15 +1205,62 @@ class Creative(BaseEntity):
 class Dictionary(BaseEntity):
     service: str = 'Dictionaries'
 
-    def get(self, dictionary_names: list) -> dict:
+    def get(self, dictionary_names: list) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/dictionaries/get-docpage/
         :param dictionary_names: list
         :return: dict
         """
+        cache = self._client._dictionary_cache
+        if cache is not None:
+            return cache.get(dictionary_names)
         params = {'DictionaryNames': dictionary_names}
         return self._get(params)
 
+    def enable_cache(
+        self, path: Optional[str] = None, max_age: float = 86400
+    ) -> 'DictionaryCache':
+        """
+        Cache dictionaries in memory (and in json file if path is set),
+        GeoRegions and TimeZones are refetched when Change.check_dictionaries reports changes
+        :param path: optional str, json file the cache is stored in
+        :param max_age: float, seconds dictionaries without change flags are kept
+        :return: DictionaryCache
+        """
+        if _is_async(self._client):
+            raise YdException('Dictionary cache is not supported by async client')
+        from .dictionaries import DictionaryCache
+
+        self._client._dictionary_cache = DictionaryCache(self._client, path, max_age)
+        return self._client._dictionary_cache
+
+    def _cache(self) -> 'DictionaryCache':
+        cache = self._client._dictionary_cache
+        if cache is None:
+            raise YdException('Dictionary cache is not enabled, call enable_cache()')
+        return cache
+
+    def region(self, region_id: int) -> Optional[dict]:
+        """
+        :param region_id: int
+        :return: GeoRegions item or None
+        """
+        return self._cache().region(region_id)
+
+    def region_children(self, region_id: int) -> list:
+        """
+        :param region_id: int
+        :return: list of GeoRegions items with ParentId equal to region_id
+        """
+        return self._cache().region_children(region_id)
+
+    def currency(self, code: str) -> Optional[dict]:
+        """
+        :param code: str (RUB, USD, ...)
+        :return: Currencies item or None
+        """
+        return self._cache().currency(code)
+
 
 class DynamicTextAdTarget(BaseEntity):
     service: str = 'dynamictextadtargets'
@@ -1013,7 +1271,7 @@ class DynamicTextAdTarget(BaseEntity):
         bid: Optional[str] = None,
         context_bid: Optional[str] = None,
         strategy_priority: Optional[str] = None,
-    ) -> None:
+    ) -> dict:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/dynamictextadtargets/add-docpage/
         :param webpages: list
@@ -1026,14 +1284,13 @@ class DynamicTextAdTarget(BaseEntity):
             'Webpages': webpages,
         }
         params.update(
-            generate_params(
-                fields=['bid', 'context_bid', 'strategy_priority'],
-                function_kwargs=locals(),
+            build_params(
+                bid=bid,
+                context_bid=context_bid,
+                strategy_priority=strategy_priority,
             )
         )
-        return self._client._send_api_request(
-            self.service.lower(), 'add', params
-        ).json()
+        return self._request('add', params)
 
     def delete(self, ids: list) -> dict:
         """
@@ -1052,7 +1309,7 @@ class DynamicTextAdTarget(BaseEntity):
         states: Optional[list] = None,
         limit: int = 10000,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/dynamictextadtargets/get-docpage/
         :param field_names: list
@@ -1068,9 +1325,11 @@ class DynamicTextAdTarget(BaseEntity):
             raise ParameterError(['ids', 'campaign_ids', 'ad_group_ids'])
 
         params = {
-            'SelectionCriteria': generate_params(
-                fields=['ids', 'ad_group_ids', 'campaign_ids', 'states'],
-                function_kwargs=locals(),
+            'SelectionCriteria': build_params(
+                ids=ids,
+                ad_group_ids=ad_group_ids,
+                campaign_ids=campaign_ids,
+                states=states,
             ),
             'FieldNames': field_names,
             'Page': {'Limit': limit, 'Offset': offset},
@@ -1099,14 +1358,12 @@ class DynamicTextAdTarget(BaseEntity):
         :param bids: list
         :return: dict
         """
-        params = {'Bids': bids}
-        return self._client._send_api_request(
-            self.service.lower(), 'setBids', params
-        ).json()
+        return self._request_objects('setBids', bids, lambda chunk: {'Bids': chunk})
 
 
 class KeywordBid(BaseEntity):
     service: str = 'KeywordBids'
+    id_field: str = 'KeywordId'
 
     def get(
         self,
@@ -1119,7 +1376,7 @@ class KeywordBid(BaseEntity):
         network_field_names: Optional[list] = None,
         limit: int = 10000,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/keywordbids/get-docpage/
         :param field_names: list
@@ -1135,24 +1392,20 @@ class KeywordBid(BaseEntity):
         """
         if not campaign_ids and not ad_group_ids and not keyword_ids:
             raise ParameterError(['campaign_ids', 'ad_group_ids', 'keyword_ids'])
-        local_variables = locals()
         params = {
-            'SelectionCriteria': generate_params(
-                fields=[
-                    'campaign_ids',
-                    'ad_group_ids',
-                    'keyword_ids',
-                    'serving_statuses',
-                ],
-                function_kwargs=local_variables,
+            'SelectionCriteria': build_params(
+                campaign_ids=campaign_ids,
+                ad_group_ids=ad_group_ids,
+                keyword_ids=keyword_ids,
+                serving_statuses=serving_statuses,
             ),
             'FieldNames': field_names,
             'Page': {'Limit': limit, 'Offset': offset},
         }
         params.update(
-            generate_params(
-                fields=['search_field_names', 'network_field_names'],
-                function_kwargs=local_variables,
+            build_params(
+                search_field_names=search_field_names,
+                network_field_names=network_field_names,
             )
         )
         return self._get(params)
@@ -1163,8 +1416,9 @@ class KeywordBid(BaseEntity):
         :param keyword_bids: list
         :return: dict
         """
-        params = {'KeywordBids': keyword_bids}
-        return self._client._send_api_request(self.service, 'set', params).json()
+        return self._request_objects(
+            'set', keyword_bids, lambda chunk: {'KeywordBids': chunk}
+        )
 
     def set_auto(self, keyword_bids: list) -> dict:
         """
@@ -1172,8 +1426,9 @@ class KeywordBid(BaseEntity):
         :param keyword_bids: list
         :return: dict
         """
-        params = {'KeywordBids': keyword_bids}
-        return self._client._send_api_request(self.service, 'set_auto', params).json()
+        return self._request_objects(
+            'setAuto', keyword_bids, lambda chunk: {'KeywordBids': chunk}
+        )
 
 
 class Keyword(BaseEntity):
@@ -1207,7 +1462,7 @@ class Keyword(BaseEntity):
         modified_since: Optional[str] = None,
         limit: int = 10000,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/keywords/get-docpage/
         :param field_names: list
@@ -1225,17 +1480,14 @@ class Keyword(BaseEntity):
         if not ids and not ad_group_ids and not campaign_ids:
             raise ParameterError(['ids', 'ad_group_ids', 'campaign_ids'])
         params = {
-            'SelectionCriteria': generate_params(
-                fields=[
-                    'ids',
-                    'ad_group_ids',
-                    'campaign_ids',
-                    'states',
-                    'statuses',
-                    'serving_statuses',
-                    'modified_since',
-                ],
-                function_kwargs=locals(),
+            'SelectionCriteria': build_params(
+                ids=ids,
+                ad_group_ids=ad_group_ids,
+                campaign_ids=campaign_ids,
+                states=states,
+                statuses=statuses,
+                serving_statuses=serving_statuses,
+                modified_since=modified_since,
             ),
             'FieldNames': field_names,
             'Page': {'Limit': limit, 'Offset': offset},
@@ -1280,9 +1532,7 @@ class KeywordsResearch(BaseEntity):
         params: dict = {'Keywords': keywords}
         if operation is not None:
             params['operation'] = operation
-        return self._client._send_api_request(
-            self.service.lower(), 'deduplicate', params
-        ).json()
+        return self._request('deduplicate', params)
 
     def has_search_volume(
         self, field_names: list, keywords: list, region_ids: list
@@ -1298,9 +1548,7 @@ class KeywordsResearch(BaseEntity):
             'SelectionCriteria': {'Keywords': keywords, 'RegionIds': region_ids},
             'FieldNames': field_names,
         }
-        return self._client._send_api_request(
-            self.service.lower(), 'hasSearchVolume', params
-        ).json()
+        return self._request('hasSearchVolume', params)
 
 
 class Lead(BaseEntity):
@@ -1314,7 +1562,7 @@ class Lead(BaseEntity):
         date_time_to: Optional[str] = None,
         limit: int = 10000,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/leads/get-docpage/
         :param field_names: list
@@ -1326,9 +1574,10 @@ class Lead(BaseEntity):
         :return: dict
         """
         params = {
-            'SelectCriterioa': generate_params(
-                fields=['turbo_page_ids', 'date_time_from', 'date_time_to'],
-                function_kwargs=locals(),
+            'SelectCriterioa': build_params(
+                turbo_page_ids=turbo_page_ids,
+                date_time_from=date_time_from,
+                date_time_to=date_time_to,
             ),
             'FieldNames': field_names,
             'Page': {'Limit': limit, 'Offset': offset},
@@ -1361,7 +1610,7 @@ class NegativeKeywordSharedSet(BaseEntity):
         ids: Optional[list] = None,
         limit: int = 10000,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/negativekeywordsharedsets/get-docpage/
         :param field_names: list
@@ -1410,7 +1659,7 @@ class RetargetingList(BaseEntity):
         types: Optional[list] = None,
         limit: int = 10000,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/retargetinglists/get-docpage/
         :param field_names: list
@@ -1422,7 +1671,7 @@ class RetargetingList(BaseEntity):
         """
         params = {'FieldNames': field_names, 'Page': {'Limit': limit, 'Offset': offset}}
         if ids or types:
-            params['SelectionCriteria'] = generate_params(['ids', 'types'], locals())
+            params['SelectionCriteria'] = build_params(ids=ids, types=types)
 
         return self._get(params)
 
@@ -1461,7 +1710,7 @@ class Sitelink(BaseEntity):
         ids: Optional[list] = None,
         limit: int = 10000,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/sitelinks/get-docpage/
         :param field_names: list
@@ -1489,7 +1738,7 @@ class TurboPage(BaseEntity):
         ids: Optional[list] = None,
         limit: int = 10000,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/turbopages/get-docpage/
         :param field_names: list
@@ -1506,7 +1755,7 @@ class TurboPage(BaseEntity):
 
 
 class VCard(BaseEntity):
-    service: str = ' VCards'
+    service: str = 'VCards'
 
     def add(self, vcards: list) -> dict:
         """
@@ -1530,7 +1779,7 @@ class VCard(BaseEntity):
         ids: Optional[list] = None,
         limit: int = 10000,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/vcards/get-docpage/
         :param field_names: list
@@ -1565,7 +1814,9 @@ class Report(BaseEntity):
         format: str = 'TSV',
         include_vat: Optional[str] = 'YES',
         include_discount: Optional[str] = "NO",
-    ) -> str:
+        stream: bool = False,
+        as_dict: bool = True,
+    ) -> Union[str, Iterator[Union[dict, tuple]]]:
         """
         doc - https://yandex.ru/dev/direct/doc/reports/spec-docpage/
         :param selection_criteria: dict
@@ -1582,15 +1833,52 @@ class Report(BaseEntity):
         :param format: str
         :param include_vat: str
         :param include_discount: str
-        :return: str
-        """
-
-        if headers:
-            headers['processingMode'] = processing_mode
-        else:
-            headers = {'processingMode': processing_mode}
-        self._client._set_session_headers(headers)
+        :param stream: bool, download report by chunks and yield parsed rows
+        :param as_dict: bool, yield rows as dicts or tuples (only for stream=True)
+        :return: str or generator of rows (stream=True)
+        """
+        params, headers = self._build_request(
+            selection_criteria,
+            field_names,
+            report_name,
+            report_type,
+            date_range_type,
+            processing_mode,
+            headers,
+            goals,
+            attribution_models,
+            page,
+            order_by,
+            format,
+            include_vat,
+            include_discount,
+        )
+        # headers are sent with report request only, client is not modified
+        if stream:
+            return self._client._iter_report_rows(params, field_names, as_dict, headers)
+        return self._client._get_reports(params, headers)
 
+    def _build_request(
+        self,
+        selection_criteria: dict,
+        field_names: list,
+        report_name: str,
+        report_type: str,
+        date_range_type: str,
+        processing_mode: str = 'auto',
+        headers: Optional[dict] = None,
+        goals: Optional[list] = None,
+        attribution_models: Optional[list] = None,
+        page: Optional[dict] = None,
+        order_by: Optional[list] = None,
+        format: str = 'TSV',
+        include_vat: Optional[str] = 'YES',
+        include_discount: Optional[str] = "NO",
+    ) -> Tuple[dict, dict]:
+        """
+        :return: tuple (request body, request headers), params are described in get method
+        """
+        headers = dict(headers or {}, processingMode=processing_mode)
         params = {
             'SelectionCriteria': selection_criteria,
             'FieldNames': field_names,
@@ -1601,19 +1889,16 @@ class Report(BaseEntity):
         if include_vat is not None:
             params['IncludeVAT'] = include_vat
         params.update(
-            generate_params(
-                fields=[
-                    'goals',
-                    'attribution_models',
-                    'page',
-                    'order_by',
-                    'format',
-                    'include_discount',
-                ],
-                function_kwargs=locals(),
+            build_params(
+                goals=goals,
+                attribution_models=attribution_models,
+                page=page,
+                order_by=order_by,
+                format=format,
+                include_discount=include_discount,
             )
         )
-        return self._client._get_reports({'params': params})
+        return {'params': params}, headers
 
 
 class Client(BaseEntity):
@@ -1652,9 +1937,7 @@ class Client(BaseEntity):
             params['Notification'] = notification
         if settings is not None:
             params['Settings'] = settings
-        return self._client._send_api_request(
-            self.service.lower(), 'add', params
-        ).json()
+        return self._request('add', params)
 
     def get(
         self,
@@ -1663,7 +1946,7 @@ class Client(BaseEntity):
         archived: Optional[str] = None,
         limit: int = 500,
         offset: int = 0,
-    ) -> dict:
+    ) -> Union[dict, 'StreamedPage']:
         """
         doc - https://yandex.ru/dev/direct/doc/ref-v5/agencyclients/get.html
         :param field_names: list
@@ -1678,9 +1961,7 @@ class Client(BaseEntity):
             'Page': {'Limit': limit, 'Offset': offset},
         }
         if logins or archived:
-            params['SelectionCriteria'] = (
-                generate_params(['logins', 'archived'], locals()),
-            )
+            params['SelectionCriteria'] = build_params(logins=logins, archived=archived)
         return self._get(params)
 
     def update(self, clients: list) -> dict:
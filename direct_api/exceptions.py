@@ -7,11 +7,12 @@ class YdAuthError(YdException):
 
 
 class YdAPIError(YdException):
-    __slots__ = ('error', 'code', 'message', 'request_params', 'request_id')
+    __slots__ = ('error', 'code', 'message', 'request_params', 'request_id', 'response')
 
-    def __init__(self, error_data):
+    def __init__(self, error_data, response=None):
         super(YdAPIError, self).__init__()
         self.error_data = error_data
+        self.response = response
         self.code = error_data.get('error_code')
         self.message = error_data.get('error_string')
         self.description = error_data.get('error_detail')
@@ -21,6 +22,26 @@ class YdAPIError(YdException):
         return f'{self.code}. {self.message}. {self.description} request_id={self.request_id}'
 
 
+class YdPartialError(YdException):
+    """
+    Some chunks of chunked request failed, results of the other chunks are kept
+    """
+
+    def __init__(self, result: dict, errors: dict) -> None:
+        """
+        :param result: dict, merged responses ({'result': {...}}), objects of failed chunks
+            have {'Errors': [...]} items, so results match sent objects by position
+        :param errors: dict {chunk index: exception} of failed chunks
+        """
+        super().__init__(result, errors)
+        self.result = result
+        self.errors = errors
+
+    def __str__(self) -> str:
+        failed = ', '.join(f'{i}: {e!r}' for i, e in sorted(self.errors.items()))
+        return f'{len(self.errors)} chunks failed ({failed})'
+
+
 class ParameterError(YdException):
     def __init__(self, params: list) -> None:
         super().__init__(params)
@@ -0,0 +1,125 @@
+import json
+from typing import Any, Dict, Union
+
+from .exceptions import YdException
+
+__all__ = ('JsonCodec', 'StdlibCodec', 'OrjsonCodec', 'UjsonCodec', 'get_codec')
+
+
+class JsonCodec(object):
+    """
+    Encoding of request bodies and decoding of response bodies,
+    subclass it to plug in another JSON library
+    """
+
+    name = ''
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        :param obj: request body
+        :return: bytes, utf-8 JSON
+        """
+        raise NotImplementedError
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        :param data: bytes or str, JSON
+        :return: decoded object
+        """
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}()'
+
+
+class StdlibCodec(JsonCodec):
+    name = 'json'
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode(
+            'utf-8'
+        )
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        import orjson  # optional dependency
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._dumps(obj)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._loads(data)
+
+
+class UjsonCodec(JsonCodec):
+    name = 'ujson'
+
+    def __init__(self) -> None:
+        import ujson  # type: ignore  # optional dependency, stubs are not required
+
+        self._dumps = ujson.dumps
+        self._loads = ujson.loads
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._dumps(
+            obj, ensure_ascii=False, escape_forward_slashes=False
+        ).encode('utf-8')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return self._loads(data)
+
+
+CODECS = {
+    StdlibCodec.name: StdlibCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    UjsonCodec.name: UjsonCodec,
+}
+# order of auto selection
+PREFERRED_CODECS = (OrjsonCodec, UjsonCodec, StdlibCodec)
+
+
+# codecs are stateless, instances are shared by clients
+_INSTANCES: Dict[str, JsonCodec] = {}
+
+
+def _create(name: str) -> JsonCodec:
+    codec = _INSTANCES.get(name)
+    if codec is None:
+        codec = _INSTANCES[name] = CODECS[name]()
+    return codec
+
+
+def get_codec(codec: Union[str, JsonCodec, None] = None) -> JsonCodec:
+    """
+    :param codec: None or 'auto' (the fastest installed: orjson, ujson, json),
+        name of codec ('json', 'orjson', 'ujson') or JsonCodec instance
+    :return: JsonCodec
+    """
+    if isinstance(codec, JsonCodec):
+        return codec
+    if codec is None or codec == 'auto':
+        for codec_class in PREFERRED_CODECS:
+            try:
+                return _create(codec_class.name)
+            except ImportError:
+                continue
+    if codec not in CODECS:
+        raise YdException(
+            f'unknown json codec {codec!r}, expected one of {", ".join(CODECS)}'
+        )
+    try:
+        return _create(codec)
+    except ImportError:
+        raise ImportError(
+            f'{codec} is required for json_codec={codec!r}, '
+            f'install it with `pip install {codec}`'
+        ) from None
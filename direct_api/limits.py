@@ -0,0 +1,144 @@
+from itertools import product
+from typing import Dict, List, Optional, Tuple
+
+__all__ = (
+    'OBJECT_LIMITS',
+    'SELECTION_LIMITS',
+    'get_object_limit',
+    'split',
+    'split_selection',
+)
+
+# max number of objects (or ids) in one request by (service, method),
+# see "Restrictions" section of method docs https://yandex.ru/dev/direct/doc/ref-v5/
+OBJECT_LIMITS: Dict[Tuple[str, str], int] = {
+    ('adextensions', 'add'): 1000,
+    ('adextensions', 'delete'): 10000,
+    ('adgroups', 'add'): 1000,
+    ('adgroups', 'delete'): 10000,
+    ('adgroups', 'update'): 1000,
+    ('adimages', 'add'): 1000,
+    ('adimages', 'delete'): 10000,
+    ('ads', 'add'): 1000,
+    ('ads', 'archive'): 10000,
+    ('ads', 'delete'): 10000,
+    ('ads', 'moderate'): 10000,
+    ('ads', 'resume'): 10000,
+    ('ads', 'suspend'): 10000,
+    ('ads', 'unarchive'): 10000,
+    ('ads', 'update'): 1000,
+    ('audiencetargets', 'add'): 1000,
+    ('audiencetargets', 'delete'): 10000,
+    ('audiencetargets', 'resume'): 10000,
+    ('audiencetargets', 'setBids'): 10000,
+    ('audiencetargets', 'suspend'): 10000,
+    ('bids', 'set'): 10000,
+    ('bids', 'setAuto'): 10000,
+    ('bidmodifiers', 'add'): 1000,
+    ('bidmodifiers', 'delete'): 10000,
+    ('bidmodifiers', 'set'): 1000,
+    ('bidmodifiers', 'toggle'): 1000,
+    ('campaigns', 'add'): 10,
+    ('campaigns', 'archive'): 1000,
+    ('campaigns', 'delete'): 1000,
+    ('campaigns', 'resume'): 1000,
+    ('campaigns', 'suspend'): 1000,
+    ('campaigns', 'unarchive'): 1000,
+    ('campaigns', 'update'): 10,
+    ('dynamictextadtargets', 'add'): 1000,
+    ('dynamictextadtargets', 'delete'): 10000,
+    ('dynamictextadtargets', 'resume'): 10000,
+    ('dynamictextadtargets', 'setBids'): 10000,
+    ('dynamictextadtargets', 'suspend'): 10000,
+    ('keywordbids', 'set'): 10000,
+    ('keywordbids', 'setAuto'): 10000,
+    ('keywords', 'add'): 1000,
+    ('keywords', 'delete'): 10000,
+    ('keywords', 'resume'): 10000,
+    ('keywords', 'suspend'): 10000,
+    ('keywords', 'update'): 10000,
+    ('negativekeywordsharedsets', 'add'): 1000,
+    ('negativekeywordsharedsets', 'delete'): 10000,
+    ('negativekeywordsharedsets', 'update'): 1000,
+    ('retargetinglists', 'add'): 1000,
+    ('retargetinglists', 'delete'): 10000,
+    ('retargetinglists', 'update'): 1000,
+    ('sitelinks', 'add'): 1000,
+    ('sitelinks', 'delete'): 10000,
+    ('vcards', 'add'): 1000,
+    ('vcards', 'delete'): 10000,
+}
+
+# max number of ids in SelectionCriteria of get method (and in Change.check)
+# by (service, method argument)
+SELECTION_LIMITS: Dict[Tuple[str, str], int] = {
+    ('adgroups', 'campaign_ids'): 10,
+    ('adgroups', 'ids'): 10000,
+    ('ads', 'ad_group_ids'): 1000,
+    ('ads', 'campaign_ids'): 10,
+    ('ads', 'ids'): 10000,
+    ('audiencetargets', 'ad_group_ids'): 1000,
+    ('audiencetargets', 'campaign_ids'): 100,
+    ('audiencetargets', 'ids'): 10000,
+    ('bidmodifiers', 'ad_group_ids'): 1000,
+    ('bidmodifiers', 'campaign_ids'): 10,
+    ('bidmodifiers', 'ids'): 10000,
+    ('bids', 'ad_group_ids'): 1000,
+    ('bids', 'campaign_ids'): 10,
+    ('bids', 'keyword_ids'): 10000,
+    ('campaigns', 'ids'): 1000,
+    ('changes', 'ad_group_ids'): 10000,
+    ('changes', 'ad_ids'): 50000,
+    ('changes', 'campaign_ids'): 3000,
+    ('dynamictextadtargets', 'ad_group_ids'): 1000,
+    ('dynamictextadtargets', 'campaign_ids'): 2,
+    ('dynamictextadtargets', 'ids'): 10000,
+    ('keywordbids', 'ad_group_ids'): 1000,
+    ('keywordbids', 'campaign_ids'): 10,
+    ('keywordbids', 'keyword_ids'): 10000,
+    ('keywords', 'ad_group_ids'): 1000,
+    ('keywords', 'campaign_ids'): 10,
+    ('keywords', 'ids'): 10000,
+}
+
+
+def get_object_limit(service: str, method: str) -> Optional[int]:
+    """
+    :param service: str
+    :param method: str
+    :return: int or None if method has no known limit
+    """
+    return OBJECT_LIMITS.get((service, method))
+
+
+def split(objects: list, limit: Optional[int]) -> list:
+    """
+    :param objects: list
+    :param limit: optional int
+    :return: list of chunks not longer than limit
+    """
+    if not limit or len(objects) <= limit:
+        return [objects]
+    return [objects[i : i + limit] for i in range(0, len(objects), limit)]
+
+
+def split_selection(service: str, arguments: dict) -> List[dict]:
+    """
+    Split id arguments of get method by SELECTION_LIMITS, duplicate ids are dropped.
+    When several arguments are split, every combination of their chunks is returned
+    (criteria are joined with AND, so union of sub-queries equals the original query)
+    :param service: str
+    :param arguments: dict, arguments of get method
+    :return: list of arguments dicts
+    """
+    chunked = {}
+    for name, value in arguments.items():
+        limit = SELECTION_LIMITS.get((service, name))
+        if limit and value and len(value) > limit:
+            chunked[name] = split(list(dict.fromkeys(value)), limit)
+    if not chunked:
+        return [arguments]
+    return [
+        dict(arguments, **dict(zip(chunked, chunks)))
+        for chunks in product(*chunked.values())
+    ]
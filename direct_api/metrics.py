@@ -0,0 +1,237 @@
+import threading
+from bisect import bisect_left
+from typing import Dict, Iterator, List, Optional, Tuple
+
+__all__ = ('RequestEvent', 'MetricsRegistry', 'DEFAULT_BUCKETS')
+
+# seconds
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class RequestEvent(object):
+    """
+    One HTTP request of client (every retry attempt is a separate request),
+    passed to hooks after response is decoded or request is failed
+    """
+
+    __slots__ = (
+        'kind',
+        'service',
+        'method',
+        'login',
+        'status',
+        'request_bytes',
+        'response_bytes',
+        'serialize_time',
+        'network_time',
+        'decode_time',
+        'request_id',
+        'units',
+        'error',
+    )
+
+    def __init__(self, kind: str, service: str, method: str, login: str) -> None:
+        """
+        :param kind: str, 'api' (JSON services) or 'report'
+        :param service: str
+        :param method: str
+        :param login: str, Client-Login of request
+        """
+        self.kind = kind
+        self.service = service
+        self.method = method
+        self.login = login
+        # HTTP status, None if response is not received
+        self.status: Optional[int] = None
+        self.request_bytes = 0
+        # size of decompressed body, None if body is streamed to caller
+        self.response_bytes: Optional[int] = None
+        # seconds
+        self.serialize_time = 0.0
+        self.network_time = 0.0
+        self.decode_time = 0.0
+        # RequestId and Units headers of response
+        self.request_id: Optional[str] = None
+        self.units: Optional[str] = None
+        self.error: Optional[Exception] = None
+
+    @property
+    def units_spent(self) -> int:
+        """
+        :return: int, points spent by request (0 if Units header is absent)
+        """
+        if not self.units:
+            return 0
+        return int(self.units.split('/', 1)[0])
+
+    def __repr__(self) -> str:
+        return (
+            f'RequestEvent({self.kind} {self.service}.{self.method}, login={self.login}, '
+            f'status={self.status}, request_id={self.request_id}, units={self.units})'
+        )
+
+
+class _Histogram(object):
+    __slots__ = ('counts', 'sum', 'count')
+
+    def __init__(self, size: int) -> None:
+        # counts by bucket, last one is +Inf
+        self.counts = [0] * (size + 1)
+        self.sum = 0.0
+        self.count = 0
+
+
+# metric name -> (type, help)
+METRICS: Dict[str, Tuple[str, str]] = {
+    'requests_total': ('counter', 'HTTP requests by status'),
+    'errors_total': ('counter', 'Failed requests by error code or exception type'),
+    'request_bytes_total': ('counter', 'Bytes of request bodies'),
+    'response_bytes_total': ('counter', 'Bytes of decompressed response bodies'),
+    'units_spent_total': ('counter', 'Points spent by login'),
+    'serialize_seconds': ('histogram', 'Time of request body serialization'),
+    'network_seconds': ('histogram', 'Time from sending request to receiving response'),
+    'decode_seconds': ('histogram', 'Time of response body decoding'),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry(object):
+    """
+    In-process metrics of requests, registry is a hook of client:
+
+        metrics = MetricsRegistry()
+        client = DirectAPI('<access_token>', '<clid>', hooks=[metrics])
+        metrics.prometheus()  # text exposition format for /metrics endpoint
+        metrics.samples()  # (name, labels, value) for other exporters (OpenTelemetry, statsd)
+    """
+
+    def __init__(
+        self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, prefix: str = 'direct_api'
+    ) -> None:
+        """
+        :param buckets: tuple, upper bounds of histogram buckets in seconds
+        :param prefix: str, prefix of metric names
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], _Histogram] = {}
+
+    def __call__(self, event: RequestEvent) -> None:
+        labels = (
+            ('kind', event.kind),
+            ('service', event.service),
+            ('method', event.method),
+        )
+        status = labels + (('status', str(event.status or 0)),)
+        with self._lock:
+            self._inc('requests_total', status, 1)
+            if event.error is not None:
+                code = getattr(event.error, 'code', None)
+                error = labels + (
+                    ('code', str(code) if code else type(event.error).__name__),
+                )
+                self._inc('errors_total', error, 1)
+            self._inc('request_bytes_total', labels, event.request_bytes)
+            if event.response_bytes:
+                self._inc('response_bytes_total', labels, event.response_bytes)
+            if event.units:
+                self._inc(
+                    'units_spent_total',
+                    (('login', event.login), ('service', event.service)),
+                    event.units_spent,
+                )
+            self._observe('serialize_seconds', labels, event.serialize_time)
+            if event.status is not None:
+                self._observe('network_seconds', labels, event.network_time)
+                self._observe('decode_seconds', labels, event.decode_time)
+
+    def _inc(self, name: str, labels: Labels, value: float) -> None:
+        key = (name, labels)
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def _observe(self, name: str, labels: Labels, value: float) -> None:
+        histogram = self._histograms.get((name, labels))
+        if histogram is None:
+            histogram = self._histograms[(name, labels)] = _Histogram(len(self.buckets))
+        histogram.counts[bisect_left(self.buckets, value)] += 1
+        histogram.sum += value
+        histogram.count += 1
+
+    def samples(self) -> List[Tuple[str, Dict[str, str], float]]:
+        """
+        :return: list of (name, labels, value), histograms are cumulative
+            buckets (name_bucket with le label), name_sum and name_count
+        """
+        with self._lock:
+            return list(self._iter_samples())
+
+    def _iter_samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        for (name, labels), value in sorted(self._counters.items()):
+            yield f'{self.prefix}_{name}', dict(labels), value
+        bounds = [str(b) for b in self.buckets] + ['+Inf']
+        for (name, labels), histogram in sorted(
+            self._histograms.items(), key=lambda item: item[0]
+        ):
+            full_name = f'{self.prefix}_{name}'
+            cumulative = 0
+            for bound, count in zip(bounds, histogram.counts):
+                cumulative += count
+                yield f'{full_name}_bucket', dict(labels, le=bound), cumulative
+            yield f'{full_name}_sum', dict(labels), histogram.sum
+            yield f'{full_name}_count', dict(labels), histogram.count
+
+    def snapshot(self) -> dict:
+        """
+        :return: dict {name: {labels as 'key=value,...': value}}
+        """
+        result: dict = {}
+        for name, labels, value in self.samples():
+            key = ','.join(f'{k}={v}' for k, v in labels.items())
+            result.setdefault(name, {})[key] = value
+        return result
+
+    def prometheus(self) -> str:
+        """
+        :return: str, metrics in Prometheus text exposition format
+        """
+        lines = []
+        described = set()
+        for name, labels, value in self.samples():
+            metric = name[len(self.prefix) + 1 :]
+            for suffix in ('_bucket', '_sum', '_count'):
+                base = metric[: -len(suffix)]
+                if metric.endswith(suffix) and base in METRICS:
+                    metric = base
+                    break
+            if metric not in described:
+                described.add(metric)
+                metric_type, description = METRICS[metric]
+                lines.append(f'# HELP {self.prefix}_{metric} {description}')
+                lines.append(f'# TYPE {self.prefix}_{metric} {metric_type}')
+            label_text = ','.join(
+                '{}="{}"'.format(k, v.replace('\\', '\\\\').replace('"', '\\"'))
+                for k, v in labels.items()
+            )
+            lines.append(f'{name}{{{label_text}}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
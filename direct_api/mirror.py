@@ -0,0 +1,235 @@
+import json
+import sqlite3
+import threading
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from .client import DirectAPI
+    from .sync import SyncResult
+
+__all__ = ('EntityMirror',)
+
+_SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS entities (
+        login TEXT NOT NULL,
+        entity TEXT NOT NULL,
+        id INTEGER NOT NULL,
+        campaign_id INTEGER,
+        ad_group_id INTEGER,
+        state TEXT,
+        status TEXT,
+        data TEXT NOT NULL,
+        PRIMARY KEY (login, entity, id)
+    ) WITHOUT ROWID
+    ''',
+    'CREATE INDEX IF NOT EXISTS entities_campaign '
+    'ON entities (entity, campaign_id, login)',
+    'CREATE INDEX IF NOT EXISTS entities_ad_group '
+    'ON entities (entity, ad_group_id, login)',
+    'CREATE INDEX IF NOT EXISTS entities_state '
+    'ON entities (entity, state, status, login)',
+)
+
+_UPSERT = (
+    'INSERT OR REPLACE INTO entities '
+    '(login, entity, id, campaign_id, ad_group_id, state, status, data) '
+    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)'
+)
+
+
+class EntityMirror(object):
+    """
+    Local SQLite copy of objects returned by get methods, keyed by login, entity and id.
+    Objects are queried by campaign, ad group, State and Status without API requests:
+
+        mirror = EntityMirror('direct.sqlite')
+        mirror.load(client, 'Keyword', field_names=['Id', 'AdGroupId', 'CampaignId', 'State'],
+                    campaign_ids=campaign_ids)
+        suspended = mirror.query('Keyword', ad_group_id=123, state='SUSPENDED')
+    """
+
+    def __init__(self, path: str = ':memory:', batch_size: int = 1000) -> None:
+        """
+        :param path: str, sqlite database file (in memory by default)
+        :param batch_size: int, number of objects inserted by one statement
+        """
+        self._batch_size = batch_size
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            for statement in _SCHEMA:
+                self._connection.execute(statement)
+
+    def __enter__(self) -> 'EntityMirror':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    @staticmethod
+    def _row(login: str, entity: str, id_field: str, item: dict) -> tuple:
+        item_id = item[id_field]
+        campaign_id = item_id if entity == 'Campaign' else item.get('CampaignId')
+        ad_group_id = item_id if entity == 'AdGroup' else item.get('AdGroupId')
+        return (
+            login,
+            entity,
+            item_id,
+            campaign_id,
+            ad_group_id,
+            item.get('State'),
+            item.get('Status'),
+            json.dumps(item, ensure_ascii=False),
+        )
+
+    def upsert(
+        self, login: str, entity: str, objects: Iterable[dict], id_field: str = 'Id'
+    ) -> int:
+        """
+        Insert or replace objects, iterable is consumed by batches
+        :param login: str
+        :param entity: str, entity name (Campaign, AdGroup, Ad, Keyword, ...)
+        :param objects: iterable of objects (get_all result or iter_get generator)
+        :param id_field: str, field objects are identified by
+        :return: int, number of stored objects
+        """
+        objects = iter(objects)
+        count = 0
+        while True:
+            rows = [
+                self._row(login, entity, id_field, item)
+                for item in islice(objects, self._batch_size)
+            ]
+            if not rows:
+                return count
+            with self._lock, self._connection:
+                self._connection.executemany(_UPSERT, rows)
+            count += len(rows)
+
+    def load(
+        self, client: 'DirectAPI', entity: str, login: Optional[str] = None, **kwargs
+    ) -> int:
+        """
+        Stream all pages of get method of entity into mirror
+        :param client: DirectAPI
+        :param entity: str, entity name (Campaign, AdGroup, Ad, Keyword, ...)
+        :param login: optional str (client login by default)
+        :param kwargs: params of get method of entity
+        :return: int, number of stored objects
+        """
+        login = login or client.clid
+        entity_api = getattr(client._for_login(login), entity)
+        return self.upsert(
+            login, entity, entity_api.iter_get(**kwargs), entity_api.id_field
+        )
+
+    def apply_sync(self, result: 'SyncResult') -> None:
+        """
+        Store objects of AccountSync.sync result and remove deleted ones (with children
+        of deleted campaigns), mirror of login is cleared on full sync
+        :param result: SyncResult
+        """
+        if result.full:
+            self.clear(result.login)
+        self.upsert(result.login, 'Campaign', result.campaigns)
+        self.upsert(result.login, 'AdGroup', result.ad_groups)
+        self.upsert(result.login, 'Ad', result.ads)
+        for entity, ids in result.deleted.items():
+            if ids:
+                self.delete(result.login, entity, ids)
+        campaign_ids = result.deleted.get('Campaign')
+        if campaign_ids:
+            where, args = self._where(login=result.login, campaign_id=campaign_ids)
+            with self._lock, self._connection:
+                self._connection.execute(f'DELETE FROM entities{where}', args)
+
+    def delete(self, login: str, entity: str, ids: list) -> None:
+        """
+        :param login: str
+        :param entity: str
+        :param ids: list
+        """
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'DELETE FROM entities WHERE login = ? AND entity = ? AND id = ?',
+                [(login, entity, i) for i in ids],
+            )
+
+    def clear(self, login: Optional[str] = None, entity: Optional[str] = None) -> None:
+        """
+        :param login: optional str, all logins by default
+        :param entity: optional str, all entities by default
+        """
+        where, args = self._where(login=login, entity=entity)
+        with self._lock, self._connection:
+            self._connection.execute(f'DELETE FROM entities{where}', args)
+
+    @staticmethod
+    def _where(**conditions) -> tuple:
+        clauses = []
+        args: list = []
+        for column, value in conditions.items():
+            if value is None:
+                continue
+            if isinstance(value, (list, tuple, set)):
+                value = list(value)
+                clauses.append(f'{column} IN ({", ".join("?" * len(value))})')
+                args.extend(value)
+            else:
+                clauses.append(f'{column} = ?')
+                args.append(value)
+        return (f' WHERE {" AND ".join(clauses)}' if clauses else ''), args
+
+    def query(
+        self,
+        entity: str,
+        login: Optional[str] = None,
+        ids: Optional[list] = None,
+        campaign_id: Optional[int] = None,
+        ad_group_id: Optional[int] = None,
+        state: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> List[dict]:
+        """
+        Objects of mirror, list arguments are matched with IN
+        :param entity: str
+        :param login: optional str, all logins by default
+        :param ids: optional list
+        :param campaign_id: optional int or list
+        :param ad_group_id: optional int or list
+        :param state: optional str or list
+        :param status: optional str or list
+        :return: list of objects
+        """
+        where, args = self._where(
+            entity=entity,
+            login=login,
+            id=ids,
+            campaign_id=campaign_id,
+            ad_group_id=ad_group_id,
+            state=state,
+            status=status,
+        )
+        with self._lock:
+            rows = self._connection.execute(
+                f'SELECT data FROM entities{where}', args
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def count(self, entity: str, login: Optional[str] = None, **conditions) -> int:
+        """
+        :param entity: str
+        :param login: optional str
+        :param conditions: campaign_id, ad_group_id, state, status
+        :return: int
+        """
+        where, args = self._where(entity=entity, login=login, **conditions)
+        with self._lock:
+            return self._connection.execute(
+                f'SELECT COUNT(*) FROM entities{where}', args
+            ).fetchone()[0]
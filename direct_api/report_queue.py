@@ -0,0 +1,164 @@
+import asyncio
+import heapq
+from collections import namedtuple, deque
+from itertools import count
+from time import monotonic, sleep
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Awaitable,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    cast,
+)
+
+if TYPE_CHECKING:
+    from .client import BaseDirectAPI
+
+__all__ = ('ReportQueue', 'ReportResult')
+
+ReportResult = namedtuple('ReportResult', ('key', 'login', 'report', 'error'))
+
+
+class _ReportSpec(object):
+    __slots__ = ('key', 'login', 'params', 'headers')
+
+    def __init__(self, key: Hashable, login: str, params: dict, headers: dict) -> None:
+        self.key = key
+        self.login = login
+        self.params = params
+        self.headers = headers
+
+
+class ReportQueue(object):
+    """
+    Requests many reports at once and polls them in one loop by their retryIn,
+    finished reports are returned in order of completion:
+
+        queue = ReportQueue(client, max_offline=5)
+        for login in logins:
+            queue.submit(login, login=login, selection_criteria=..., field_names=..., ...)
+        for result in queue.run():
+            print(result.key, result.error or len(result.report))
+    """
+
+    def __init__(self, client: 'BaseDirectAPI', max_offline: int = 5) -> None:
+        """
+        :param client: DirectAPI or AsyncDirectAPI
+        :param max_offline: int, max number of reports of one login requested at the same time
+        """
+        self._client = client
+        self._max_offline = max_offline
+        self._waiting: deque = deque()
+        self._scheduled: list = []
+        self._active: dict = {}
+        self._order = count()
+
+    def __len__(self) -> int:
+        return len(self._waiting) + len(self._scheduled)
+
+    def submit(
+        self, key: Hashable, login: Optional[str] = None, **report_params
+    ) -> Hashable:
+        """
+        :param key: hashable, id of report in results
+        :param login: optional str, Client-Login of report (client login by default)
+        :param report_params: params of Report.get method
+        :return: key
+        """
+        params, headers = self._client.Report._build_request(**report_params)
+        login = login or self._client.clid
+        headers['Client-Login'] = login
+        self._waiting.append(_ReportSpec(key, login, params, headers))
+        return key
+
+    def _dispatch(self, now: float) -> None:
+        # new reports are requested while login has free slots
+        for _ in range(len(self._waiting)):
+            spec = self._waiting.popleft()
+            if self._active.get(spec.login, 0) < self._max_offline:
+                self._active[spec.login] = self._active.get(spec.login, 0) + 1
+                heapq.heappush(self._scheduled, (now, next(self._order), spec))
+            else:
+                self._waiting.append(spec)
+
+    def _due(self, now: float) -> List[_ReportSpec]:
+        due = []
+        while self._scheduled and self._scheduled[0][0] <= now:
+            due.append(heapq.heappop(self._scheduled)[2])
+        return due
+
+    def _release(self, spec: _ReportSpec) -> None:
+        self._active[spec.login] -= 1
+
+    def _reschedule(self, spec: _ReportSpec, retry_in: int) -> None:
+        heapq.heappush(
+            self._scheduled, (monotonic() + retry_in, next(self._order), spec)
+        )
+
+    def _wait_time(self) -> float:
+        if not self._scheduled:
+            return 0.0
+        return max(0.0, self._scheduled[0][0] - monotonic())
+
+    def run(self) -> Iterator[ReportResult]:
+        """
+        Poll reports until all of them are finished (DirectAPI)
+        :return: generator of ReportResult(key, login, report, error)
+        """
+        while self:
+            self._dispatch(monotonic())
+            for spec in self._due(monotonic()):
+                try:
+                    report, retry_in = cast(
+                        Tuple[Optional[str], int],
+                        self._client._poll_report(spec.params, spec.headers),
+                    )
+                except Exception as e:
+                    self._release(spec)
+                    yield ReportResult(spec.key, spec.login, None, e)
+                    continue
+                if report is None:
+                    self._reschedule(spec, retry_in)
+                else:
+                    self._release(spec)
+                    yield ReportResult(spec.key, spec.login, report, None)
+            self._dispatch(monotonic())
+            sleep(self._wait_time())
+
+    async def arun(self) -> AsyncIterator[ReportResult]:
+        """
+        Poll reports until all of them are finished (AsyncDirectAPI),
+        due reports are polled concurrently
+        :return: async generator of ReportResult(key, login, report, error)
+        """
+        while self:
+            self._dispatch(monotonic())
+            due = self._due(monotonic())
+            polls = await asyncio.gather(
+                *(
+                    cast(
+                        Awaitable[Tuple[Optional[str], int]],
+                        self._client._poll_report(s.params, s.headers),
+                    )
+                    for s in due
+                ),
+                return_exceptions=True,
+            )
+            for spec, poll in zip(due, polls):
+                if isinstance(poll, BaseException):
+                    # cancellation is not error of report
+                    if not isinstance(poll, Exception):
+                        raise poll
+                    self._release(spec)
+                    yield ReportResult(spec.key, spec.login, None, poll)
+                elif poll[0] is None:
+                    self._reschedule(spec, poll[1])
+                else:
+                    self._release(spec)
+                    yield ReportResult(spec.key, spec.login, poll[0], None)
+            self._dispatch(monotonic())
+            await asyncio.sleep(self._wait_time())
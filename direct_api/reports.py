@@ -0,0 +1,131 @@
+from typing import (
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+)
+
+__all__ = ('FIELD_TYPES', 'has_title', 'parse_report_lines', 'aparse_report_lines')
+
+NULL_VALUE = '--'
+TOTAL_ROWS_PREFIX = 'Total rows:'
+
+FIELD_TYPES: dict = {
+    'AdGroupId': int,
+    'AdId': int,
+    'AudienceTargetId': int,
+    'AvgClickPosition': float,
+    'AvgCpc': float,
+    'AvgCpm': float,
+    'AvgEffectiveBid': float,
+    'AvgImpressionFrequency': float,
+    'AvgImpressionPosition': float,
+    'AvgPageviews': float,
+    'AvgTrafficVolume': float,
+    'BounceRate': float,
+    'Bounces': int,
+    'CampaignId': int,
+    'Clicks': int,
+    'ConversionRate': float,
+    'Conversions': int,
+    'Cost': float,
+    'CostPerConversion': float,
+    'CriterionId': int,
+    'Ctr': float,
+    'DynamicTextAdTargetId': int,
+    'GoalsRoi': float,
+    'ImpressionReach': int,
+    'ImpressionShare': float,
+    'Impressions': int,
+    'LocationOfPresenceId': int,
+    'Profit': float,
+    'Revenue': float,
+    'Sessions': int,
+    'SmartAdTargetId': int,
+    'TargetingLocationId': int,
+    'WeightedCtr': float,
+    'WeightedImpressions': float,
+}
+
+
+def _field_type(field_name: str) -> Callable:
+    # goal fields look like Conversions_12345_LSC
+    return FIELD_TYPES.get(field_name.split('_', 1)[0], str)
+
+
+def has_title(headers: Optional[dict]) -> bool:
+    """
+    :param headers: optional dict, headers of report request
+    :return: bool, report starts with title line (skipReportHeader is not set)
+    """
+    return str((headers or {}).get('skipReportHeader', '')).lower() != 'true'
+
+
+def _row_parser(field_names: list, as_dict: bool, title: bool) -> Callable:
+    header = '\t'.join(field_names)
+    converters = [_field_type(name) for name in field_names]
+    # the first line is title of report unless skipReportHeader is set
+    skip = title
+
+    def parse(line: str) -> Optional[Union[dict, tuple]]:
+        if not line:
+            return None
+        nonlocal skip
+        if skip:
+            skip = False
+            return None
+        if line == header or line.startswith(TOTAL_ROWS_PREFIX):
+            return None
+        row = tuple(
+            None if value == NULL_VALUE else converter(value)
+            for converter, value in zip(converters, line.split('\t'))
+        )
+        return dict(zip(field_names, row)) if as_dict else row
+
+    return parse
+
+
+def parse_report_lines(
+    lines: Iterable[str],
+    field_names: list,
+    as_dict: bool = True,
+    title: bool = True,
+) -> Iterator[Union[dict, tuple]]:
+    """
+    Incrementally parse TSV report lines, skipping title, column header and totals lines.
+    '--' values are returned as None, known numeric fields are converted by FIELD_TYPES.
+    :param lines: iterable of str (report lines)
+    :param field_names: list (FieldNames of report)
+    :param as_dict: bool, yield dicts (default) or tuples
+    :param title: bool, the first line is title of report (skipReportHeader is not set)
+    :return: generator of rows
+    """
+    parse = _row_parser(field_names, as_dict, title)
+    for line in lines:
+        row = parse(line)
+        if row is not None:
+            yield row
+
+
+async def aparse_report_lines(
+    lines: AsyncIterable[str],
+    field_names: list,
+    as_dict: bool = True,
+    title: bool = True,
+) -> AsyncIterator[Union[dict, tuple]]:
+    """
+    Async version of parse_report_lines
+    :param lines: async iterable of str (report lines)
+    :param field_names: list (FieldNames of report)
+    :param as_dict: bool, yield dicts (default) or tuples
+    :param title: bool, the first line is title of report (skipReportHeader is not set)
+    :return: async generator of rows
+    """
+    parse = _row_parser(field_names, as_dict, title)
+    async for line in lines:
+        row = parse(line)
+        if row is not None:
+            yield row
@@ -0,0 +1,118 @@
+import random
+import sys
+from typing import FrozenSet, Iterable, Optional
+
+import requests
+
+from .exceptions import YdAPIError
+
+__all__ = ('RetryPolicy', 'RETRY_CODES', 'RETRY_STATUSES')
+
+# 52 - authorization server is busy, 152 - not enough points,
+# 506 - concurrent requests limit, 1000 - service is temporarily unavailable
+RETRY_CODES: FrozenSet[int] = frozenset({52, 152, 506, 1000})
+RETRY_STATUSES: FrozenSet[int] = frozenset({500, 502, 503, 504})
+# request is executed if connection breaks after it is sent, such methods are not
+# retried on network errors and 5xx statuses
+NON_IDEMPOTENT_METHODS: FrozenSet[str] = frozenset({'add'})
+
+_NETWORK_ERRORS: tuple = (requests.ConnectionError, requests.Timeout, ConnectionError)
+
+
+def _is_network_error(error: Exception) -> bool:
+    if isinstance(error, _NETWORK_ERRORS):
+        return True
+    # errors of asyncio and aiohttp can be raised only if they are imported
+    # (by AsyncDirectAPI), so they are not imported here
+    asyncio = sys.modules.get('asyncio')
+    if asyncio is not None and isinstance(error, asyncio.TimeoutError):
+        return True
+    aiohttp = sys.modules.get('aiohttp')
+    return aiohttp is not None and isinstance(
+        error, (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+    )
+
+
+def _error_status(error: Exception) -> Optional[int]:
+    # requests.HTTPError has response, aiohttp.ClientResponseError has status
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    return status if status is not None else getattr(error, 'status', None)
+
+
+def _error_headers(error: Exception) -> dict:
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if headers is None:
+        headers = getattr(error, 'headers', None)
+    return headers or {}
+
+
+class RetryPolicy(object):
+    """
+    Exponential backoff with full jitter. Errors are retried by YdAPIError.code,
+    HTTP status and network errors; Retry-After header of response is respected.
+    Override should_retry / get_backoff to change behaviour.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 60.0,
+        retry_codes: Iterable[int] = RETRY_CODES,
+        retry_statuses: Iterable[int] = RETRY_STATUSES,
+        non_idempotent_methods: Iterable[str] = NON_IDEMPOTENT_METHODS,
+    ) -> None:
+        """
+        :param max_attempts: int, total number of attempts including the first one
+        :param backoff_factor: float, base delay in seconds (backoff_factor * 2 ** attempt)
+        :param max_backoff: float, max delay in seconds
+        :param retry_codes: YdAPIError codes which are retried
+        :param retry_statuses: HTTP statuses which are retried
+        :param non_idempotent_methods: methods retried only on YdAPIError codes
+        """
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_codes = frozenset(retry_codes)
+        self.retry_statuses = frozenset(retry_statuses)
+        self.non_idempotent_methods = frozenset(non_idempotent_methods)
+
+    def should_retry(self, error: Exception, method: str, attempt: int) -> bool:
+        """
+        :param error: exception of failed attempt
+        :param method: str, API method
+        :param attempt: int, number of failed attempt starting from 0
+        :return: bool
+        """
+        if attempt + 1 >= self.max_attempts:
+            return False
+        if isinstance(error, YdAPIError):
+            # request is rejected before execution, safe for any method
+            try:
+                return int(error.code) in self.retry_codes
+            except (TypeError, ValueError):
+                return False
+        if method in self.non_idempotent_methods:
+            return False
+        if _is_network_error(error):
+            return True
+        return _error_status(error) in self.retry_statuses
+
+    def get_backoff(self, error: Exception, attempt: int) -> float:
+        """
+        :param error: exception of failed attempt
+        :param attempt: int, number of failed attempt starting from 0
+        :return: float, seconds to wait before next attempt
+        """
+        delay = random.uniform(
+            0, min(self.max_backoff, self.backoff_factor * 2**attempt)
+        )
+        retry_after = _error_headers(error).get('Retry-After')
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+        return delay
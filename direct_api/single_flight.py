@@ -0,0 +1,106 @@
+import copy
+import json
+import threading
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Hashable
+
+if TYPE_CHECKING:
+    import asyncio
+
+__all__ = ('SingleFlight', 'AsyncSingleFlight', 'request_key')
+
+
+def request_key(headers: dict, service: str, method: str, params: dict) -> tuple:
+    """
+    :return: tuple, requests with equal keys get equal responses
+    """
+    return (
+        headers.get('Authorization'),
+        headers.get('Client-Login'),
+        headers.get('Accept-Language'),
+        service,
+        method,
+        json.dumps(params, sort_keys=True, separators=(',', ':')),
+    )
+
+
+class _Call(object):
+    __slots__ = ('event', 'result', 'error', 'waiters')
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        # shared result is only copied, callers get copies and can't change it
+        self.result: Any = None
+        self.error: Any = None
+        self.waiters = 0
+
+
+class _AsyncCall(object):
+    __slots__ = ('task', 'waiters')
+
+    def __init__(self, task: 'asyncio.Future') -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(object):
+    """
+    Threads calling do() with the same key while call is in flight
+    wait for it and get copy of its result (or its exception);
+    the thread which made the call gets a copy too if others waited for it
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, func: Callable, *args, **kwargs) -> Any:
+        with self._lock:
+            in_flight = self._calls.get(key)
+            if in_flight is None:
+                call = self._calls[key] = _Call()
+            else:
+                in_flight.waiters += 1
+        if in_flight is not None:
+            in_flight.event.wait()
+            if in_flight.error is not None:
+                raise in_flight.error
+            return copy.deepcopy(in_flight.result)
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                # nobody can join the call after it is removed
+                shared = call.waiters > 0
+            call.event.set()
+        return copy.deepcopy(call.result) if shared else call.result
+
+
+class AsyncSingleFlight(object):
+    """
+    Tasks calling do() with the same key while call is in flight await it
+    and get copy of its result (the task which made the call gets a copy too if
+    others awaited it); cancellation of a caller doesn't cancel the shared call
+    """
+
+    def __init__(self) -> None:
+        self._tasks: Dict[Hashable, _AsyncCall] = {}
+
+    async def do(
+        self, key: Hashable, func: Callable[..., Awaitable], *args, **kwargs
+    ) -> Any:
+        # asyncio takes ~40 ms to import and is needed only by async client
+        import asyncio
+
+        in_flight = self._tasks.get(key)
+        if in_flight is not None:
+            in_flight.waiters += 1
+            return copy.deepcopy(await asyncio.shield(in_flight.task))
+        call = _AsyncCall(asyncio.ensure_future(func(*args, **kwargs)))
+        self._tasks[key] = call
+        call.task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        result = await asyncio.shield(call.task)
+        return copy.deepcopy(result) if call.waiters else result
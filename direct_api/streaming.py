@@ -0,0 +1,183 @@
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, Optional
+
+from .exceptions import YdAPIError, YdException
+
+__all__ = ('StreamedPage', 'CHUNK_SIZE')
+
+# bytes of body read at once
+CHUNK_SIZE = 65536
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+
+
+class StreamedPage(object):
+    """
+    Objects of get response decoded one by one while body is read, so only
+    one object and one chunk of body are kept in memory:
+
+        page = StreamedPage(response.iter_content(CHUNK_SIZE), response)
+        page.start()  # reads body up to the first object, error of response is raised here
+        for item in page:
+            ...
+        page.limited_by  # fields of result after objects are known when iteration is finished
+    """
+
+    def __init__(self, chunks: Iterable[bytes], response: Any = None) -> None:
+        """
+        :param chunks: iterable of bytes (decompressed body)
+        :param response: optional response object, closed when body is read
+        """
+        self._chunks = iter(chunks)
+        self._response = response
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._exhausted = False
+        self._started = False
+        self._iterated = False
+        # name of objects list (Campaigns, Keywords, ...), None if result has no list
+        self.key: Optional[str] = None
+        # other fields of result (LimitedBy, ...)
+        self.result: dict = {}
+        self.finished = False
+
+    @property
+    def limited_by(self) -> Optional[int]:
+        """
+        :return: LimitedBy of page or None for the last page, known after iteration
+        """
+        if not self.finished:
+            raise YdException('LimitedBy is known after all objects of page are read')
+        return self.result.get('LimitedBy')
+
+    def _read(self) -> bool:
+        """
+        Append next chunk to buffer, consumed part of buffer is dropped
+        :return: bool, False if body is read to the end
+        """
+        if self._exhausted:
+            return False
+        for chunk in self._chunks:
+            text = self._text.decode(chunk)
+            if text:
+                self._buffer = self._buffer[self._pos :] + text
+                self._pos = 0
+                return True
+        self._exhausted = True
+        text = self._text.decode(b'', final=True)
+        if text:
+            self._buffer = self._buffer[self._pos :] + text
+            self._pos = 0
+        return bool(text)
+
+    def _peek(self) -> str:
+        """
+        :return: str, next char of body which is not whitespace
+        """
+        while True:
+            # pattern matches empty string, so match is never None
+            whitespace = _WHITESPACE.match(self._buffer, self._pos)
+            if whitespace is not None:
+                self._pos = whitespace.end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._read():
+                raise YdException('unexpected end of response')
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise YdException(f'unexpected {found!r} in response, expected {char!r}')
+        self._pos += 1
+
+    def _value(self) -> Any:
+        """
+        :return: next JSON value of body
+        """
+        self._peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # value is not complete yet
+                if not self._read():
+                    raise
+                continue
+            # number at the end of buffer can continue in the next chunk
+            if end < len(self._buffer) or not self._read():
+                self._pos = end
+                return value
+
+    def _close(self) -> None:
+        if self._response is not None:
+            self._response.close()
+
+    def start(self) -> 'StreamedPage':
+        """
+        Read body up to the first object
+        :return: self
+        """
+        if self._started:
+            return self
+        self._started = True
+        try:
+            self._expect('{')
+            while True:
+                key = self._value()
+                self._expect(':')
+                if key == 'error':
+                    raise YdAPIError(self._value(), self._response)
+                if key == 'result':
+                    break
+                # fields outside of result are skipped
+                self._value()
+                self._expect(',')
+            self._expect('{')
+            if self._peek() == '}':
+                return self
+            while True:
+                key = self._value()
+                self._expect(':')
+                if self._peek() == '[':
+                    self._pos += 1
+                    self.key = key
+                    return self
+                self.result[key] = self._value()
+                if self._peek() == '}':
+                    return self
+                self._expect(',')
+        except BaseException:
+            self._close()
+            raise
+
+    def __iter__(self) -> Iterator[dict]:
+        if self._iterated:
+            raise YdException('objects of page can be iterated once')
+        self._iterated = True
+        return self._iterate()
+
+    def _iterate(self) -> Iterator[dict]:
+        self.start()
+        try:
+            if self.key is not None:
+                if self._peek() == ']':
+                    self._pos += 1
+                else:
+                    while True:
+                        yield self._value()
+                        if self._peek() == ']':
+                            self._pos += 1
+                            break
+                        self._expect(',')
+                # fields of result after objects
+                while self._peek() == ',':
+                    self._pos += 1
+                    key = self._value()
+                    self._expect(':')
+                    self.result[key] = self._value()
+            self.finished = True
+        finally:
+            self._close()
@@ -0,0 +1,206 @@
+import inspect
+import json
+import os
+import threading
+from collections import namedtuple
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+from .exceptions import YdException
+from .limits import SELECTION_LIMITS, split
+
+if TYPE_CHECKING:
+    from .client import DirectAPI
+
+__all__ = ('AccountSync', 'SyncResult')
+
+# deleted is dict {'Campaign': ids, 'AdGroup': ids, 'Ad': ids} of deleted objects
+SyncResult = namedtuple(
+    'SyncResult',
+    ('login', 'timestamp', 'full', 'campaigns', 'ad_groups', 'ads', 'deleted'),
+)
+
+
+class AccountSync(object):
+    """
+    Incremental download of campaigns, ad groups and ads. The first sync of login
+    downloads the whole account, next ones request only objects reported by
+    Change.check_campaigns / Change.check since watermark Timestamp of login:
+
+        sync = AccountSync(client, path='watermarks.json', ad_fields=['Id', 'State'])
+        result = sync.sync('<login>')
+        store.upsert(result.campaigns, result.ad_groups, result.ads)
+        store.delete(result.deleted)
+    """
+
+    def __init__(
+        self,
+        client: 'DirectAPI',
+        path: Optional[str] = None,
+        campaign_fields: Optional[list] = None,
+        ad_group_fields: Optional[list] = None,
+        ad_fields: Optional[list] = None,
+    ) -> None:
+        """
+        :param client: DirectAPI
+        :param path: optional str, json file watermarks are stored in
+        :param campaign_fields: optional list, FieldNames of Campaign.get (Id is added)
+        :param ad_group_fields: optional list, FieldNames of AdGroup.get (Id is added)
+        :param ad_fields: optional list, FieldNames of Ad.get (Id is added)
+        """
+        if inspect.iscoroutinefunction(client._request):
+            raise YdException('AccountSync is not supported by async client')
+        self._client = client
+        self._path = path
+        self.campaign_fields = _with_id(campaign_fields or ['Id', 'Name', 'State', 'Status'])
+        self.ad_group_fields = _with_id(
+            ad_group_fields or ['Id', 'Name', 'CampaignId', 'Status']
+        )
+        self.ad_fields = _with_id(ad_fields or ['Id', 'AdGroupId', 'CampaignId', 'State'])
+        self._lock = threading.Lock()
+        self.watermarks: Dict[str, str] = {}
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.watermarks = json.load(f)
+
+    def _save(self) -> None:
+        if not self._path:
+            return
+        tmp_path = f'{self._path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.watermarks, f)
+        os.replace(tmp_path, self._path)
+
+    def _set_watermark(self, login: str, timestamp: str) -> None:
+        with self._lock:
+            self.watermarks[login] = timestamp
+            self._save()
+
+    def reset(self, login: str) -> None:
+        """
+        Next sync of login downloads the whole account
+        :param login: str
+        """
+        with self._lock:
+            self.watermarks.pop(login, None)
+            self._save()
+
+    def sync(self, login: Optional[str] = None) -> SyncResult:
+        """
+        :param login: optional str (client login by default)
+        :return: SyncResult(login, timestamp, full, campaigns, ad_groups, ads, deleted),
+            full is True when the whole account is downloaded, deleted is dict
+            {'Campaign': ids, 'AdGroup': ids, 'Ad': ids} of objects deleted since watermark
+        """
+        login = login or self._client.clid
+        client = self._client._for_login(login)
+        timestamp = self.watermarks.get(login)
+        if timestamp is None:
+            result = self._full_sync(client, login)
+        else:
+            result = self._incremental_sync(client, login, timestamp)
+        self._set_watermark(login, result.timestamp)
+        return result
+
+    def _full_sync(self, client: 'DirectAPI', login: str) -> SyncResult:
+        # watermark is taken before download, so changes made during it are synced next time
+        timestamp = client.Change.check_dictionaries()['result']['Timestamp']
+        campaigns = client.Campaign.get_all(field_names=self.campaign_fields)
+        campaign_ids = [c['Id'] for c in campaigns]
+        ad_groups, ads = self._get_children(client, campaign_ids)
+        deleted: dict = {'Campaign': [], 'AdGroup': [], 'Ad': []}
+        return SyncResult(login, timestamp, True, campaigns, ad_groups, ads, deleted)
+
+    def _get_children(self, client: 'DirectAPI', campaign_ids: list) -> tuple:
+        if not campaign_ids:
+            return [], []
+        ad_groups = client.AdGroup.get_all(
+            field_names=self.ad_group_fields, campaign_ids=campaign_ids
+        )
+        ads = client.Ad.get_all(field_names=self.ad_fields, campaign_ids=campaign_ids)
+        return ad_groups, ads
+
+    def _check_children(
+        self, client: 'DirectAPI', timestamp: str, campaign_ids: list
+    ) -> tuple:
+        """
+        :return: tuple (modified ad group ids, modified ad ids, unprocessed campaign ids,
+            not found campaign ids)
+        """
+        ad_group_ids: List[int] = []
+        ad_ids: List[int] = []
+        unprocessed: List[int] = []
+        not_found: List[int] = []
+        if not campaign_ids:
+            return ad_group_ids, ad_ids, unprocessed, not_found
+        for chunk in split(campaign_ids, SELECTION_LIMITS[('changes', 'campaign_ids')]):
+            result = client.Change.check(
+                timestamp, ['AdGroupIds', 'AdIds'], campaign_ids=chunk
+            )['result']
+            modified = result.get('Modified', {})
+            ad_group_ids.extend(modified.get('AdGroupIds', ()))
+            ad_ids.extend(modified.get('AdIds', ()))
+            unprocessed.extend(result.get('Unprocessed', {}).get('CampaignIds', ()))
+            # campaigns deleted since watermark
+            not_found.extend(result.get('NotFound', {}).get('CampaignIds', ()))
+        return ad_group_ids, ad_ids, unprocessed, not_found
+
+    def _incremental_sync(
+        self, client: 'DirectAPI', login: str, timestamp: str
+    ) -> SyncResult:
+        result = client.Change.check_campaigns(timestamp)['result']
+        self_ids = []
+        children_ids = []
+        for campaign in result.get('Campaigns', ()):
+            if 'SELF' in campaign['ChangesIn']:
+                self_ids.append(campaign['CampaignId'])
+            if 'CHILDREN' in campaign['ChangesIn']:
+                children_ids.append(campaign['CampaignId'])
+        campaigns = []
+        if self_ids:
+            campaigns = client.Campaign.get_all(
+                field_names=self.campaign_fields, ids=self_ids
+            )
+        ad_group_ids, ad_ids, unprocessed, not_found = self._check_children(
+            client, timestamp, children_ids
+        )
+        # too many changes in campaign, its children are downloaded entirely
+        ad_groups, ads = self._get_children(client, unprocessed)
+        modified_ad_groups = []
+        if ad_group_ids:
+            modified_ad_groups = client.AdGroup.get_all(
+                field_names=self.ad_group_fields, ids=ad_group_ids
+            )
+        modified_ads = []
+        if ad_ids:
+            modified_ads = client.Ad.get_all(field_names=self.ad_fields, ids=ad_ids)
+        # changed objects which are not returned by get are deleted
+        deleted = {
+            'Campaign': _missing(self_ids, campaigns, not_found),
+            'AdGroup': _missing(ad_group_ids, modified_ad_groups),
+            'Ad': _missing(ad_ids, modified_ads),
+        }
+        return SyncResult(
+            login,
+            result['Timestamp'],
+            False,
+            campaigns,
+            ad_groups + modified_ad_groups,
+            ads + modified_ads,
+            deleted,
+        )
+
+
+def _with_id(field_names: list) -> list:
+    # objects are matched by Id
+    return field_names if 'Id' in field_names else ['Id'] + list(field_names)
+
+
+def _missing(ids: list, objects: list, not_found: Iterable[int] = ()) -> list:
+    """
+    :param ids: list, requested ids
+    :param objects: list, objects returned by get
+    :param not_found: iterable, ids which are known to be deleted
+    :return: list, sorted ids which are not returned
+    """
+    found = {item['Id'] for item in objects}
+    return sorted(set(ids).union(not_found) - found)
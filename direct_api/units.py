@@ -0,0 +1,247 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from time import monotonic
+from typing import Dict, Mapping, Optional, Tuple
+
+__all__ = (
+    'Units',
+    'UnitsTracker',
+    'UnitsThrottler',
+    'UNIT_COSTS',
+    'estimate_cost',
+    'count_objects',
+)
+
+# (cost per call, cost per object) by (service, method),
+# approximate values from https://yandex.ru/dev/direct/doc/dg/concepts/units.html
+UNIT_COSTS: Dict[Tuple[str, str], Tuple[int, int]] = {
+    ('campaigns', 'add'): (10, 5),
+    ('campaigns', 'archive'): (10, 5),
+    ('campaigns', 'delete'): (10, 2),
+    ('campaigns', 'get'): (10, 1),
+    ('campaigns', 'resume'): (10, 5),
+    ('campaigns', 'suspend'): (10, 5),
+    ('campaigns', 'unarchive'): (10, 5),
+    ('campaigns', 'update'): (10, 3),
+    ('adgroups', 'add'): (20, 20),
+    ('adgroups', 'delete'): (10, 0),
+    ('adgroups', 'get'): (15, 1),
+    ('adgroups', 'update'): (20, 20),
+    ('ads', 'add'): (20, 20),
+    ('ads', 'archive'): (15, 0),
+    ('ads', 'delete'): (10, 0),
+    ('ads', 'get'): (15, 1),
+    ('ads', 'moderate'): (15, 0),
+    ('ads', 'resume'): (15, 0),
+    ('ads', 'suspend'): (15, 0),
+    ('ads', 'unarchive'): (40, 0),
+    ('ads', 'update'): (20, 20),
+    ('keywords', 'add'): (20, 2),
+    ('keywords', 'delete'): (10, 1),
+    ('keywords', 'get'): (15, 1),
+    ('keywords', 'resume'): (15, 0),
+    ('keywords', 'suspend'): (15, 0),
+    ('keywords', 'update'): (20, 2),
+    ('keywordbids', 'get'): (15, 1),
+    ('keywordbids', 'set'): (25, 0),
+    ('keywordbids', 'setAuto'): (25, 0),
+    ('bids', 'get'): (15, 1),
+    ('bids', 'set'): (25, 0),
+    ('bids', 'setAuto'): (25, 0),
+    ('dictionaries', 'get'): (1, 0),
+}
+DEFAULT_UNIT_COST: Tuple[int, int] = (10, 1)
+# points limit is daily, day is counted by moscow time
+MOSCOW_TZ = timezone(timedelta(hours=3))
+
+
+def estimate_cost(
+    service: str, method: str, objects_count: int = 0, requests_count: int = 1
+) -> int:
+    """
+    :param service: str
+    :param method: str
+    :param objects_count: int, number of objects in request (or expected in get response)
+    :param requests_count: int, number of requests objects are sent with
+    :return: int, approximate points cost
+    """
+    call_cost, object_cost = UNIT_COSTS.get((service, method), DEFAULT_UNIT_COST)
+    return call_cost * requests_count + object_cost * objects_count
+
+
+def count_objects(params: dict) -> int:
+    """
+    :param params: dict (request params)
+    :return: int, number of objects sent in request (0 for get requests)
+    """
+    if 'FieldNames' in params:
+        return 0
+    criteria = params.get('SelectionCriteria')
+    ids = criteria.get('Ids') if isinstance(criteria, dict) else None
+    if isinstance(ids, list):
+        return len(ids)
+    return sum(len(value) for value in params.values() if isinstance(value, list))
+
+
+class Units(object):
+    """
+    Parsed Units header: spent by request / rest / daily limit
+    """
+
+    __slots__ = ('spent', 'rest', 'limit', 'login')
+
+    def __init__(self, spent: int, rest: int, limit: int, login: str = '') -> None:
+        self.spent = spent
+        self.rest = rest
+        self.limit = limit
+        self.login = login
+
+    def __repr__(self) -> str:
+        return f'Units({self.spent}/{self.rest}/{self.limit}, login={self.login})'
+
+    @classmethod
+    def from_headers(cls, headers: Mapping, login: str = '') -> Optional['Units']:
+        """
+        :param headers: response headers
+        :param login: str, login used if Units-Used-Login header is absent
+        :return: Units or None if header is absent
+        """
+        value = headers.get('Units')
+        if not value:
+            return None
+        try:
+            spent, rest, limit = (int(part) for part in value.split('/'))
+        except ValueError:
+            return None
+        return cls(spent, rest, limit, headers.get('Units-Used-Login') or login)
+
+
+class UnitsTracker(object):
+    """
+    Thread safe storage of points state by login and points spent by login and service
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._last: Dict[str, Units] = {}
+        self._spent: Dict[Tuple[str, str], int] = {}
+        # Client-Login -> Units-Used-Login, agency points may be spent for client requests
+        self._used_login: Dict[str, str] = {}
+
+    def update(
+        self, headers: Mapping, service: str, login: str = ''
+    ) -> Optional[Units]:
+        """
+        :param headers: response headers
+        :param service: str
+        :param login: str, Client-Login of request
+        :return: Units or None
+        """
+        units = Units.from_headers(headers, login)
+        if units is None:
+            return None
+        with self._lock:
+            self._last[units.login] = units
+            self._used_login[login] = units.login
+            key = (units.login, service)
+            self._spent[key] = self._spent.get(key, 0) + units.spent
+        return units
+
+    def get(self, login: str) -> Optional[Units]:
+        """
+        :param login: str
+        :return: last known Units of login
+        """
+        return self._last.get(login)
+
+    def rest(self, login: str) -> Optional[int]:
+        """
+        :param login: str, Client-Login of request
+        :return: rest of points which are spent by requests of login
+        """
+        units = self._last.get(self._used_login.get(login, login))
+        return units.rest if units is not None else None
+
+    def spent(self, login: Optional[str] = None, service: Optional[str] = None) -> int:
+        """
+        :param login: optional str
+        :param service: optional str
+        :return: int, points spent by this client, filtered by login and service
+        """
+        with self._lock:
+            return sum(
+                value
+                for (key_login, key_service), value in self._spent.items()
+                if (login is None or key_login == login)
+                and (service is None or key_service == service)
+            )
+
+    def as_dict(self) -> dict:
+        """
+        :return: dict {login: {'rest': int, 'limit': int, 'spent': {service: int}}}
+        """
+        with self._lock:
+            result: dict = {
+                login: {'rest': units.rest, 'limit': units.limit, 'spent': {}}
+                for login, units in self._last.items()
+            }
+            for (login, service), value in self._spent.items():
+                result.setdefault(login, {'rest': None, 'limit': None, 'spent': {}})
+                result[login]['spent'][service] = value
+        return result
+
+
+class UnitsThrottler(object):
+    """
+    Paces requests of each login, so the rest of points is spread evenly until the end of the day.
+
+    Reset model: the rest of points (Units header of the last response) is treated as the budget
+    until midnight by moscow time. API restores spent points gradually during the day, so this is
+    conservative, and one wait never exceeds max_wait: after it the request is sent and the rest
+    from its response is used again.
+    """
+
+    def __init__(
+        self, tracker: UnitsTracker, reserve: int = 0, max_wait: float = 3600.0
+    ) -> None:
+        """
+        :param tracker: UnitsTracker
+        :param reserve: int, points which are not spent by paced requests
+        :param max_wait: float, max seconds one request waits (default - an hour)
+        """
+        self._tracker = tracker
+        self._reserve = reserve
+        self._max_wait = max_wait
+        self._lock = threading.Lock()
+        self._next_time: Dict[str, float] = {}
+
+    @staticmethod
+    def _seconds_to_reset() -> float:
+        now = datetime.now(MOSCOW_TZ)
+        tomorrow = (now + timedelta(days=1)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        return (tomorrow - now).total_seconds()
+
+    def reserve(self, login: str, cost: int) -> float:
+        """
+        Reserve time slot for request
+        :param login: str
+        :param cost: int, estimated cost of request
+        :return: float, seconds to wait before sending request, not more than max_wait
+        """
+        rest = self._tracker.rest(login)
+        if rest is None:
+            # nothing is known about login before the first response
+            return 0.0
+        seconds_left = self._seconds_to_reset()
+        budget = rest - self._reserve
+        if budget <= 0:
+            # points are restored during the day, rest is checked again after max_wait
+            return min(seconds_left, self._max_wait)
+        interval = min(cost * seconds_left / budget, self._max_wait)
+        with self._lock:
+            now = monotonic()
+            start = min(max(now, self._next_time.get(login, now)), now + self._max_wait)
+            self._next_time[login] = start + interval
+        return start - now
@@ -1,6 +1,98 @@
+from typing import Dict, Optional
+
+from .exceptions import YdAPIError, YdPartialError
+
+
 def convert(word):
     return ''.join(x.capitalize() or '_' for x in word.split('_'))
 
 
+# snake_case -> CamelCase names of params, filled on first use of name
+_CAMEL_CASE_NAMES: Dict[str, str] = {}
+
+
+def camel_case(name: str) -> str:
+    """
+    Cached convert
+    :param name: str (snake_case)
+    :return: str (CamelCase)
+    """
+    try:
+        return _CAMEL_CASE_NAMES[name]
+    except KeyError:
+        return _CAMEL_CASE_NAMES.setdefault(name, convert(name))
+
+
+def build_params(**kwargs) -> dict:
+    """
+    Request params from snake_case kwargs, only None values are skipped
+    (0, '' and empty lists are sent as they are)
+    :return: dict with CamelCase keys
+    """
+    return {camel_case(k): v for k, v in kwargs.items() if v is not None}
+
+
 def generate_params(fields: list, function_kwargs: dict) -> dict:
-    return {convert(field): function_kwargs[field] for field in fields if function_kwargs.get(field)}
+    """
+    Same as build_params for names of fields taken from function_kwargs (locals())
+    """
+    return {
+        camel_case(field): function_kwargs[field]
+        for field in fields
+        if function_kwargs.get(field) is not None
+    }
+
+
+def _failed_item(error: Exception) -> dict:
+    """
+    :return: dict, result of object of failed chunk in ActionResult form of API
+    """
+    if isinstance(error, YdAPIError):
+        detail = {'Code': error.code, 'Message': error.message, 'Details': error.description}
+    else:
+        detail = {'Message': str(error) or type(error).__name__}
+    return {'Errors': [detail]}
+
+
+def merge_results(responses: list, sizes: Optional[list] = None) -> dict:
+    """
+    Merge responses of chunked requests, lists in result are concatenated in order of responses
+    :param responses: list (decoded responses or exceptions of failed requests)
+    :param sizes: optional list, number of objects sent by every request; objects of failed
+        request get {'Errors': [...]} items, so positions of results match sent objects
+    :return: dict
+    :raises YdPartialError: some of requests failed, merged results are kept in it
+    """
+    errors: dict = {}
+    results: list = []
+    for index, response in enumerate(responses):
+        if isinstance(response, Exception):
+            errors[index] = response
+        elif 'error' in response:
+            errors[index] = YdAPIError(response['error'])
+        results.append(None if index in errors else response.get('result', {}))
+    # names of lists of results (AddResults, ...) are known from successful responses
+    list_keys = {
+        key
+        for chunk in results
+        if chunk is not None
+        for key, value in chunk.items()
+        if isinstance(value, list)
+    }
+    result: dict = {}
+    for index, chunk in enumerate(results):
+        if chunk is None:
+            size = sizes[index] if sizes else 0
+            for key in list_keys:
+                result.setdefault(key, []).extend(
+                    _failed_item(errors[index]) for _ in range(size)
+                )
+            continue
+        for key, value in chunk.items():
+            if isinstance(value, list):
+                result.setdefault(key, []).extend(value)
+            else:
+                result[key] = value
+    if errors:
+        raise YdPartialError({'result': result}, errors)
+    return {'result': result}
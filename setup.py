@@ -13,6 +13,7 @@ setup(
     version=__version__,
     packages=find_packages(exclude=("tests",)),
     install_requires=["requests>=2.22.0"],
+    extras_require={"async": ["aiohttp>=3.6.0"], "fast": ["orjson>=3.0"]},
     description="Api wrapper for YandexDirect API v5",
     author="bzdvdn",
     author_email="bzdv.dn@gmail.com",
@@ -0,0 +1,21 @@
+import unittest
+
+from direct_api.async_client import AsyncDirectAPI
+from direct_api.exceptions import YdException
+
+
+class SyncOnlyMethodsTest(unittest.TestCase):
+    def setUp(self):
+        self.client = AsyncDirectAPI('token', 'login')
+
+    def test_iter_get(self):
+        with self.assertRaisesRegex(YdException, 'aiter_get'):
+            next(self.client.Campaign.iter_get(['Id']))
+
+    def test_get_all(self):
+        with self.assertRaisesRegex(YdException, 'aiter_get'):
+            self.client.Campaign.get_all(['Id'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from unittest import mock
+
+from direct_api.batching import WriteBatcher
+from direct_api.client import DirectAPI
+from direct_api.emulator import DirectEmulator
+from direct_api.exceptions import YdAPIError
+
+ERROR = {'error_code': 8800, 'error_string': 'Object not found', 'error_detail': ''}
+
+
+class WriteBatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.emulator = DirectEmulator(campaigns=1, ad_groups_per_campaign=1)
+        self.emulator.start()
+        self.addCleanup(self.emulator.stop)
+        self.client = DirectAPI('token', 'login', api_url=self.emulator.url)
+        self.keyword_ids = sorted(self.emulator._objects['keywords'])
+
+    def test_callers_get_their_part_of_result(self):
+        ids = self.keyword_ids
+        with WriteBatcher(self.client, window=60) as batcher:
+            futures = [
+                batcher.submit(self.client.Keyword.suspend, ids[:2]),
+                batcher.submit(self.client.Keyword.suspend, [ids[2]]),
+                batcher.submit(self.client.Keyword.suspend, [-1, ids[3]]),
+            ]
+        results = [f.result(0)['result']['SuspendResults'] for f in futures]
+        self.assertEqual(results[0], [{'Id': ids[0]}, {'Id': ids[1]}])
+        self.assertEqual(results[1], [{'Id': ids[2]}])
+        self.assertIn('Errors', results[2][0])
+        self.assertEqual(results[2][1], {'Id': ids[3]})
+        self.assertEqual(self.emulator.request_count, 1)
+
+    def test_batch_is_sent_when_full(self):
+        batcher = WriteBatcher(self.client, window=60, max_size=3)
+        self.addCleanup(batcher.close)
+        first = batcher.submit(self.client.Keyword.resume, self.keyword_ids[:2])
+        self.assertFalse(first.done())
+        second = batcher.submit(self.client.Keyword.resume, self.keyword_ids[2:4])
+        self.assertTrue(first.done() and second.done())
+        self.assertEqual(len(second.result(0)['result']['ResumeResults']), 2)
+        self.assertEqual(self.emulator.request_count, 1)
+
+    def test_batch_is_sent_after_window(self):
+        batcher = WriteBatcher(self.client, window=0.01)
+        self.addCleanup(batcher.close)
+        future = batcher.submit(self.client.Keyword.suspend, self.keyword_ids[:1])
+        self.assertEqual(
+            future.result(5), {'result': {'SuspendResults': [{'Id': self.keyword_ids[0]}]}}
+        )
+        self.assertEqual(self.emulator.request_count, 1)
+
+    def test_error_is_set_to_all_callers(self):
+        with mock.patch.object(DirectAPI, '_request', side_effect=YdAPIError(ERROR)):
+            with WriteBatcher(self.client, window=60) as batcher:
+                futures = [
+                    batcher.submit(self.client.Keyword.suspend, [keyword_id])
+                    for keyword_id in self.keyword_ids[:2]
+                ]
+        for future in futures:
+            self.assertIsInstance(future.exception(0), YdAPIError)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from direct_api.bids import NO_BID, BidCache
+
+
+class BidCacheTest(unittest.TestCase):
+    def test_compact_merges_pending_into_sorted_arrays(self):
+        cache = BidCache()
+        for keyword_id in (5, 1, 3):
+            cache.set(keyword_id, keyword_id * 10, keyword_id)
+        self.assertEqual(len(cache), 3)
+        for keyword_id in (4, 6, 2, 0):
+            cache.set(keyword_id, keyword_id * 10, NO_BID)
+        cache.compact()
+        self.assertEqual(list(cache._ids), [0, 1, 2, 3, 4, 5, 6])
+        self.assertEqual(list(cache._search), [0, 10, 20, 30, 40, 50, 60])
+        self.assertEqual(cache.get(3), (30, 3))
+        self.assertEqual(cache.get(4), (40, NO_BID))
+        self.assertIsNone(cache.get(7))
+
+    def test_later_bids_of_pending_keyword_win(self):
+        cache = BidCache()
+        cache.set(2, 20, 2)
+        cache.set(1, 10, 1)
+        cache.set(2, NO_BID, 3)
+        cache.set(2, 25, NO_BID)
+        self.assertEqual(cache.get(2), (25, 3))
+        self.assertEqual(len(cache), 2)
+
+    def test_set_updates_compacted_keyword(self):
+        cache = BidCache()
+        cache.set(1, 10, 1)
+        cache.compact()
+        cache.set(1, NO_BID, 2)
+        self.assertEqual(cache.get(1), (10, 2))
+        self.assertEqual(len(cache._pending_ids), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from direct_api.cache import MemoryBackend, ResponseCache
+from direct_api.client import DirectAPI
+from direct_api.emulator import DirectEmulator
+
+PARAMS = {'SelectionCriteria': {}, 'FieldNames': ['Id']}
+RESPONSE = {'result': {'Campaigns': [{'Id': 1}]}}
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = ResponseCache(MemoryBackend(), ttl=60, ttls={'Ads': 0})
+
+    def test_params_order_does_not_matter(self):
+        self.cache.set('login', 'campaigns', 'get', PARAMS, RESPONSE)
+        params = {'FieldNames': ['Id'], 'SelectionCriteria': {}}
+        self.assertEqual(self.cache.get('login', 'campaigns', 'get', params), RESPONSE)
+        self.assertIsNone(self.cache.get('other', 'campaigns', 'get', PARAMS))
+        self.assertIsNone(self.cache.get('login', 'adgroups', 'get', PARAMS))
+
+    def test_ttl_of_service(self):
+        self.cache.set('login', 'ads', 'get', PARAMS, RESPONSE)
+        self.assertIsNone(self.cache.get('login', 'ads', 'get', PARAMS))
+
+    def test_invalidate_removes_responses_of_login_and_service(self):
+        self.cache.set('login', 'campaigns', 'get', PARAMS, RESPONSE)
+        self.cache.set('login', 'adgroups', 'get', PARAMS, RESPONSE)
+        self.cache.set('other', 'campaigns', 'get', PARAMS, RESPONSE)
+        self.cache.invalidate('login', 'campaigns')
+        self.assertIsNone(self.cache.get('login', 'campaigns', 'get', PARAMS))
+        self.assertEqual(self.cache.get('login', 'adgroups', 'get', PARAMS), RESPONSE)
+        self.assertEqual(self.cache.get('other', 'campaigns', 'get', PARAMS), RESPONSE)
+
+    def test_response_of_older_generation_is_not_stored(self):
+        generation = self.cache.generation('login', 'campaigns')
+        # write request finished while get was sent
+        self.cache.invalidate('login', 'campaigns')
+        self.assertEqual(self.cache.generation('login', 'campaigns'), generation + 1)
+        self.cache.set('login', 'campaigns', 'get', PARAMS, RESPONSE, generation)
+        self.assertIsNone(self.cache.get('login', 'campaigns', 'get', PARAMS))
+        self.cache.set(
+            'login', 'campaigns', 'get', PARAMS, RESPONSE, generation + 1
+        )
+        self.assertEqual(self.cache.get('login', 'campaigns', 'get', PARAMS), RESPONSE)
+
+
+class ClientCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.emulator = DirectEmulator(campaigns=2)
+        self.emulator.start()
+        self.addCleanup(self.emulator.stop)
+        self.client = DirectAPI(
+            'token', 'login', api_url=self.emulator.url, response_cache=ResponseCache()
+        )
+
+    def test_write_method_invalidates_service(self):
+        first = self.client.Campaign.get(['Id', 'Name'])
+        self.assertEqual(self.client.Campaign.get(['Id', 'Name']), first)
+        self.assertEqual(self.emulator.request_count, 1)
+
+        campaign_id = first['result']['Campaigns'][0]['Id']
+        self.client.Campaign.update([{'Id': campaign_id, 'Name': 'renamed'}])
+        self.assertEqual(self.emulator.request_count, 2)
+        names = {
+            c['Id']: c['Name']
+            for c in self.client.Campaign.get(['Id', 'Name'])['result']['Campaigns']
+        }
+        self.assertEqual(names[campaign_id], 'renamed')
+        self.assertEqual(self.emulator.request_count, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
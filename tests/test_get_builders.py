@@ -0,0 +1,65 @@
+import inspect
+import unittest
+
+from direct_api import entities
+from direct_api.client import DirectAPI
+from direct_api.emulator import DirectEmulator
+from direct_api.exceptions import YdAPIError
+
+# values of required arguments of get builders
+REQUIRED_ARGS = {
+    'selection_criteria': {},
+    'report_name': 'test',
+    'report_type': 'CAMPAIGN_PERFORMANCE_REPORT',
+    'date_range_type': 'TODAY',
+    'dictionary_names': ['Currencies'],
+}
+
+
+def _arguments(method) -> dict:
+    arguments = {}
+    for name, parameter in inspect.signature(method).parameters.items():
+        # every id criterion is passed, so all of them are put into params
+        if name == 'ids' or name.endswith('_ids'):
+            arguments[name] = [1]
+            continue
+        if parameter.default is not inspect.Parameter.empty or parameter.kind in (
+            parameter.VAR_POSITIONAL,
+            parameter.VAR_KEYWORD,
+        ):
+            continue
+        arguments[name] = REQUIRED_ARGS.get(name, ['Id'] if 'field_names' in name else [1])
+    return arguments
+
+
+class GetBuildersTest(unittest.TestCase):
+    """
+    Every get builder is called once, request has to reach emulator
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.emulator = DirectEmulator(campaigns=1, report_polls=0)
+        cls.emulator.start()
+        cls.client = DirectAPI('token', 'login', api_url=cls.emulator.url)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.emulator.stop()
+
+    def test_get_builders(self):
+        for name in entities.__all__:
+            entity = getattr(self.client, name)
+            method = getattr(entity, entity.get_method, None)
+            if method is None:
+                continue
+            with self.subTest(entity=name):
+                try:
+                    method(**_arguments(method))
+                except YdAPIError as e:
+                    # services which are not emulated
+                    self.assertEqual(e.code, 3500)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import asyncio
+import unittest
+
+from direct_api.async_client import AsyncDirectAPI
+from direct_api.client import DirectAPI
+from direct_api.emulator import DirectEmulator
+
+
+def failing_hook(event):
+    raise ValueError('hook failed')
+
+
+class HookErrorTest(unittest.TestCase):
+    def setUp(self):
+        self.emulator = DirectEmulator(campaigns=3)
+        self.emulator.start()
+        self.addCleanup(self.emulator.stop)
+
+    def test_request_result_is_kept(self):
+        client = DirectAPI('token', 'login', api_url=self.emulator.url)
+        events = []
+        client.add_hook(failing_hook)
+        client.add_hook(events.append)
+        with self.assertLogs('direct_api.client', 'ERROR') as logs:
+            response = client.Campaign.get(['Id'])
+        self.assertEqual(len(response['result']['Campaigns']), 3)
+        self.assertEqual(self.emulator.request_count, 1)
+        self.assertEqual(len(events), 1)
+        self.assertIn('hook failed', logs.output[0])
+
+    def test_async_request_result_is_kept(self):
+        async def get():
+            async with AsyncDirectAPI(
+                'token', 'login', api_url=self.emulator.url
+            ) as client:
+                client.add_hook(failing_hook)
+                return await client.Campaign.get(['Id'])
+
+        with self.assertLogs('direct_api.client', 'ERROR'):
+            response = asyncio.run(get())
+        self.assertEqual(len(response['result']['Campaigns']), 3)
+        self.assertEqual(self.emulator.request_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+from direct_api.async_client import AsyncDirectAPI
+from direct_api.client import DirectAPI
+from direct_api.exceptions import YdAPIError
+
+ERROR = {'error_code': 152, 'error_string': 'Not enough units', 'error_detail': ''}
+
+
+def page(ids, limited_by=None):
+    result = {'Campaigns': [{'Id': i} for i in ids]}
+    if limited_by is not None:
+        result['LimitedBy'] = limited_by
+    return {'result': result}
+
+
+class IterManyTest(unittest.TestCase):
+    def setUp(self):
+        self.client = DirectAPI('token', 'login', max_workers=2)
+
+    def test_objects_are_yielded_before_calls_end(self):
+        first_received = threading.Event()
+
+        def call():
+            yield 1
+            # blocks until caller got the first object
+            self.assertTrue(first_received.wait(5))
+            yield 2
+
+        batches = self.client._iter_many([call])
+        self.assertEqual(next(batches), [1])
+        first_received.set()
+        self.assertEqual(list(batches), [[2]])
+
+    def test_workers_stop_when_caller_stops(self):
+        produced = []
+
+        def call():
+            for i in range(100000):
+                produced.append(i)
+                yield i
+
+        batches = self.client._iter_many([call, call])
+        next(batches)
+        batches.close()
+        count = len(produced)
+        self.assertLess(count, 20000)
+        self.assertEqual(len(produced), count)
+
+    def test_error_of_call_is_raised(self):
+        def call():
+            yield 1
+            raise YdAPIError(ERROR)
+
+        with self.assertRaises(YdAPIError):
+            list(self.client._iter_many([call, call]))
+
+    def test_iter_get_of_split_ids(self):
+        def get(field_names, ids=None, limit=1000, offset=0):
+            return page(ids[offset:offset + 600], 600 if offset == 0 and len(ids) > 600 else None)
+
+        with mock.patch.object(self.client.Campaign, 'get', get):
+            items = list(self.client.Campaign.iter_get(['Id'], ids=list(range(1500))))
+        self.assertEqual(sorted(item['Id'] for item in items), list(range(1500)))
+
+
+class AsyncIterGetTest(unittest.TestCase):
+    def setUp(self):
+        self.client = AsyncDirectAPI('token', 'login')
+
+    def collect(self, **kwargs):
+        async def collect():
+            return [item async for item in self.client.Campaign.aiter_get(['Id'], **kwargs)]
+
+        return asyncio.run(collect())
+
+    def test_split_ids(self):
+        async def get(field_names, ids=None, limit=1000, offset=0):
+            await asyncio.sleep(0)
+            if offset == 0 and len(ids) > 600:
+                return page(ids[:600], 600)
+            return page(ids[offset:])
+
+        with mock.patch.object(self.client.Campaign, 'get', get):
+            items = self.collect(ids=list(range(2500)))
+        self.assertEqual(sorted(item['Id'] for item in items), list(range(2500)))
+
+    def test_error_cancels_other_queries(self):
+        calls = []
+
+        async def get(field_names, ids=None, limit=1000, offset=0):
+            calls.append(ids[0])
+            if ids[0] == 0:
+                return {'error': ERROR}
+            await asyncio.sleep(10)
+            return page(ids)
+
+        with mock.patch.object(self.client.Campaign, 'get', get):
+            with self.assertRaises(YdAPIError):
+                self.collect(ids=list(range(2500)))
+        self.assertEqual(sorted(calls), [0, 1000, 2000])
+
+
+if __name__ == '__main__':
+    unittest.main()
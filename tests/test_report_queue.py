@@ -0,0 +1,75 @@
+import asyncio
+import unittest
+from collections import defaultdict
+
+from direct_api.async_client import AsyncDirectAPI
+from direct_api.client import DirectAPI
+from direct_api.emulator import DirectEmulator
+from direct_api.report_queue import ReportQueue
+
+LOGINS = ('first', 'second')
+REPORTS_PER_LOGIN = 5
+MAX_OFFLINE = 2
+
+
+class ReportQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.emulator = DirectEmulator(campaigns=2, report_polls=3, retry_in=0)
+        self.emulator.start()
+        self.addCleanup(self.emulator.stop)
+        # max number of reports of login being built by emulator at the same time
+        self.offline = defaultdict(int)
+        poll_report = self.emulator.poll_report
+
+        def tracked_poll_report(login, params, headers):
+            result = poll_report(login, params, headers)
+            building = sum(1 for k in self.emulator._reports if k[0] == login)
+            self.offline[login] = max(self.offline[login], building)
+            return result
+
+        self.emulator.poll_report = tracked_poll_report
+
+    def submit_all(self, queue):
+        for login in LOGINS:
+            for i in range(REPORTS_PER_LOGIN):
+                queue.submit(
+                    (login, i),
+                    login=login,
+                    selection_criteria={},
+                    field_names=['CampaignId', 'Clicks'],
+                    report_name=f'report {i}',
+                    report_type='CAMPAIGN_PERFORMANCE_REPORT',
+                    date_range_type='YESTERDAY',
+                )
+
+    def check(self, results):
+        self.assertEqual(
+            sorted(r.key for r in results),
+            sorted((login, i) for login in LOGINS for i in range(REPORTS_PER_LOGIN)),
+        )
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertIn('Total rows: 2', result.report)
+        self.assertEqual(self.offline, {login: MAX_OFFLINE for login in LOGINS})
+
+    def test_run(self):
+        client = DirectAPI('token', 'agency', api_url=self.emulator.url)
+        queue = ReportQueue(client, max_offline=MAX_OFFLINE)
+        self.submit_all(queue)
+        self.check(list(queue.run()))
+        self.assertEqual(len(queue), 0)
+
+    def test_arun(self):
+        async def run():
+            async with AsyncDirectAPI(
+                'token', 'agency', api_url=self.emulator.url
+            ) as client:
+                queue = ReportQueue(client, max_offline=MAX_OFFLINE)
+                self.submit_all(queue)
+                return [result async for result in queue.arun()]
+
+        self.check(asyncio.run(run()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from unittest import mock
+
+from direct_api.client import DirectAPI
+from direct_api.reports import has_title, parse_report_lines
+from direct_api.streaming import CHUNK_SIZE
+
+
+class ParseReportLinesTest(unittest.TestCase):
+    def test_single_field_report(self):
+        lines = ['"r1"', 'Clicks', '10', '--', 'Total rows: 2']
+        self.assertEqual(
+            list(parse_report_lines(lines, ['Clicks'])),
+            [{'Clicks': 10}, {'Clicks': None}],
+        )
+
+    def test_report_without_title(self):
+        lines = ['CampaignId\tClicks', '1\t10', 'Total rows: 1']
+        self.assertEqual(
+            list(
+                parse_report_lines(
+                    lines,
+                    ['CampaignId', 'Clicks'],
+                    as_dict=False,
+                    title=has_title({'skipReportHeader': 'true'}),
+                )
+            ),
+            [(1, 10)],
+        )
+
+
+class IterReportsTest(unittest.TestCase):
+    def test_lines_are_read_by_large_chunks(self):
+        client = DirectAPI('token', 'login')
+        response = mock.Mock()
+        response.iter_lines.return_value = iter(['Кампания'.encode(), b'1'])
+        with mock.patch.object(client, '_post_report', return_value=response):
+            self.assertEqual(list(client._iter_reports({})), ['Кампания', '1'])
+        response.iter_lines.assert_called_once_with(chunk_size=CHUNK_SIZE)
+        response.close.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from direct_api.async_client import AsyncDirectAPI
+from direct_api.client import DirectAPI
+from direct_api.exceptions import YdAPIError, YdPartialError
+from direct_api.limits import get_object_limit
+from direct_api.utils import merge_results
+
+ERROR = {'error_code': 152, 'error_string': 'Not enough units', 'error_detail': ''}
+FAILED = {'Errors': [{'Code': 152, 'Message': 'Not enough units', 'Details': ''}]}
+
+
+def response(*ids: int) -> dict:
+    return {'result': {'AddResults': [{'Id': i} for i in ids]}}
+
+
+class MergeResultsTest(unittest.TestCase):
+    def test_merge(self):
+        self.assertEqual(
+            merge_results([response(1), response(2, 3)]), response(1, 2, 3)
+        )
+
+    def test_partial_results(self):
+        network_error = ConnectionError('reset')
+        with self.assertRaises(YdPartialError) as context:
+            merge_results(
+                [response(1), {'error': ERROR}, network_error, response(5)],
+                [1, 2, 1, 1],
+            )
+        # results of failed chunks keep their positions
+        self.assertEqual(
+            context.exception.result,
+            {
+                'result': {
+                    'AddResults': [
+                        {'Id': 1},
+                        FAILED,
+                        FAILED,
+                        {'Errors': [{'Message': 'reset'}]},
+                        {'Id': 5},
+                    ]
+                }
+            },
+        )
+        self.assertEqual(sorted(context.exception.errors), [1, 2])
+        self.assertIsInstance(context.exception.errors[1], YdAPIError)
+        self.assertIs(context.exception.errors[2], network_error)
+
+
+class RequestManyTest(unittest.TestCase):
+    # chunks of keywords, numbers stand for keyword objects
+    params_list = [{'Keywords': [1, 2]}, {'Keywords': [3, 4]}, {'Keywords': [5]}]
+    expected = {
+        'result': {'AddResults': [{'Id': 1}, {'Id': 2}, FAILED, FAILED, {'Id': 5}]}
+    }
+
+    @staticmethod
+    def request(service: str, method: str, params: dict) -> dict:
+        if 3 in params['Keywords']:
+            raise YdAPIError(ERROR)
+        return response(*params['Keywords'])
+
+    def test_sync(self):
+        for max_workers in (1, 3):
+            client = DirectAPI('token', 'login', max_workers=max_workers)
+            with self.subTest(max_workers=max_workers), mock.patch.object(
+                client, '_request', side_effect=self.request
+            ):
+                with self.assertRaises(YdPartialError) as context:
+                    client._request_many('keywords', 'add', self.params_list)
+                self.assertEqual(context.exception.result, self.expected)
+                self.assertEqual(list(context.exception.errors), [1])
+
+    def test_async(self):
+        async def request(service: str, method: str, params: dict) -> dict:
+            return self.request(service, method, params)
+
+        client = AsyncDirectAPI('token', 'login')
+        with mock.patch.object(client, '_request', side_effect=request):
+            with self.assertRaises(YdPartialError) as context:
+                asyncio.run(client._request_many('keywords', 'add', self.params_list))
+        self.assertEqual(context.exception.result, self.expected)
+
+
+class SplitByLimitTest(unittest.TestCase):
+    def test_keyword_bids_set_auto(self):
+        client = DirectAPI('token', 'login')
+        limit = get_object_limit('keywordbids', 'setAuto')
+        bids = [{'KeywordId': i} for i in range(limit + 1)]
+        with mock.patch.object(
+            client, '_request', return_value={'result': {'SetAutoResults': []}}
+        ) as request:
+            client.KeywordBid.set_auto(bids)
+        self.assertEqual(
+            [(c[0][1], len(c[0][2]['KeywordBids'])) for c in request.call_args_list],
+            [('setAuto', limit), ('setAuto', 1)],
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from unittest import mock
+
+import requests
+
+from direct_api.client import DirectAPI
+from direct_api.emulator import DirectEmulator
+from direct_api.exceptions import YdAPIError
+from direct_api.retry import RetryPolicy
+
+
+def api_error(code):
+    return YdAPIError({'error_code': code, 'error_string': '', 'error_detail': ''})
+
+
+def http_error(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return requests.HTTPError(response=response)
+
+
+class ShouldRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.policy = RetryPolicy(max_attempts=3)
+
+    def test_api_error_codes_are_retried_for_any_method(self):
+        for method in ('get', 'add'):
+            with self.subTest(method=method):
+                self.assertTrue(self.policy.should_retry(api_error(1000), method, 0))
+                self.assertTrue(self.policy.should_retry(api_error(152), method, 0))
+                self.assertFalse(self.policy.should_retry(api_error(8800), method, 0))
+
+    def test_add_is_not_retried_on_network_errors_and_5xx(self):
+        errors = (requests.ConnectionError(), requests.Timeout(), http_error(503))
+        for error in errors:
+            with self.subTest(error=error):
+                self.assertTrue(self.policy.should_retry(error, 'get', 0))
+                self.assertTrue(self.policy.should_retry(error, 'update', 0))
+                self.assertFalse(self.policy.should_retry(error, 'add', 0))
+
+    def test_client_errors_are_not_retried(self):
+        self.assertFalse(self.policy.should_retry(http_error(400), 'get', 0))
+        self.assertFalse(self.policy.should_retry(ValueError(), 'get', 0))
+
+    def test_max_attempts(self):
+        self.assertTrue(self.policy.should_retry(api_error(1000), 'get', 1))
+        self.assertFalse(self.policy.should_retry(api_error(1000), 'get', 2))
+
+    def test_retry_after(self):
+        policy = RetryPolicy(backoff_factor=0.01, max_backoff=0.01)
+        self.assertEqual(policy.get_backoff(http_error(503, {'Retry-After': '7'}), 0), 7)
+        self.assertLessEqual(
+            policy.get_backoff(http_error(503, {'Retry-After': 'soon'}), 0), 0.01
+        )
+        self.assertLessEqual(policy.get_backoff(http_error(503), 3), 0.01)
+
+
+class ClientRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.emulator = DirectEmulator(campaigns=2, error_rate=0.5, seed=1)
+        self.emulator.start()
+        self.addCleanup(self.emulator.stop)
+        self.policy = RetryPolicy(max_attempts=20, backoff_factor=0.001)
+
+    def test_injected_errors_are_retried(self):
+        client = DirectAPI(
+            'token', 'login', api_url=self.emulator.url, retry_policy=self.policy
+        )
+        for _ in range(5):
+            response = client.Campaign.get(['Id'])
+            self.assertEqual(len(response['result']['Campaigns']), 2)
+        self.assertGreater(self.emulator.request_count, 5)
+
+    def test_add_is_sent_once_on_network_error(self):
+        client = DirectAPI('token', 'login', retry_policy=self.policy)
+        error = requests.ConnectionError()
+        with mock.patch.object(client, '_send_api_request', side_effect=error) as send:
+            with mock.patch('direct_api.client.sleep'):
+                with self.assertRaises(requests.ConnectionError):
+                    client.Campaign.add([{'Name': 'campaign'}])
+                self.assertEqual(send.call_count, 1)
+                with self.assertRaises(requests.ConnectionError):
+                    client.Campaign.get(['Id'])
+                self.assertEqual(send.call_count, 1 + self.policy.max_attempts)
+
+
+if __name__ == '__main__':
+    unittest.main()
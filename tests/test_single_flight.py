@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from direct_api.single_flight import AsyncSingleFlight, SingleFlight
+
+RESPONSE = {'result': {'Campaigns': [{'Id': 1}, {'Id': 2}]}}
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_result_of_leader(self):
+        flight = SingleFlight()
+        self.assertEqual(flight.do('key', dict, result=[]), {'result': []})
+        # finished call is not kept
+        self.assertEqual(flight._calls, {})
+
+    def test_error_of_leader(self):
+        def func():
+            raise ValueError('failed')
+
+        flight = SingleFlight()
+        with self.assertRaises(ValueError):
+            flight.do('key', func)
+        self.assertEqual(flight._calls, {})
+
+    def test_leader_changes_its_result(self):
+        flight = SingleFlight()
+        followers = 4
+        results = []
+
+        def func() -> dict:
+            # the call is finished when all followers are waiting for it
+            deadline = time.monotonic() + 5
+            while flight._calls['key'].waiters < followers:
+                self.assertLess(time.monotonic(), deadline)
+                time.sleep(0.001)
+            return {'result': {'Campaigns': [{'Id': 1}, {'Id': 2}]}}
+
+        def leader() -> None:
+            response = flight.do('key', func)
+            response['result']['Campaigns'].clear()
+
+        def follower() -> None:
+            results.append(flight.do('key', func))
+
+        threads = [threading.Thread(target=leader)]
+        threads[0].start()
+        while 'key' not in flight._calls:
+            time.sleep(0.001)
+        threads += [threading.Thread(target=follower) for _ in range(followers)]
+        for thread in threads[1:]:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, [RESPONSE] * followers)
+
+
+class AsyncSingleFlightTest(unittest.TestCase):
+    def test_leader_changes_its_result(self):
+        flight = AsyncSingleFlight()
+
+        async def func() -> dict:
+            await asyncio.sleep(0.01)
+            return {'result': {'Campaigns': [{'Id': 1}, {'Id': 2}]}}
+
+        async def leader() -> None:
+            response = await flight.do('key', func)
+            response['result']['Campaigns'].clear()
+
+        async def main() -> list:
+            results = await asyncio.gather(
+                leader(), *(flight.do('key', func) for _ in range(4))
+            )
+            return results[1:]
+
+        self.assertEqual(asyncio.run(main()), [RESPONSE] * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
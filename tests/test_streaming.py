@@ -0,0 +1,90 @@
+import json
+import unittest
+from unittest import mock
+
+from direct_api.exceptions import YdAPIError, YdException
+from direct_api.streaming import StreamedPage
+
+CAMPAIGNS = [
+    {'Id': 1, 'Name': 'Кампания ☀ 1'},
+    {'Id': 22, 'Name': 'Рекламная кампания 𝄞', 'DailyBudget': None},
+    {'Id': 333, 'Name': 'campaign'},
+]
+
+
+def chunked(body: bytes, size: int) -> list:
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+class StreamedPageTest(unittest.TestCase):
+    def read(self, response: dict, body: bytes = None):
+        """
+        :return: list of (objects, page) read by chunks of every size up to body length
+        """
+        body = body or json.dumps(response, ensure_ascii=False).encode('utf-8')
+        pages = []
+        for size in range(1, len(body) + 1):
+            with self.subTest(size=size):
+                closable = mock.Mock()
+                page = StreamedPage(chunked(body, size), closable)
+                pages.append((list(page), page))
+                closable.close.assert_called_once_with()
+        return pages
+
+    def test_multibyte_chars_split_by_chunks(self):
+        for items, page in self.read({'result': {'Campaigns': CAMPAIGNS}}):
+            self.assertEqual(items, CAMPAIGNS)
+            self.assertEqual(page.key, 'Campaigns')
+            self.assertIsNone(page.limited_by)
+
+    def test_limited_by_after_objects(self):
+        response = {'result': {'Campaigns': CAMPAIGNS, 'LimitedBy': 12345}}
+        for items, page in self.read(response):
+            self.assertEqual(items, CAMPAIGNS)
+            self.assertEqual(page.limited_by, 12345)
+
+    def test_limited_by_before_objects(self):
+        body = (
+            ' {\n "result" : { "LimitedBy" : 3 ,\n "Campaigns" : '
+            + json.dumps(CAMPAIGNS, ensure_ascii=False)
+            + ' } }\n'
+        ).encode('utf-8')
+        for items, page in self.read({}, body):
+            self.assertEqual(items, CAMPAIGNS)
+            self.assertEqual(page.limited_by, 3)
+
+    def test_empty_result(self):
+        for response in ({'result': {}}, {'result': {'Campaigns': []}}):
+            for items, page in self.read(response):
+                self.assertEqual(items, [])
+                self.assertIsNone(page.limited_by)
+
+    def test_error(self):
+        error = {
+            'error_code': 8800,
+            'error_string': 'Объект не найден',
+            'error_detail': '',
+            'request_id': '1',
+        }
+        body = json.dumps({'error': error}, ensure_ascii=False).encode('utf-8')
+        for size in range(1, len(body) + 1):
+            with self.subTest(size=size):
+                closable = mock.Mock()
+                page = StreamedPage(chunked(body, size), closable)
+                with self.assertRaises(YdAPIError) as raised:
+                    page.start()
+                self.assertEqual(raised.exception.error_data, error)
+                closable.close.assert_called_once_with()
+
+    def test_limited_by_is_known_after_iteration(self):
+        body = json.dumps({'result': {'Campaigns': CAMPAIGNS}}).encode('utf-8')
+        page = StreamedPage([body]).start()
+        with self.assertRaises(YdException):
+            page.limited_by
+        self.assertEqual(list(page), CAMPAIGNS)
+        with self.assertRaises(YdException):
+            list(page)
+
+
+if __name__ == '__main__':
+    unittest.main()
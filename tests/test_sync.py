@@ -0,0 +1,70 @@
+import unittest
+from unittest import mock
+
+from direct_api.client import DirectAPI
+from direct_api.mirror import EntityMirror
+from direct_api.sync import AccountSync
+
+TIMESTAMP = '2020-01-02T00:00:00Z'
+
+
+def api_request(service: str, method: str, params: dict) -> dict:
+    """
+    Account where campaign 1 was changed, ad group 11 and ad 21 were changed and
+    campaign 2, ad group 12, ad 22 were deleted since watermark
+    """
+    if (service, method) == ('changes', 'checkCampaigns'):
+        campaigns = [
+            {'CampaignId': 1, 'ChangesIn': ['SELF', 'CHILDREN']},
+            {'CampaignId': 2, 'ChangesIn': ['SELF']},
+        ]
+        return {'result': {'Campaigns': campaigns, 'Timestamp': TIMESTAMP}}
+    if (service, method) == ('changes', 'check'):
+        modified = {'AdGroupIds': [11, 12], 'AdIds': [21, 22]}
+        return {'result': {'Modified': modified, 'NotFound': {'CampaignIds': [3]}}}
+    existing = {'campaigns': [1], 'adgroups': [11], 'ads': [21]}[service]
+    ids = params['SelectionCriteria']['Ids']
+    key = {'campaigns': 'Campaigns', 'adgroups': 'AdGroups', 'ads': 'Ads'}[service]
+    return {'result': {key: [{'Id': i, 'CampaignId': 1} for i in ids if i in existing]}}
+
+
+class IncrementalSyncTest(unittest.TestCase):
+    def test_deleted(self):
+        client = DirectAPI('token', 'login')
+        sync = AccountSync(client)
+        sync.watermarks['login'] = '2020-01-01T00:00:00Z'
+        with mock.patch.object(DirectAPI, '_request', side_effect=api_request):
+            result = sync.sync('login')
+        self.assertFalse(result.full)
+        self.assertEqual([c['Id'] for c in result.campaigns], [1])
+        self.assertEqual(
+            result.deleted, {'Campaign': [2, 3], 'AdGroup': [12], 'Ad': [22]}
+        )
+
+        with EntityMirror() as mirror:
+            mirror.upsert('login', 'Campaign', [{'Id': i} for i in (1, 2, 3)])
+            mirror.upsert('login', 'AdGroup', [{'Id': 12, 'CampaignId': 1}])
+            mirror.upsert('login', 'Ad', [{'Id': 31, 'CampaignId': 3}])
+            mirror.apply_sync(result)
+            self.assertEqual([c['Id'] for c in mirror.query('Campaign')], [1])
+            self.assertEqual([g['Id'] for g in mirror.query('AdGroup')], [11])
+            self.assertEqual([a['Id'] for a in mirror.query('Ad')], [21])
+
+    def test_id_is_requested(self):
+        client = DirectAPI('token', 'login')
+        sync = AccountSync(client, campaign_fields=['Name'], ad_fields=['State', 'Id'])
+        self.assertEqual(sync.campaign_fields, ['Id', 'Name'])
+        self.assertEqual(sync.ad_fields, ['State', 'Id'])
+        sync.watermarks['login'] = '2020-01-01T00:00:00Z'
+        with mock.patch.object(DirectAPI, '_request', side_effect=api_request) as request:
+            result = sync.sync('login')
+        self.assertEqual([c['Id'] for c in result.campaigns], [1])
+        field_names = [
+            c[0][2]['FieldNames'] for c in request.call_args_list if c[0][1] == 'get'
+        ]
+        self.assertTrue(field_names)
+        self.assertTrue(all('Id' in names for names in field_names))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+from direct_api.units import UnitsThrottler, UnitsTracker, count_objects
+
+
+class CountObjectsTest(unittest.TestCase):
+    def test_count(self):
+        self.assertEqual(count_objects({'SelectionCriteria': {'Ids': [1, 2]}}), 2)
+        self.assertEqual(count_objects({'Keywords': [{}, {}, {}]}), 3)
+        self.assertEqual(count_objects({'FieldNames': ['Id']}), 0)
+
+    def test_selection_criteria_is_not_dict(self):
+        self.assertEqual(count_objects({'SelectionCriteria': ({'Ids': [1]},)}), 0)
+
+
+class UnitsThrottlerTest(unittest.TestCase):
+    def throttler(self, rest: int, max_wait: float) -> UnitsThrottler:
+        tracker = UnitsTracker()
+        tracker.update({'Units': f'10/{rest}/64000'}, 'campaigns', 'login')
+        return UnitsThrottler(tracker, max_wait=max_wait)
+
+    def test_wait_is_capped_without_points(self):
+        self.assertLessEqual(self.throttler(0, 60.0).reserve('login', 10), 60.0)
+
+    def test_wait_is_capped_with_few_points(self):
+        throttler = self.throttler(1, 60.0)
+        for _ in range(3):
+            self.assertLessEqual(throttler.reserve('login', 1000), 60.0)
+
+
+if __name__ == '__main__':
+    unittest.main()